@@ -0,0 +1,50 @@
+import numpy as np
+
+
+class ScoreCube:
+    """Cumulative project counts and score sums per group over integer scores.
+
+    ``counts[g, s]`` holds the number of rows of group ``g`` with a score below
+    ``score_min + s``.  Any ``lo <= score <= hi`` total is then the difference
+    of two columns, so a query costs O(groups) whatever the number of rows.
+    """
+
+    def __init__(self, group_codes: np.ndarray, n_groups: int, score: np.ndarray):
+        valid = group_codes >= 0
+        codes = group_codes[valid].astype(np.int64)
+        values = score[valid].astype(np.int64)
+
+        self.n_groups = n_groups
+        self.score_min = int(values.min()) if len(values) else 0
+        self.width = (int(values.max()) - self.score_min + 1) if len(values) else 0
+
+        binned = np.bincount(
+            codes * self.width + (values - self.score_min),
+            minlength=n_groups * self.width,
+        ).reshape(n_groups, self.width)
+        # مجموع امتیازهای هر خانه برابر با تعداد × همان امتیاز است
+        score_values = np.arange(self.score_min, self.score_min + self.width, dtype=np.int64)
+
+        self._counts = np.zeros((n_groups, self.width + 1), dtype=np.int64)
+        self._sums = np.zeros((n_groups, self.width + 1), dtype=np.int64)
+        np.cumsum(binned, axis=1, out=self._counts[:, 1:])
+        np.cumsum(binned * score_values, axis=1, out=self._sums[:, 1:])
+
+    def _columns(self, lo, hi):
+        start = min(max(int(np.ceil(lo)) - self.score_min, 0), self.width)
+        stop = min(max(int(np.floor(hi)) - self.score_min + 1, start), self.width)
+        return start, stop
+
+    def counts(self, lo, hi, groups: slice = slice(None)) -> np.ndarray:
+        """Rows per group with ``lo <= score <= hi``, for ``groups`` only if given."""
+        start, stop = self._columns(lo, hi)
+        return self._counts[groups, stop] - self._counts[groups, start]
+
+    def sums(self, lo, hi, groups: slice = slice(None)) -> np.ndarray:
+        """Score sum per group over ``lo <= score <= hi``, for ``groups`` only if given."""
+        start, stop = self._columns(lo, hi)
+        return self._sums[groups, stop] - self._sums[groups, start]
+
+    @property
+    def nbytes(self) -> int:
+        return self._counts.nbytes + self._sums.nbytes
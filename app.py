@@ -1,2405 +1,48 @@
-import os
-import io
-
-import dash
-from dash import Dash, Input, Output, State, dcc, html
-from dash.dash_table import DataTable
-import dash_bootstrap_components as dbc
-import pandas as pd
-import plotly.express as px
-
-
-# ---------- Sample data ----------
-projects_data = [
-    # فناوری اطلاعات
-    {
-        "department": "فناوری اطلاعات",
-        "manager": "علی رضایی",
-        "project_name": "راه‌اندازی پلتفرم ابری داخلی",
-        "start_date": "2025-01-15",
-        "status": "در حال انجام",
-        "score": 89,
-    },
-    {
-        "department": "فناوری اطلاعات",
-        "manager": "علی رضایی",
-        "project_name": "اتوماسیون فرایندهای اداری",
-        "start_date": "2025-03-02",
-        "status": "در حال انجام",
-        "score": 92,
-    },
-    {
-        "department": "فناوری اطلاعات",
-        "manager": "مریم کریمی",
-        "project_name": "به‌روزرسانی زیرساخت شبکه",
-        "start_date": "2024-11-20",
-        "status": "نزدیک به اتمام",
-        "score": 85,
-    },
-    {
-        "department": "فناوری اطلاعات",
-        "manager": "مریم کریمی",
-        "project_name": "پیاده‌سازی سیستم مانیتورینگ",
-        "start_date": "2025-02-10",
-        "status": "در حال انجام",
-        "score": 81,
-    },
-    # مالی
-    {
-        "department": "مالی",
-        "manager": "حسین موسوی",
-        "project_name": "سیستم مدیریت بودجه",
-        "start_date": "2025-01-05",
-        "status": "در حال انجام",
-        "score": 78,
-    },
-    {
-        "department": "مالی",
-        "manager": "حسین موسوی",
-        "project_name": "دیجیتالی‌سازی اسناد مالی",
-        "start_date": "2024-12-10",
-        "status": "در حال انجام",
-        "score": 83,
-    },
-    {
-        "department": "مالی",
-        "manager": "نگار احمدی",
-        "project_name": "بازطراحی ساختار گزارش‌دهی مالی",
-        "start_date": "2025-03-12",
-        "status": "در حال انجام",
-        "score": 80,
-    },
-    # منابع انسانی
-    {
-        "department": "منابع انسانی",
-        "manager": "سارا محمدی",
-        "project_name": "پیاده‌سازی سیستم ارزیابی عملکرد",
-        "start_date": "2025-01-25",
-        "status": "در حال انجام",
-        "score": 90,
-    },
-    {
-        "department": "منابع انسانی",
-        "manager": "سارا محمدی",
-        "project_name": "برنامه توسعه مهارت مدیران",
-        "start_date": "2025-02-18",
-        "status": "در حال انجام",
-        "score": 88,
-    },
-    {
-        "department": "منابع انسانی",
-        "manager": "مجتبی نوری",
-        "project_name": "سیستم جذب و استخدام آنلاین",
-        "start_date": "2024-12-01",
-        "status": "نزدیک به اتمام",
-        "score": 86,
-    },
-    # بازاریابی
-    {
-        "department": "بازاریابی",
-        "manager": "الهام صادقی",
-        "project_name": "کمپین دیجیتال برندینگ",
-        "start_date": "2025-01-10",
-        "status": "در حال انجام",
-        "score": 91,
-    },
-    {
-        "department": "بازاریابی",
-        "manager": "الهام صادقی",
-        "project_name": "تحلیل رفتار مشتریان",
-        "start_date": "2025-02-05",
-        "status": "در حال انجام",
-        "score": 87,
-    },
-    {
-        "department": "بازاریابی",
-        "manager": "امیر تقوی",
-        "project_name": "طراحی باشگاه مشتریان",
-        "start_date": "2024-11-30",
-        "status": "در حال انجام",
-        "score": 84,
-    },
-    # تحقیق و توسعه
-    {
-        "department": "تحقیق و توسعه",
-        "manager": "رضا کاظمی",
-        "project_name": "پروژه هوش مصنوعی پیش‌بینی فروش",
-        "start_date": "2025-01-20",
-        "status": "در حال انجام",
-        "score": 94,
-    },
-    {
-        "department": "تحقیق و توسعه",
-        "manager": "رضا کاظمی",
-        "project_name": "تحقیق بازار محصولات جدید",
-        "start_date": "2025-03-01",
-        "status": "در حال انجام",
-        "score": 89,
-    },
-    {
-        "department": "تحقیق و توسعه",
-        "manager": "نسیم رستگار",
-        "project_name": "آزمایش نمونه اولیه محصول",
-        "start_date": "2024-12-15",
-        "status": "نزدیک به اتمام",
-        "score": 88,
-    },
-]
-
-df = pd.DataFrame(projects_data)
-
-
-# ---------- Aggregations ----------
-def compute_dept_summary(source: pd.DataFrame) -> pd.DataFrame:
-    summary = (
-        source.groupby("department")
-        .agg(
-            active_projects=("project_name", "count"),
-            avg_score=("score", "mean"),
-        )
-        .reset_index()
-    )
-    if not summary.empty:
-        summary["avg_score"] = summary["avg_score"].round(1)
-    return summary
-
-
-dept_summary = compute_dept_summary(df)
-
-
-def make_bar_figure(summary: pd.DataFrame) -> px.bar:
-    fig = px.bar(
-        summary,
-        x="department",
-        y="active_projects",
-        labels={"department": "واحد سازمانی", "active_projects": "تعداد پروژه‌ها"},
-        color="department",
-    )
-    fig.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=20, t=30, b=80),
-        xaxis_title=None,
-        yaxis_title="تعداد پروژه‌ها",
-        xaxis_tickangle=-25,
-        hovermode="x",
-        legend_title_text="واحد سازمانی",
-    )
-    fig.update_traces(
-        hovertemplate="<b>%{x}</b><br>تعداد پروژه‌ها: %{y}<extra></extra>",
-        marker_line_width=0,
-    )
-    return fig
-
-
-def make_line_figure(summary: pd.DataFrame) -> px.line:
-    fig = px.line(
-        summary,
-        x="department",
-        y="avg_score",
-        markers=True,
-        labels={"department": "واحد سازمانی", "avg_score": "میانگین امتیاز"},
-    )
-    fig.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=20, t=30, b=80),
-        xaxis_title=None,
-        yaxis_title="میانگین امتیاز",
-        xaxis_tickangle=-25,
-        hovermode="x",
-    )
-    fig.update_traces(
-        hovertemplate="<b>%{x}</b><br>میانگین امتیاز: %{y}<extra></extra>",
-        line=dict(color="#2563eb"),
-        marker=dict(color="#2563eb", size=8),
-    )
-    return fig
-
-
-def make_pie_figure(summary: pd.DataFrame) -> px.pie:
-    fig = px.pie(
-        summary,
-        names="department",
-        values="active_projects",
-        hole=0.45,
-    )
-    fig.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=160, t=10, b=10),
-        legend=dict(
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.05,
-        ),
-        legend_title_text="واحد سازمانی",
-    )
-    fig.update_traces(
-        textinfo="percent",
-        textposition="inside",
-        insidetextorientation="radial",
-        hovertemplate="<b>%{label}</b><br>تعداد پروژه‌ها: %{value}<extra></extra>",
-    )
-    return fig
-
-
-bar_fig = make_bar_figure(dept_summary)
-line_fig = make_line_figure(dept_summary)
-pie_fig = make_pie_figure(dept_summary)
-
-
-# ---------- Dash app ----------
-# استفاده از نسخه RTL بوت‌استرپ برای سازگاری تولید و لوکال
-external_stylesheets = [dbc.themes.BOOTSTRAP]
-
-app = Dash(
-    __name__,
-    external_stylesheets=external_stylesheets,
-    meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
-    assets_folder='assets'
-)
-app.title = "داشبورد پروژه‌های سازمانی"
-server = app.server  # for gunicorn / Render
-
-# اطمینان از RTL بودن در سطح کل صفحه برای تمام محیط‌ها (لوکال و تولید)
-app.index_string = """
-<!DOCTYPE html>
-<html dir="rtl" lang="fa">
-  <head>
-    {%metas%}
-    <title>{%title%}</title>
-    {%favicon%}
-    {%css%}
-  </head>
-  <body dir="rtl">
-    {%app_entry%}
-    <footer>
-      {%config%}
-      {%scripts%}
-      {%renderer%}
-    </footer>
-  </body>
-</html>
-"""
-
-
-table_style = {
-    "style_header": {
-        "backgroundColor": "#f3f4f6",
-        "fontWeight": "bold",
-        "border": "1px solid #e5e7eb",
-    },
-    "style_cell": {
-        "textAlign": "right",
-        "padding": "8px",
-        "border": "1px solid #e5e7eb",
-        "fontFamily": "Vazirmatn, sans-serif",
-        "fontSize": "13px",
-    },
-    "style_table": {"width": "100%", "overflowX": "auto"},
-    "style_data_conditional": [
-        {"if": {"row_index": "odd"}, "backgroundColor": "#f9fafb"},
-        {
-            "if": {"column_id": "score", "filter_query": "{score} >= 85"},
-            "backgroundColor": "#dcfce7",
-            "color": "#166534",
-            "fontWeight": "600",
-        },
-        {
-            "if": {
-                "column_id": "score",
-                "filter_query": "{score} >= 70 && {score} < 85",
-            },
-            "backgroundColor": "#fef9c3",
-            "color": "#854d0e",
-            "fontWeight": "600",
-        },
-        {
-            "if": {"column_id": "score", "filter_query": "{score} < 70"},
-            "backgroundColor": "#fee2e2",
-            "color": "#991b1b",
-            "fontWeight": "600",
-        },
-    ],
-}
-
-
-stat_card_style = {
-    "flex": "1",
-    "minWidth": "180px",
-    "backgroundColor": "#0f172a",
-    "color": "#e5e7eb",
-    "borderRadius": "14px",
-    "padding": "10px 14px",
-    "boxShadow": "0 10px 25px rgba(15,23,42,0.4)",
-}
-
-
-def stat_number(value: str) -> html.H3:
-    return html.H3(value, style={"margin": 0, "fontSize": "20px", "fontWeight": 600})
-
-
-app.layout = html.Div(
-    style={
-        "minHeight": "100vh",
-        "background": "radial-gradient(circle at top left, #111827 0, #020617 45%, #020617 100%)",
-        "padding": "24px",
-        "boxSizing": "border-box",
-        "fontFamily": "Vazirmatn, sans-serif",
-    },
-    children=[
-        html.Link(
-            rel="stylesheet",
-            href="https://fonts.googleapis.com/css2?family=Vazirmatn:wght@400;700&display=swap",
-        ),
-        dcc.Store(id="selected-department"),
-        html.Div(
-            style={
-                "maxWidth": "1200px",
-                "margin": "0 auto",
-                "display": "flex",
-                "flexDirection": "row",
-                "gap": "16px",
-            },
-            children=[
-                # Main column
-                html.Div(
-                    style={
-                        "flex": "1 1 0%",
-                        "display": "flex",
-                        "flexDirection": "column",
-                        "gap": "16px",
-                    },
-                    children=[
-                        # Stats row
-                        html.Div(
-                            style={
-                                "display": "flex",
-                                "flexWrap": "wrap",
-                                "gap": "12px",
-                            },
-                            children=[
-                                html.Div(
-                                    style=stat_card_style,
-                                    children=[
-                                        html.P(
-                                            "تعداد کل پروژه‌ها",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "12px",
-                                                "color": "#9ca3af",
-                                            },
-                                        ),
-                                        stat_number(str(len(df))),
-                                    ],
-                                ),
-                                html.Div(
-                                    style=stat_card_style,
-                                    children=[
-                                        html.P(
-                                            "میانگین امتیاز کل",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "12px",
-                                                "color": "#9ca3af",
-                                            },
-                                        ),
-                                        stat_number(f"{df['score'].mean():.1f}"),
-                                    ],
-                                ),
-                                html.Div(
-                                    style=stat_card_style,
-                                    children=[
-                                        html.P(
-                                            "تعداد واحدها",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "12px",
-                                                "color": "#9ca3af",
-                                            },
-                                        ),
-                                        stat_number(str(df["department"].nunique())),
-                                    ],
-                                ),
-                                html.Div(
-                                    style=stat_card_style,
-                                    children=[
-                                        html.P(
-                                            "تعداد مدیران",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "12px",
-                                                "color": "#9ca3af",
-                                            },
-                                        ),
-                                        stat_number(str(df["manager"].nunique())),
-                                    ],
-                                ),
-                            ],
-                        ),
-                        # Overview content (default main view)
-                        html.Div(
-                            id="overview-content",
-                            style={
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "display": "flex",
-                                "flexDirection": "column",
-                                "gap": "20px",
-                            },
-                            children=[
-                                # Header
-                                html.Div(
-                                    style={
-                                        "display": "flex",
-                                        "justifyContent": "space-between",
-                                        "alignItems": "center",
-                                        "flexWrap": "wrap",
-                                        "gap": "8px",
-                                    },
-                                    children=[
-                                        html.Div(
-                                            children=[
-                                                html.H3(
-                                                    "نمای کلی",
-                                                    style={
-                                                        "margin": 0,
-                                                        "fontSize": "20px",
-                                                        "fontWeight": 600,
-                                                    },
-                                                ),
-                                                html.P(
-                                                    "نمایی از پروژه‌های فعال و عملکرد واحدها",
-                                                    style={
-                                                        "margin": "4px 0 0",
-                                                        "fontSize": "13px",
-                                                        "color": "#6b7280",
-                                                    },
-                                                ),
-                                            ]
-                                        ),
-                                    ],
-                                ),
-                                # Filter + middle charts row
-                                html.Div(
-                                    style={
-                                        "display": "flex",
-                                        "flexDirection": "column",
-                                        "gap": "12px",
-                                    },
-                                    children=[
-                                        html.Div(
-                                            style={
-                                                "display": "flex",
-                                                "flexDirection": "column",
-                                                "gap": "4px",
-                                            },
-                                            children=[
-                                                html.Div(
-                                                    "فیلتر بر اساس امتیاز پروژه‌ها",
-                                                    style={
-                                                        "fontSize": "13px",
-                                                        "color": "#4b5563",
-                                                    },
-                                                ),
-                                                dcc.RangeSlider(
-                                                    id="score-range",
-                                                    min=60,
-                                                    max=100,
-                                                    step=1,
-                                                    value=[60, 100],
-                                                    allowCross=False,
-                                                    marks={
-                                                        60: "60",
-                                                        70: "70",
-                                                        80: "80",
-                                                        90: "90",
-                                                        100: "100",
-                                                    },
-                                                ),
-                                                html.Div(
-                                                    id="score-range-text",
-                                                    style={
-                                                        "fontSize": "12px",
-                                                        "color": "#6b7280",
-                                                    },
-                                                ),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            style={
-                                                "display": "flex",
-                                                "flexWrap": "wrap",
-                                                "gap": "16px",
-                                            },
-                                            children=[
-                                                html.Div(
-                                                    style={
-                                                        "flex": "1 1 320px",
-                                                        "backgroundColor": "#ffffff",
-                                                        "borderRadius": "16px",
-                                                        "padding": "12px 12px 8px",
-                                                        "boxSizing": "borderBox",
-                                                    },
-                                                    children=[
-                                                        html.P(
-                                                            "میانگین امتیاز به تفکیک واحد",
-                                                            style={
-                                                                "margin": "0 0 4px",
-                                                                "fontSize": "13px",
-                                                                "fontWeight": 600,
-                                                            },
-                                                        ),
-                                                        dcc.Graph(
-                                                            id="avg-score-line",
-                                                            figure=line_fig,
-                                                            style={"height": "280px"},
-                                                            config={
-                                                                "displayModeBar": False
-                                                            },
-                                                        ),
-                                                    ],
-                                                ),
-                                                html.Div(
-                                                    style={
-                                                        "flex": "1 1 320px",
-                                                        "backgroundColor": "#ffffff",
-                                                        "borderRadius": "16px",
-                                                        "padding": "12px 12px 8px",
-                                                        "boxSizing": "borderBox",
-                                                    },
-                                                    children=[
-                                                        html.P(
-                                                            "تعداد پروژه‌های فعال به تفکیک واحد",
-                                                            style={
-                                                                "margin": "0 0 4px",
-                                                                "fontSize": "13px",
-                                                                "fontWeight": 600,
-                                                            },
-                                                        ),
-                                                        dcc.Graph(
-                                                            id="projects-per-dept-bar",
-                                                            figure=bar_fig,
-                                                            style={"height": "280px"},
-                                                            config={
-                                                                "displayModeBar": False
-                                                            },
-                                                        ),
-                                                    ],
-                                                ),
-                                            ],
-                                        ),
-                                    ],
-                                ),
-                                # Pie chart
-                                html.Div(
-                                    style={
-                                        "backgroundColor": "#ffffff",
-                                        "borderRadius": "16px",
-                                        "padding": "12px 12px 8px",
-                                    },
-                                    children=[
-                                        html.P(
-                                            "سهم واحدها از کل پروژه‌ها",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "13px",
-                                                "fontWeight": 600,
-                                            },
-                                        ),
-                                        dcc.Graph(
-                                            id="dept-share-pie",
-                                            figure=pie_fig,
-                                            style={"height": "260px"},
-                                            config={"displayModeBar": False},
-                                        ),
-                                    ],
-                                ),
-                                # Managers table
-                                html.Div(
-                                    style={
-                                        "backgroundColor": "#ffffff",
-                                        "borderRadius": "16px",
-                                        "padding": "12px 12px 8px",
-                                    },
-                                    children=[
-                                        html.P(
-                                            "مدیران پروژه در واحد انتخاب‌شده",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "13px",
-                                                "fontWeight": 600,
-                                            },
-                                        ),
-                                        html.P(
-                                            "روی نوار یکی از واحدها کلیک کنید تا این جدول پر شود.",
-                                            id="dept-hint-text",
-                                            style={
-                                                "margin": "0 0 8px",
-                                                "fontSize": "12px",
-                                                "color": "#6b7280",
-                                            },
-                                        ),
-                                        DataTable(
-                                            id="dept-managers-table",
-                                            columns=[
-                                                {"name": "مدیر پروژه", "id": "manager"},
-                                                {
-                                                    "name": "تعداد پروژه‌ها",
-                                                    "id": "project_count",
-                                                },
-                                                {
-                                                    "name": "میانگین امتیاز",
-                                                    "id": "avg_score",
-                                                },
-                                            ],
-                                            data=[],
-                                            cell_selectable=True,
-                                            row_selectable=False,
-                                            **table_style,
-                                        ),
-                                    ],
-                                ),
-                                # Projects table
-                                html.Div(
-                                    style={
-                                        "backgroundColor": "#ffffff",
-                                        "borderRadius": "16px",
-                                        "padding": "12px 12px 8px",
-                                    },
-                                    children=[
-                                        html.P(
-                                            "پروژه‌های مدیر انتخاب‌شده",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "13px",
-                                                "fontWeight": 600,
-                                            },
-                                        ),
-                                        html.P(
-                                            "روی نام یک مدیر در جدول بالا کلیک کنید تا این قسمت پر شود.",
-                                            id="manager-hint-text",
-                                            style={
-                                                "margin": "0 0 8px",
-                                                "fontSize": "12px",
-                                                "color": "#6b7280",
-                                            },
-                                        ),
-                                        DataTable(
-                                            id="manager-projects-table",
-                                            columns=[
-                                                {
-                                                    "name": "نام پروژه",
-                                                    "id": "project_name",
-                                                },
-                                                {
-                                                    "name": "تاریخ شروع",
-                                                    "id": "start_date",
-                                                },
-                                                {"name": "وضعیت", "id": "status"},
-                                                {"name": "امتیاز", "id": "score"},
-                                            ],
-                                            data=[],
-                                            cell_selectable=False,
-                                            row_selectable=False,
-                                            **table_style,
-                                        ),
-                                        html.Div(
-                                            style={
-                                                "marginTop": "10px",
-                                                "display": "flex",
-                                                "justifyContent": "flex-start",
-                                            },
-                                            children=[
-                                                html.Button(
-                                                    "دانلود Excel",
-                                                    id="download-manager-projects",
-                                                    n_clicks=0,
-                                                    style={
-                                                        "border": "none",
-                                                        "borderRadius": "999px",
-                                                        "padding": "6px 14px",
-                                                        "fontSize": "12px",
-                                                        "cursor": "pointer",
-                                                        "backgroundColor": "#2563eb",
-                                                        "color": "#ffffff",
-                                                    },
-                                                ),
-                                                dcc.Download(
-                                                    id="manager-projects-download"
-                                                ),
-                                            ],
-                                        ),
-                                    ],
-                                ),
-                            ],
-                        ),
-                        # Projects page content
-                        html.Div(
-                            id="projects-content",
-                            style={
-                                "display": "none",
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "flexDirection": "column",
-                                "gap": "16px",
-                            },
-                            children=[
-                                html.H3(
-                                    "پروژه‌ها",
-                                    style={
-                                        "margin": 0,
-                                        "fontSize": "20px",
-                                        "fontWeight": 600,
-                                    },
-                                ),
-                                html.P(
-                                    "لیست همه پروژه‌ها به همراه واحد و مدیر مربوطه.",
-                                    style={
-                                        "margin": "4px 0 8px",
-                                        "fontSize": "13px",
-                                        "color": "#6b7280",
-                                    },
-                                ),
-                                DataTable(
-                                    id="all-projects-table",
-                                    columns=[
-                                        {"name": "واحد سازمانی", "id": "department"},
-                                        {"name": "مدیر پروژه", "id": "manager"},
-                                        {"name": "نام پروژه", "id": "project_name"},
-                                        {"name": "تاریخ شروع", "id": "start_date"},
-                                        {"name": "وضعیت", "id": "status"},
-                                        {"name": "امتیاز", "id": "score"},
-                                    ],
-                                    data=df.to_dict("records"),
-                                    sort_action="native",
-                                    **table_style,
-                                ),
-                            ],
-                        ),
-                        # Tasks page content (status summary)
-                        html.Div(
-                            id="tasks-content",
-                            style={
-                                "display": "none",
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "flexDirection": "column",
-                                "gap": "16px",
-                            },
-                            children=[
-                                html.H3(
-                                    "وضعیت پروژه‌ها",
-                                    style={
-                                        "margin": 0,
-                                        "fontSize": "20px",
-                                        "fontWeight": 600,
-                                    },
-                                ),
-                                html.P(
-                                    "خلاصه‌ای از تعداد پروژه‌ها بر اساس وضعیت اجرا.",
-                                    style={
-                                        "margin": "4px 0 8px",
-                                        "fontSize": "13px",
-                                        "color": "#6b7280",
-                                    },
-                                ),
-                                DataTable(
-                                    id="status-summary-table",
-                                    columns=[
-                                        {"name": "وضعیت", "id": "status"},
-                                        {
-                                            "name": "تعداد پروژه‌ها",
-                                            "id": "project_count",
-                                        },
-                                    ],
-                                    data=(
-                                        df.groupby("status")
-                                        .agg(project_count=("project_name", "count"))
-                                        .reset_index()
-                                    ).to_dict("records"),
-                                    **table_style,
-                                ),
-                            ],
-                        ),
-                        # Members page content (managers summary)
-                        html.Div(
-                            id="members-content",
-                            style={
-                                "display": "none",
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "flexDirection": "column",
-                                "gap": "16px",
-                            },
-                            children=[
-                                html.H3(
-                                    "مدیران پروژه",
-                                    style={
-                                        "margin": 0,
-                                        "fontSize": "20px",
-                                        "fontWeight": 600,
-                                    },
-                                ),
-                                html.P(
-                                    "خلاصه تعداد پروژه‌ها و میانگین امتیاز برای هر مدیر در واحدهای مختلف.",
-                                    style={
-                                        "margin": "4px 0 8px",
-                                        "fontSize": "13px",
-                                        "color": "#6b7280",
-                                    },
-                                ),
-                                DataTable(
-                                    id="managers-summary-table",
-                                    columns=[
-                                        {"name": "مدیر پروژه", "id": "manager"},
-                                        {
-                                            "name": "واحد سازمانی",
-                                            "id": "department",
-                                        },
-                                        {
-                                            "name": "تعداد پروژه‌ها",
-                                            "id": "project_count",
-                                        },
-                                        {
-                                            "name": "میانگین امتیاز",
-                                            "id": "avg_score",
-                                        },
-                                    ],
-                                    data=(
-                                        df.groupby(["manager", "department"])
-                                        .agg(
-                                            project_count=(
-                                                "project_name",
-                                                "count",
-                                            ),
-                                            avg_score=("score", "mean"),
-                                        )
-                                        .reset_index()
-                                        .assign(
-                                            avg_score=lambda d: d["avg_score"].round(1)
-                                        )
-                                    ).to_dict("records"),
-                                    **table_style,
-                                ),
-                            ],
-                        ),
-                        # Settings placeholder content
-                        html.Div(
-                            id="settings-content",
-                            style={
-                                "display": "none",
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "flexDirection": "column",
-                                "gap": "10px",
-                            },
-                            children=[
-                                html.H3(
-                                    "تنظیمات داشبورد",
-                                    style={
-                                        "margin": 0,
-                                        "fontSize": "20px",
-                                        "fontWeight": 600,
-                                    },
-                                ),
-                                html.P(
-                                    "در نسخه‌ی واقعی می‌توانستید از این بخش برای تغییر فیلترها، بازه‌ی زمانی پیش‌فرض و تنظیمات ظاهری استفاده کنید.",
-                                    style={
-                                        "margin": "4px 0 0",
-                                        "fontSize": "13px",
-                                        "color": "#6b7280",
-                                    },
-                                ),
-                            ],
-                        ),
-                    ],
-                ),
-                # Right sidebar menu
-                html.Div(
-                    style={
-                        "width": "220px",
-                        "minWidth": "180px",
-                        "backgroundColor": "#020617",
-                        "borderRadius": "20px",
-                        "padding": "18px 12px",
-                        "boxShadow": "0 18px 40px rgba(15,23,42,0.6)",
-                        "display": "flex",
-                        "flexDirection": "column",
-                        "alignItems": "center",
-                        "gap": "18px",
-                    },
-                    children=[
-                        html.Div(
-                            "DP",
-                            style={
-                                "width": "40px",
-                                "height": "40px",
-                                "borderRadius": "999px",
-                                "background": "radial-gradient(circle at 0 0, #f97316, #6366f1)",
-                                "display": "flex",
-                                "alignItems": "center",
-                                "justifyContent": "center",
-                                "color": "#ffffff",
-                                "fontWeight": 600,
-                                "fontSize": "16px",
-                            },
-                        ),
-                        html.Div(
-                            style={
-                                "display": "flex",
-                                "flexDirection": "column",
-                                "gap": "6px",
-                                "width": "100%",
-                            },
-                            children=[
-                                html.Button(
-                                    "نمای کلی",
-                                    id="nav-overview",
-                                    n_clicks=0,
-                                    style={
-                                        "width": "100%",
-                                        "border": "none",
-                                        "borderRadius": "999px",
-                                        "padding": "8px 12px",
-                                        "fontSize": "13px",
-                                        "cursor": "pointer",
-                                        "background": "#f9fafb",
-                                        "color": "#020617",
-                                    },
-                                ),
-                                html.Button(
-                                    "پروژه‌ها",
-                                    id="nav-projects",
-                                    n_clicks=0,
-                                    style={
-                                        "width": "100%",
-                                        "border": "none",
-                                        "borderRadius": "999px",
-                                        "padding": "8px 12px",
-                                        "fontSize": "13px",
-                                        "cursor": "pointer",
-                                        "background": "transparent",
-                                        "color": "#9ca3af",
-                                    },
-                                ),
-                                html.Button(
-                                    "تسک‌ها",
-                                    id="nav-tasks",
-                                    n_clicks=0,
-                                    style={
-                                        "width": "100%",
-                                        "border": "none",
-                                        "borderRadius": "999px",
-                                        "padding": "8px 12px",
-                                        "fontSize": "13px",
-                                        "cursor": "pointer",
-                                        "background": "transparent",
-                                        "color": "#9ca3af",
-                                    },
-                                ),
-                                html.Button(
-                                    "اعضا",
-                                    id="nav-members",
-                                    n_clicks=0,
-                                    style={
-                                        "width": "100%",
-                                        "border": "none",
-                                        "borderRadius": "999px",
-                                        "padding": "8px 12px",
-                                        "fontSize": "13px",
-                                        "cursor": "pointer",
-                                        "background": "transparent",
-                                        "color": "#9ca3af",
-                                    },
-                                ),
-                                html.Button(
-                                    "تنظیمات",
-                                    id="nav-settings",
-                                    n_clicks=0,
-                                    style={
-                                        "width": "100%",
-                                        "border": "none",
-                                        "borderRadius": "999px",
-                                        "padding": "8px 12px",
-                                        "fontSize": "13px",
-                                        "cursor": "pointer",
-                                        "background": "transparent",
-                                        "color": "#9ca3af",
-                                    },
-                                ),
-                            ],
-                        ),
-                    ],
-                ),
-            ],
-        ),
-    ],
-)
-
-
-# ---------- Callbacks ----------
-@app.callback(
-    Output("nav-overview", "style"),
-    Output("nav-projects", "style"),
-    Output("nav-tasks", "style"),
-    Output("nav-members", "style"),
-    Output("nav-settings", "style"),
-    Output("overview-content", "style"),
-    Output("projects-content", "style"),
-    Output("tasks-content", "style"),
-    Output("members-content", "style"),
-    Output("settings-content", "style"),
-    Input("nav-overview", "n_clicks"),
-    Input("nav-projects", "n_clicks"),
-    Input("nav-tasks", "n_clicks"),
-    Input("nav-members", "n_clicks"),
-    Input("nav-settings", "n_clicks"),
-)
-def update_menu_styles(ov, pr, ta, me, se):
-    ctx = dash.callback_context
-    active_id = "nav-overview"
-    if ctx.triggered:
-        active_id = ctx.triggered[0]["prop_id"].split(".")[0] or "nav-overview"
-
-    def style_for(button_id: str) -> dict:
-        base = {
-            "width": "100%",
-            "border": "none",
-            "borderRadius": "999px",
-            "padding": "8px 12px",
-            "fontSize": "13px",
-            "cursor": "pointer",
-            "transition": "background-color 0.15s ease, color 0.15s ease",
-        }
-        if button_id == active_id:
-            base.update({"background": "#f9fafb", "color": "#020617"})
-        else:
-            base.update({"background": "transparent", "color": "#9ca3af"})
-        return base
-
-    def block_style(show: bool) -> dict:
-        base = {
-            "backgroundColor": "#f9fafb",
-            "borderRadius": "20px",
-            "padding": "20px 20px 24px",
-            "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-            "flexDirection": "column",
-            "gap": "16px",
-            "display": "flex" if show else "none",
-        }
-        return base
-
-    return (
-        style_for("nav-overview"),
-        style_for("nav-projects"),
-        style_for("nav-tasks"),
-        style_for("nav-members"),
-        style_for("nav-settings"),
-        block_style(active_id == "nav-overview"),
-        block_style(active_id == "nav-projects"),
-        block_style(active_id == "nav-tasks"),
-        block_style(active_id == "nav-members"),
-        block_style(active_id == "nav-settings"),
-    )
-
-
-@app.callback(
-    Output("avg-score-line", "figure"),
-    Output("projects-per-dept-bar", "figure"),
-    Output("dept-share-pie", "figure"),
-    Output("score-range-text", "children"),
-    Input("score-range", "value"),
-)
-def update_charts_by_score(score_range):
-    if not score_range:
-        lo, hi = 60, 100
-    else:
-        lo, hi = score_range
-
-    filtered = df[(df["score"] >= lo) & (df["score"] <= hi)]
-    summary = compute_dept_summary(filtered) if not filtered.empty else compute_dept_summary(df.iloc[0:0])
-
-    line = make_line_figure(summary)
-    bar = make_bar_figure(summary)
-    pie = make_pie_figure(summary)
-
-    text = f"نمایش پروژه‌ها با امتیاز بین {lo} تا {hi}"
-    return line, bar, pie, text
-
-
-@app.callback(
-    Output("dept-managers-table", "data"),
-    Output("dept-hint-text", "children"),
-    Output("selected-department", "data"),
-    Input("projects-per-dept-bar", "clickData"),
-)
-def update_managers(click_data):
-    if not click_data or "points" not in click_data or not click_data["points"]:
-        return [], "روی نوار یکی از واحدها کلیک کنید تا این جدول پر شود.", None
-
-    department = click_data["points"][0]["x"]
-    subset = df[df["department"] == department]
-    if subset.empty:
-        return [], "برای این واحد، داده‌ای ثبت نشده است.", None
-
-    managers = (
-        subset.groupby("manager")
-        .agg(
-            project_count=("project_name", "count"),
-            avg_score=("score", "mean"),
-        )
-        .reset_index()
-    )
-    managers["avg_score"] = managers["avg_score"].round(1)
-    hint = f"واحد انتخاب‌شده: {department} — برای مشاهده پروژه‌ها، روی نام مدیر کلیک کنید."
-    return managers.to_dict("records"), hint, department
-
-
-@app.callback(
-    Output("manager-projects-table", "data"),
-    Output("manager-hint-text", "children"),
-    Input("dept-managers-table", "active_cell"),
-    State("dept-managers-table", "data"),
-    State("selected-department", "data"),
-)
-def update_projects(active_cell, managers_data, selected_department):
-    if (
-        not active_cell
-        or managers_data is None
-        or selected_department is None
-        or active_cell.get("row") is None
-    ):
-        return [], "روی نام یک مدیر در جدول بالا کلیک کنید تا این قسمت پر شود."
-
-    row = active_cell["row"]
-    if row >= len(managers_data):
-        return [], "انتخاب نامعتبر است؛ لطفاً دوباره مدیر را انتخاب کنید."
-
-    manager_name = managers_data[row].get("manager")
-    if not manager_name:
-        return [], "برای مشاهده جزئیات، روی نام مدیر کلیک کنید."
-
-    subset = df[
-        (df["department"] == selected_department) & (df["manager"] == manager_name)
-    ][["project_name", "start_date", "status", "score"]].copy()
-
-    if subset.empty:
-        return [], "برای این مدیر در این واحد، پروژه‌ای ثبت نشده است."
-
-    hint = f"مدیر انتخاب‌شده: {manager_name} — تعداد پروژه‌ها: {len(subset)}"
-    return subset.to_dict("records"), hint
-
-
-@app.callback(
-    Output("manager-projects-download", "data"),
-    Input("download-manager-projects", "n_clicks"),
-    State("manager-projects-table", "data"),
-    prevent_initial_call=True,
-)
-def export_manager_projects(n_clicks, table_data):
-    if not table_data:
-        return dash.no_update
-    export_df = pd.DataFrame(table_data)
-    return dcc.send_bytes(
-        lambda b: export_df.to_excel(b, index=False, engine="openpyxl"),
-        "manager-projects.xlsx",
-    )
-
-
-if __name__ == "__main__":
-    port = int(os.environ.get("PORT", "8050"))
-    app.run(host="0.0.0.0", port=port, debug=True)
-
-import os
-import io
-
-import dash
-from dash import Dash, Input, Output, State, dcc, html
-from dash.dash_table import DataTable
-import dash_bootstrap_components as dbc
-import pandas as pd
-import plotly.express as px
-
-
-# ---------- Sample data ----------
-projects_data = [
-    # فناوری اطلاعات
-    {
-        "department": "فناوری اطلاعات",
-        "manager": "علی رضایی",
-        "project_name": "راه‌اندازی پلتفرم ابری داخلی",
-        "start_date": "2025-01-15",
-        "status": "در حال انجام",
-        "score": 89,
-    },
-    {
-        "department": "فناوری اطلاعات",
-        "manager": "علی رضایی",
-        "project_name": "اتوماسیون فرایندهای اداری",
-        "start_date": "2025-03-02",
-        "status": "در حال انجام",
-        "score": 92,
-    },
-    {
-        "department": "فناوری اطلاعات",
-        "manager": "مریم کریمی",
-        "project_name": "به‌روزرسانی زیرساخت شبکه",
-        "start_date": "2024-11-20",
-        "status": "نزدیک به اتمام",
-        "score": 85,
-    },
-    {
-        "department": "فناوری اطلاعات",
-        "manager": "مریم کریمی",
-        "project_name": "پیاده‌سازی سیستم مانیتورینگ",
-        "start_date": "2025-02-10",
-        "status": "در حال انجام",
-        "score": 81,
-    },
-    # مالی
-    {
-        "department": "مالی",
-        "manager": "حسین موسوی",
-        "project_name": "سیستم مدیریت بودجه",
-        "start_date": "2025-01-05",
-        "status": "در حال انجام",
-        "score": 78,
-    },
-    {
-        "department": "مالی",
-        "manager": "حسین موسوی",
-        "project_name": "دیجیتالی‌سازی اسناد مالی",
-        "start_date": "2024-12-10",
-        "status": "در حال انجام",
-        "score": 83,
-    },
-    {
-        "department": "مالی",
-        "manager": "نگار احمدی",
-        "project_name": "بازطراحی ساختار گزارش‌دهی مالی",
-        "start_date": "2025-03-12",
-        "status": "در حال انجام",
-        "score": 80,
-    },
-    # منابع انسانی
-    {
-        "department": "منابع انسانی",
-        "manager": "سارا محمدی",
-        "project_name": "پیاده‌سازی سیستم ارزیابی عملکرد",
-        "start_date": "2025-01-25",
-        "status": "در حال انجام",
-        "score": 90,
-    },
-    {
-        "department": "منابع انسانی",
-        "manager": "سارا محمدی",
-        "project_name": "برنامه توسعه مهارت مدیران",
-        "start_date": "2025-02-18",
-        "status": "در حال انجام",
-        "score": 88,
-    },
-    {
-        "department": "منابع انسانی",
-        "manager": "مجتبی نوری",
-        "project_name": "سیستم جذب و استخدام آنلاین",
-        "start_date": "2024-12-01",
-        "status": "نزدیک به اتمام",
-        "score": 86,
-    },
-    # بازاریابی
-    {
-        "department": "بازاریابی",
-        "manager": "الهام صادقی",
-        "project_name": "کمپین دیجیتال برندینگ",
-        "start_date": "2025-01-10",
-        "status": "در حال انجام",
-        "score": 91,
-    },
-    {
-        "department": "بازاریابی",
-        "manager": "الهام صادقی",
-        "project_name": "تحلیل رفتار مشتریان",
-        "start_date": "2025-02-05",
-        "status": "در حال انجام",
-        "score": 87,
-    },
-    {
-        "department": "بازاریابی",
-        "manager": "امیر تقوی",
-        "project_name": "طراحی باشگاه مشتریان",
-        "start_date": "2024-11-30",
-        "status": "در حال انجام",
-        "score": 84,
-    },
-    # تحقیق و توسعه
-    {
-        "department": "تحقیق و توسعه",
-        "manager": "رضا کاظمی",
-        "project_name": "پروژه هوش مصنوعی پیش‌بینی فروش",
-        "start_date": "2025-01-20",
-        "status": "در حال انجام",
-        "score": 94,
-    },
-    {
-        "department": "تحقیق و توسعه",
-        "manager": "رضا کاظمی",
-        "project_name": "تحقیق بازار محصولات جدید",
-        "start_date": "2025-03-01",
-        "status": "در حال انجام",
-        "score": 89,
-    },
-    {
-        "department": "تحقیق و توسعه",
-        "manager": "نسیم رستگار",
-        "project_name": "آزمایش نمونه اولیه محصول",
-        "start_date": "2024-12-15",
-        "status": "نزدیک به اتمام",
-        "score": 88,
-    },
-]
-
-df = pd.DataFrame(projects_data)
-
-
-# ---------- Aggregations ----------
-dept_summary = (
-    df.groupby("department")
-    .agg(
-        active_projects=("project_name", "count"),
-        avg_score=("score", "mean"),
-    )
-    .reset_index()
-)
-dept_summary["avg_score"] = dept_summary["avg_score"].round(1)
-
-
-def make_bar_figure() -> px.bar:
-    fig = px.bar(
-        dept_summary,
-        x="department",
-        y="active_projects",
-        labels={"department": "واحد سازمانی", "active_projects": "تعداد پروژه‌ها"},
-        color="department",
-    )
-    fig.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=20, t=30, b=80),
-        xaxis_title=None,
-        yaxis_title="تعداد پروژه‌ها",
-        xaxis_tickangle=-25,
-        hovermode="x",
-        legend_title_text="واحد سازمانی",
-    )
-    fig.update_traces(
-        hovertemplate="<b>%{x}</b><br>تعداد پروژه‌ها: %{y}<extra></extra>",
-        marker_line_width=0,
-    )
-    return fig
-
-
-def make_line_figure() -> px.line:
-    fig = px.line(
-        dept_summary,
-        x="department",
-        y="avg_score",
-        markers=True,
-        labels={"department": "واحد سازمانی", "avg_score": "میانگین امتیاز"},
-    )
-    fig.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=20, t=30, b=80),
-        xaxis_title=None,
-        yaxis_title="میانگین امتیاز",
-        xaxis_tickangle=-25,
-        hovermode="x",
-    )
-    fig.update_traces(
-        hovertemplate="<b>%{x}</b><br>میانگین امتیاز: %{y}<extra></extra>",
-        line=dict(color="#2563eb"),
-        marker=dict(color="#2563eb", size=8),
-    )
-    return fig
-
-
-def make_pie_figure() -> px.pie:
-    fig = px.pie(
-        dept_summary,
-        names="department",
-        values="active_projects",
-        hole=0.45,
-    )
-    fig.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=160, t=10, b=10),
-        legend=dict(
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.05,
-        ),
-        legend_title_text="واحد سازمانی",
-    )
-    fig.update_traces(
-        textinfo="percent",
-        textposition="inside",
-        insidetextorientation="radial",
-        hovertemplate="<b>%{label}</b><br>تعداد پروژه‌ها: %{value}<extra></extra>",
-    )
-    return fig
-
-
-bar_fig = make_bar_figure()
-line_fig = make_line_figure()
-pie_fig = make_pie_figure()
-
-
-# ---------- Dash app ----------
-external_stylesheets = [dbc.themes.BOOTSTRAP]
-app: Dash = dash.Dash(
-    __name__,
-    external_stylesheets=external_stylesheets,
-    meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
-)
-app.title = "داشبورد پروژه‌های سازمانی"
-server = app.server  # for gunicorn / Render
-
-
-table_style = {
-    "style_header": {
-        "backgroundColor": "#f3f4f6",
-        "fontWeight": "bold",
-        "border": "1px solid #e5e7eb",
-    },
-    "style_cell": {
-        "textAlign": "right",
-        "padding": "8px",
-        "border": "1px solid #e5e7eb",
-        "fontFamily": "Segoe UI, sans-serif",
-        "fontSize": "13px",
-    },
-    "style_table": {"width": "100%", "overflowX": "auto"},
-    "style_data_conditional": [
-        {"if": {"row_index": "odd"}, "backgroundColor": "#f9fafb"},
-        {
-            "if": {"column_id": "score", "filter_query": "{score} >= 85"},
-            "backgroundColor": "#dcfce7",
-            "color": "#166534",
-            "fontWeight": "600",
-        },
-        {
-            "if": {
-                "column_id": "score",
-                "filter_query": "{score} >= 70 && {score} < 85",
-            },
-            "backgroundColor": "#fef9c3",
-            "color": "#854d0e",
-            "fontWeight": "600",
-        },
-        {
-            "if": {"column_id": "score", "filter_query": "{score} < 70"},
-            "backgroundColor": "#fee2e2",
-            "color": "#991b1b",
-            "fontWeight": "600",
-        },
-    ],
-}
-
-
-stat_card_style = {
-    "flex": "1",
-    "minWidth": "180px",
-    "backgroundColor": "#0f172a",
-    "color": "#e5e7eb",
-    "borderRadius": "14px",
-    "padding": "10px 14px",
-    "boxShadow": "0 10px 25px rgba(15,23,42,0.4)",
-}
-
-
-def stat_number(value: str) -> html.H3:
-    return html.H3(value, style={"margin": 0, "fontSize": "20px", "fontWeight": 600})
-
-
-app.layout = html.Div(
-    style={
-        "minHeight": "100vh",
-        "background": "radial-gradient(circle at top left, #111827 0, #020617 45%, #020617 100%)",
-        "padding": "24px",
-        "boxSizing": "border-box",
-        "fontFamily": "Vazirmatn, sans-serif",
-        "direction": "rtl",
-    },
-    children=[
-        html.Link(
-            rel="stylesheet",
-            href="https://fonts.googleapis.com/css2?family=Vazirmatn:wght@400;700&display=swap",
-        ),
-        dcc.Store(id="selected-department"),
-        html.Div(
-            style={
-                "maxWidth": "1200px",
-                "margin": "0 auto",
-                "display": "flex",
-                "flexDirection": "column",
-                "gap": "16px",
-            },
-            children=[
-                # Stats row
-                html.Div(
-                    style={
-                        "display": "flex",
-                        "flexWrap": "wrap",
-                        "gap": "12px",
-                    },
-                    children=[
-                        html.Div(
-                            style=stat_card_style,
-                            children=[
-                                html.P(
-                                    "تعداد کل پروژه‌ها",
-                                    style={
-                                        "margin": "0 0 4px",
-                                        "fontSize": "12px",
-                                        "color": "#9ca3af",
-                                    },
-                                ),
-                                stat_number(str(len(df))),
-                            ],
-                        ),
-                        html.Div(
-                            style=stat_card_style,
-                            children=[
-                                html.P(
-                                    "میانگین امتیاز کل",
-                                    style={
-                                        "margin": "0 0 4px",
-                                        "fontSize": "12px",
-                                        "color": "#9ca3af",
-                                    },
-                                ),
-                                stat_number(f"{df['score'].mean():.1f}"),
-                            ],
-                        ),
-                        html.Div(
-                            style=stat_card_style,
-                            children=[
-                                html.P(
-                                    "تعداد واحدها",
-                                    style={
-                                        "margin": "0 0 4px",
-                                        "fontSize": "12px",
-                                        "color": "#9ca3af",
-                                    },
-                                ),
-                                stat_number(str(df["department"].nunique())),
-                            ],
-                        ),
-                        html.Div(
-                            style=stat_card_style,
-                            children=[
-                                html.P(
-                                    "تعداد مدیران",
-                                    style={
-                                        "margin": "0 0 4px",
-                                        "fontSize": "12px",
-                                        "color": "#9ca3af",
-                                    },
-                                ),
-                                stat_number(str(df["manager"].nunique())),
-                            ],
-                        ),
-                    ],
-                ),
-                # Main row: sidebar + content
-                html.Div(
-                    style={"display": "flex", "flexDirection": "row", "gap": "16px", "alignItems": "flex-start"},
-                    children=[
-                        html.Div(
-                            style={
-                                "width": "180px", "minWidth": "160px",
-                                "backgroundColor": "#020617", "borderRadius": "20px",
-                                "padding": "18px 12px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.6)",
-                                "display": "flex", "flexDirection": "column",
-                                "alignItems": "center", "gap": "18px", "flexShrink": "0",
-                            },
-                            children=[
-                                html.Div("DP", style={
-                                    "width": "40px", "height": "40px", "borderRadius": "999px",
-                                    "background": "radial-gradient(circle at 0 0, #f97316, #6366f1)",
-                                    "display": "flex", "alignItems": "center", "justifyContent": "center",
-                                    "color": "#ffffff", "fontWeight": 600, "fontSize": "16px",
-                                }),
-                                html.Div(
-                                    style={"display": "flex", "flexDirection": "column", "gap": "6px", "width": "100%"},
-                                    children=[
-                                        html.Button("نمای کلی", id="nav-overview", n_clicks=0,
-                                            style={"width": "100%", "border": "none", "borderRadius": "999px",
-                                                   "padding": "8px 12px", "fontSize": "13px", "cursor": "pointer",
-                                                   "background": "#f9fafb", "color": "#020617", "textAlign": "right",
-                                                   "fontFamily": "Vazirmatn, sans-serif"}),
-                                        html.Button("پروژه‌ها", id="nav-projects", n_clicks=0,
-                                            style={"width": "100%", "border": "none", "borderRadius": "999px",
-                                                   "padding": "8px 12px", "fontSize": "13px", "cursor": "pointer",
-                                                   "background": "transparent", "color": "#9ca3af", "textAlign": "right",
-                                                   "fontFamily": "Vazirmatn, sans-serif"}),
-                                        html.Button("تسک‌ها", id="nav-tasks", n_clicks=0,
-                                            style={"width": "100%", "border": "none", "borderRadius": "999px",
-                                                   "padding": "8px 12px", "fontSize": "13px", "cursor": "pointer",
-                                                   "background": "transparent", "color": "#9ca3af", "textAlign": "right",
-                                                   "fontFamily": "Vazirmatn, sans-serif"}),
-                                        html.Button("اعضا", id="nav-members", n_clicks=0,
-                                            style={"width": "100%", "border": "none", "borderRadius": "999px",
-                                                   "padding": "8px 12px", "fontSize": "13px", "cursor": "pointer",
-                                                   "background": "transparent", "color": "#9ca3af", "textAlign": "right",
-                                                   "fontFamily": "Vazirmatn, sans-serif"}),
-                                        html.Button("تنظیمات", id="nav-settings", n_clicks=0,
-                                            style={"width": "100%", "border": "none", "borderRadius": "999px",
-                                                   "padding": "8px 12px", "fontSize": "13px", "cursor": "pointer",
-                                                   "background": "transparent", "color": "#9ca3af", "textAlign": "right",
-                                                   "fontFamily": "Vazirmatn, sans-serif"}),
-                                    ],
-                                ),
-                            ],
-                        ),
-                        # Main content column
-                        html.Div(
-                            style={"flex": "1 1 0%", "display": "flex", "flexDirection": "column", "gap": "16px", "minWidth": "0"},
-                            children=[
-                        # Overview content (default main view)
-                        html.Div(
-                            id="overview-content",
-                            style={
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "display": "flex",
-                                "flexDirection": "column",
-                                "gap": "20px",
-                            },
-                            children=[
-                                # Header
-                                html.Div(
-                                    style={
-                                        "display": "flex",
-                                        "justifyContent": "space-between",
-                                        "alignItems": "center",
-                                        "flexWrap": "wrap",
-                                        "gap": "8px",
-                                    },
-                                    children=[
-                                        html.Div(
-                                            children=[
-                                                html.H3(
-                                                    "نمای کلی",
-                                                    style={
-                                                        "margin": 0,
-                                                        "fontSize": "20px",
-                                                        "fontWeight": 600,
-                                                    },
-                                                ),
-                                                html.P(
-                                                    "نمایی از پروژه‌های فعال و عملکرد واحدها",
-                                                    style={
-                                                        "margin": "4px 0 0",
-                                                        "fontSize": "13px",
-                                                        "color": "#6b7280",
-                                                    },
-                                                ),
-                                            ]
-                                        ),
-                                    ],
-                                ),
-                                # Filter + middle charts row
-                                html.Div(
-                                    style={"display": "flex", "flexDirection": "column", "gap": "12px"},
-                                    children=[
-                                        html.Div(
-                                            style={
-                                                "display": "flex",
-                                                "flexDirection": "column",
-                                                "gap": "4px",
-                                            },
-                                            children=[
-                                                html.Div(
-                                                    "فیلتر بر اساس امتیاز پروژه‌ها",
-                                                    style={
-                                                        "fontSize": "13px",
-                                                        "color": "#4b5563",
-                                                    },
-                                                ),
-                                                dcc.RangeSlider(
-                                                    id="score-range",
-                                                    min=60,
-                                                    max=100,
-                                                    step=1,
-                                                    value=[60, 100],
-                                                    allowCross=False,
-                                                    marks={
-                                                        60: "60",
-                                                        70: "70",
-                                                        80: "80",
-                                                        90: "90",
-                                                        100: "100",
-                                                    },
-                                                ),
-                                                html.Div(
-                                                    id="score-range-text",
-                                                    style={
-                                                        "fontSize": "12px",
-                                                        "color": "#6b7280",
-                                                    },
-                                                ),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            style={
-                                                "display": "flex",
-                                                "flexWrap": "wrap",
-                                                "gap": "16px",
-                                            },
-                                            children=[
-                                                html.Div(
-                                                    style={
-                                                        "flex": "1 1 320px",
-                                                        "backgroundColor": "#ffffff",
-                                                        "borderRadius": "16px",
-                                                        "padding": "12px 12px 8px",
-                                                        "boxSizing": "borderBox",
-                                                    },
-                                                    children=[
-                                                        html.P(
-                                                            "میانگین امتیاز به تفکیک واحد",
-                                                            style={
-                                                                "margin": "0 0 4px",
-                                                                "fontSize": "13px",
-                                                                "fontWeight": 600,
-                                                            },
-                                                        ),
-                                                        dcc.Graph(
-                                                            id="avg-score-line",
-                                                            figure=line_fig,
-                                                            style={"height": "280px"},
-                                                            config={"displayModeBar": False},
-                                                        ),
-                                                    ],
-                                                ),
-                                                html.Div(
-                                                    style={
-                                                        "flex": "1 1 320px",
-                                                        "backgroundColor": "#ffffff",
-                                                        "borderRadius": "16px",
-                                                        "padding": "12px 12px 8px",
-                                                        "boxSizing": "borderBox",
-                                                    },
-                                                    children=[
-                                                        html.P(
-                                                            "تعداد پروژه‌های فعال به تفکیک واحد",
-                                                            style={
-                                                                "margin": "0 0 4px",
-                                                                "fontSize": "13px",
-                                                                "fontWeight": 600,
-                                                            },
-                                                        ),
-                                                        dcc.Graph(
-                                                            id="projects-per-dept-bar",
-                                                            figure=bar_fig,
-                                                            style={"height": "280px"},
-                                                            config={"displayModeBar": False},
-                                                        ),
-                                                    ],
-                                                ),
-                                            ],
-                                        ),
-                                    ],
-                                ),
-                                # Pie chart
-                                html.Div(
-                                    style={
-                                        "backgroundColor": "#ffffff",
-                                        "borderRadius": "16px",
-                                        "padding": "12px 12px 8px",
-                                    },
-                                    children=[
-                                        html.P(
-                                            "سهم واحدها از کل پروژه‌ها",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "13px",
-                                                "fontWeight": 600,
-                                            },
-                                        ),
-                                        dcc.Graph(
-                                            id="dept-share-pie",
-                                            figure=pie_fig,
-                                            style={"height": "260px"},
-                                            config={"displayModeBar": False},
-                                        ),
-                                    ],
-                                ),
-                                # Managers table
-                                html.Div(
-                                    style={
-                                        "backgroundColor": "#ffffff",
-                                        "borderRadius": "16px",
-                                        "padding": "12px 12px 8px",
-                                    },
-                                    children=[
-                                        html.P(
-                                            "مدیران پروژه در واحد انتخاب‌شده",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "13px",
-                                                "fontWeight": 600,
-                                            },
-                                        ),
-                                        html.P(
-                                            "روی نوار یکی از واحدها کلیک کنید تا این جدول پر شود.",
-                                            id="dept-hint-text",
-                                            style={
-                                                "margin": "0 0 8px",
-                                                "fontSize": "12px",
-                                                "color": "#6b7280",
-                                            },
-                                        ),
-                                        DataTable(
-                                            id="dept-managers-table",
-                                            columns=[
-                                                {"name": "مدیر پروژه", "id": "manager"},
-                                                {"name": "تعداد پروژه‌ها", "id": "project_count"},
-                                                {"name": "میانگین امتیاز", "id": "avg_score"},
-                                            ],
-                                            data=[],
-                                            cell_selectable=True,
-                                            row_selectable=False,
-                                            **table_style,
-                                        ),
-                                    ],
-                                ),
-                                # Projects table
-                                html.Div(
-                                    style={
-                                        "backgroundColor": "#ffffff",
-                                        "borderRadius": "16px",
-                                        "padding": "12px 12px 8px",
-                                    },
-                                    children=[
-                                        html.P(
-                                            "پروژه‌های مدیر انتخاب‌شده",
-                                            style={
-                                                "margin": "0 0 4px",
-                                                "fontSize": "13px",
-                                                "fontWeight": 600,
-                                            },
-                                        ),
-                                        html.P(
-                                            "روی نام یک مدیر در جدول بالا کلیک کنید تا این قسمت پر شود.",
-                                            id="manager-hint-text",
-                                            style={
-                                                "margin": "0 0 8px",
-                                                "fontSize": "12px",
-                                                "color": "#6b7280",
-                                            },
-                                        ),
-                                        DataTable(
-                                            id="manager-projects-table",
-                                            columns=[
-                                                {"name": "نام پروژه", "id": "project_name"},
-                                                {"name": "تاریخ شروع", "id": "start_date"},
-                                                {"name": "وضعیت", "id": "status"},
-                                                {"name": "امتیاز", "id": "score"},
-                                            ],
-                                            data=[],
-                                            cell_selectable=False,
-                                            row_selectable=False,
-                                            **table_style,
-                                        ),
-                                        html.Div(
-                                            style={
-                                                "marginTop": "10px",
-                                                "display": "flex",
-                                                "justifyContent": "flex-start",
-                                            },
-                                            children=[
-                                                html.Button(
-                                                    "دانلود Excel",
-                                                    id="download-manager-projects",
-                                                    n_clicks=0,
-                                                    style={
-                                                        "border": "none",
-                                                        "borderRadius": "999px",
-                                                        "padding": "6px 14px",
-                                                        "fontSize": "12px",
-                                                        "cursor": "pointer",
-                                                        "backgroundColor": "#2563eb",
-                                                        "color": "#ffffff",
-                                                    },
-                                                ),
-                                                dcc.Download(id="manager-projects-download"),
-                                            ],
-                                        ),
-                                    ],
-                                ),
-                            ],
-                        ),
-                        # Projects page content
-                        html.Div(
-                            id="projects-content",
-                            style={
-                                "display": "none",
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "display": "none",
-                                "flexDirection": "column",
-                                "gap": "16px",
-                            },
-                            children=[
-                                html.H3(
-                                    "پروژه‌ها",
-                                    style={
-                                        "margin": 0,
-                                        "fontSize": "20px",
-                                        "fontWeight": 600,
-                                    },
-                                ),
-                                html.P(
-                                    "لیست همه پروژه‌ها به همراه واحد و مدیر مربوطه.",
-                                    style={
-                                        "margin": "4px 0 8px",
-                                        "fontSize": "13px",
-                                        "color": "#6b7280",
-                                    },
-                                ),
-                                DataTable(
-                                    id="all-projects-table",
-                                    columns=[
-                                        {"name": "واحد سازمانی", "id": "department"},
-                                        {"name": "مدیر پروژه", "id": "manager"},
-                                        {"name": "نام پروژه", "id": "project_name"},
-                                        {"name": "تاریخ شروع", "id": "start_date"},
-                                        {"name": "وضعیت", "id": "status"},
-                                        {"name": "امتیاز", "id": "score"},
-                                    ],
-                                    data=df.to_dict("records"),
-                                    sort_action="native",
-                                    **table_style,
-                                ),
-                            ],
-                        ),
-                        # Tasks page content (status summary)
-                        html.Div(
-                            id="tasks-content",
-                            style={
-                                "display": "none",
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "flexDirection": "column",
-                                "gap": "16px",
-                            },
-                            children=[
-                                html.H3(
-                                    "وضعیت پروژه‌ها",
-                                    style={
-                                        "margin": 0,
-                                        "fontSize": "20px",
-                                        "fontWeight": 600,
-                                    },
-                                ),
-                                html.P(
-                                    "خلاصه‌ای از تعداد پروژه‌ها بر اساس وضعیت اجرا.",
-                                    style={
-                                        "margin": "4px 0 8px",
-                                        "fontSize": "13px",
-                                        "color": "#6b7280",
-                                    },
-                                ),
-                                DataTable(
-                                    id="status-summary-table",
-                                    columns=[
-                                        {"name": "وضعیت", "id": "status"},
-                                        {"name": "تعداد پروژه‌ها", "id": "project_count"},
-                                    ],
-                                    data=(
-                                        df.groupby("status")
-                                        .agg(project_count=("project_name", "count"))
-                                        .reset_index()
-                                    ).to_dict("records"),
-                                    **table_style,
-                                ),
-                            ],
-                        ),
-                        # Members page content (managers summary)
-                        html.Div(
-                            id="members-content",
-                            style={
-                                "display": "none",
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "flexDirection": "column",
-                                "gap": "16px",
-                            },
-                            children=[
-                                html.H3(
-                                    "مدیران پروژه",
-                                    style={
-                                        "margin": 0,
-                                        "fontSize": "20px",
-                                        "fontWeight": 600,
-                                    },
-                                ),
-                                html.P(
-                                    "خلاصه تعداد پروژه‌ها و میانگین امتیاز برای هر مدیر در واحدهای مختلف.",
-                                    style={
-                                        "margin": "4px 0 8px",
-                                        "fontSize": "13px",
-                                        "color": "#6b7280",
-                                    },
-                                ),
-                                DataTable(
-                                    id="managers-summary-table",
-                                    columns=[
-                                        {"name": "مدیر پروژه", "id": "manager"},
-                                        {"name": "واحد سازمانی", "id": "department"},
-                                        {"name": "تعداد پروژه‌ها", "id": "project_count"},
-                                        {"name": "میانگین امتیاز", "id": "avg_score"},
-                                    ],
-                                    data=(
-                                        df.groupby(["manager", "department"])
-                                        .agg(
-                                            project_count=("project_name", "count"),
-                                            avg_score=("score", "mean"),
-                                        )
-                                        .reset_index()
-                                        .assign(avg_score=lambda d: d["avg_score"].round(1))
-                                    ).to_dict("records"),
-                                    **table_style,
-                                ),
-                            ],
-                        ),
-                        # Settings placeholder content
-                        html.Div(
-                            id="settings-content",
-                            style={
-                                "display": "none",
-                                "backgroundColor": "#f9fafb",
-                                "borderRadius": "20px",
-                                "padding": "20px 20px 24px",
-                                "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-                                "flexDirection": "column",
-                                "gap": "10px",
-                            },
-                            children=[
-                                html.H3(
-                                    "تنظیمات داشبورد",
-                                    style={
-                                        "margin": 0,
-                                        "fontSize": "20px",
-                                        "fontWeight": 600,
-                                    },
-                                ),
-                                html.P(
-                                    "در نسخه‌ی واقعی می‌توانستید از این بخش برای تغییر فیلترها، بازه‌ی زمانی پیش‌فرض و تنظیمات ظاهری استفاده کنید.",
-                                    style={
-                                        "margin": "4px 0 0",
-                                        "fontSize": "13px",
-                                        "color": "#6b7280",
-                                    },
-                                ),
-                            ],
-                        ),
-                            ],
-                        ),
-                    ],
-                ),
-            ],
-        ),
-    ],
-)
-
-
-# ---------- Callbacks ----------
-@app.callback(
-    Output("avg-score-line", "figure"),
-    Output("projects-per-dept-bar", "figure"),
-    Output("dept-share-pie", "figure"),
-    Output("score-range-text", "children"),
-    Input("score-range", "value"),
-)
-def update_charts_by_score(score_range):
-    if not score_range:
-        lo, hi = 60, 100
-    else:
-        lo, hi = score_range
-
-    filtered = df[(df["score"] >= lo) & (df["score"] <= hi)]
-    if filtered.empty:
-        # اگر فیلتر خیلی تنگ باشد، همه‌چیز خالی نشان داده شود ولی بدون خطا
-        empty = df.iloc[0:0]
-        local_dept = (
-            empty.groupby("department")
-            .agg(
-                active_projects=("project_name", "count"),
-                avg_score=("score", "mean"),
-            )
-            .reset_index()
-        )
-    else:
-        local_dept = (
-            filtered.groupby("department")
-            .agg(
-                active_projects=("project_name", "count"),
-                avg_score=("score", "mean"),
-            )
-            .reset_index()
-        )
-        local_dept["avg_score"] = local_dept["avg_score"].round(1)
-
-    # از توابع ساخت نمودار با summary جدید استفاده نکنیم که به df اصلی وابسته‌اند
-    bar = px.bar(
-        local_dept,
-        x="department",
-        y="active_projects",
-        labels={"department": "واحد سازمانی", "active_projects": "تعداد پروژه‌ها"},
-        color="department",
-    )
-    bar.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=20, t=30, b=80),
-        xaxis_title=None,
-        yaxis_title="تعداد پروژه‌ها",
-        xaxis_tickangle=-25,
-        hovermode="x",
-        legend_title_text="واحد سازمانی",
-    )
-    bar.update_traces(
-        hovertemplate="<b>%{x}</b><br>تعداد پروژه‌ها: %{y}<extra></extra>",
-        marker_line_width=0,
-    )
-
-    line = px.line(
-        local_dept,
-        x="department",
-        y="avg_score",
-        markers=True,
-        labels={"department": "واحد سازمانی", "avg_score": "میانگین امتیاز"},
-    )
-    line.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=20, t=30, b=80),
-        xaxis_title=None,
-        yaxis_title="میانگین امتیاز",
-        xaxis_tickangle=-25,
-        hovermode="x",
-    )
-    line.update_traces(
-        hovertemplate="<b>%{x}</b><br>میانگین امتیاز: %{y}<extra></extra>",
-        line=dict(color="#2563eb"),
-        marker=dict(color="#2563eb", size=8),
-    )
-
-    pie = px.pie(
-        local_dept,
-        names="department",
-        values="active_projects",
-        hole=0.45,
-    )
-    pie.update_layout(
-        template="plotly_white",
-        margin=dict(l=40, r=160, t=10, b=10),
-        legend=dict(
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.05,
-        ),
-        legend_title_text="واحد سازمانی",
-    )
-    pie.update_traces(
-        textinfo="percent",
-        textposition="inside",
-        insidetextorientation="radial",
-        hovertemplate="<b>%{label}</b><br>تعداد پروژه‌ها: %{value}<extra></extra>",
-    )
-
-    text = f"نمایش پروژه‌ها با امتیاز بین {lo} تا {hi}"
-    return line, bar, pie, text
-
-
-@app.callback(
-    Output("nav-overview", "style"),
-    Output("nav-projects", "style"),
-    Output("nav-tasks", "style"),
-    Output("nav-members", "style"),
-    Output("nav-settings", "style"),
-    Output("overview-content", "style"),
-    Output("projects-content", "style"),
-    Output("tasks-content", "style"),
-    Output("members-content", "style"),
-    Output("settings-content", "style"),
-    Input("nav-overview", "n_clicks"),
-    Input("nav-projects", "n_clicks"),
-    Input("nav-tasks", "n_clicks"),
-    Input("nav-members", "n_clicks"),
-    Input("nav-settings", "n_clicks"),
-)
-def update_menu_styles(ov, pr, ta, me, se):
-    ctx = dash.callback_context
-    active_id = "nav-overview"
-    if ctx.triggered:
-        active_id = ctx.triggered[0]["prop_id"].split(".")[0] or "nav-overview"
-
-    def style_for(button_id: str) -> dict:
-        base = {
-            "width": "100%",
-            "border": "none",
-            "borderRadius": "999px",
-            "padding": "8px 12px",
-            "fontSize": "13px",
-            "cursor": "pointer",
-            "transition": "background-color 0.15s ease, color 0.15s ease",
-        }
-        if button_id == active_id:
-            base.update({"background": "#f9fafb", "color": "#020617"})
-        else:
-            base.update({"background": "transparent", "color": "#9ca3af"})
-        return base
-
-    def block_style(show: bool) -> dict:
-        base = {
-            "backgroundColor": "#f9fafb",
-            "borderRadius": "20px",
-            "padding": "20px 20px 24px",
-            "boxShadow": "0 18px 40px rgba(15,23,42,0.35)",
-            "flexDirection": "column",
-            "gap": "16px",
-            "display": "flex" if show else "none",
-        }
-        return base
-
-    return (
-        style_for("nav-overview"),
-        style_for("nav-projects"),
-        style_for("nav-tasks"),
-        style_for("nav-members"),
-        style_for("nav-settings"),
-        block_style(active_id == "nav-overview"),
-        block_style(active_id == "nav-projects"),
-        block_style(active_id == "nav-tasks"),
-        block_style(active_id == "nav-members"),
-        block_style(active_id == "nav-settings"),
-    )
-
-
-@app.callback(
-    Output("dept-managers-table", "data"),
-    Output("dept-hint-text", "children"),
-    Output("selected-department", "data"),
-    Input("projects-per-dept-bar", "clickData"),
-)
-def update_managers(click_data):
-    if not click_data or "points" not in click_data or not click_data["points"]:
-        return [], "روی نوار یکی از واحدها کلیک کنید تا این جدول پر شود.", None
-
-    department = click_data["points"][0]["x"]
-    subset = df[df["department"] == department]
-    if subset.empty:
-        return [], "برای این واحد، داده‌ای ثبت نشده است.", None
-
-    managers = (
-        subset.groupby("manager")
-        .agg(
-            project_count=("project_name", "count"),
-            avg_score=("score", "mean"),
-        )
-        .reset_index()
-    )
-    managers["avg_score"] = managers["avg_score"].round(1)
-    hint = f"واحد انتخاب‌شده: {department} — برای مشاهده پروژه‌ها، روی نام مدیر کلیک کنید."
-    return managers.to_dict("records"), hint, department
-
-
-@app.callback(
-    Output("manager-projects-table", "data"),
-    Output("manager-hint-text", "children"),
-    Input("dept-managers-table", "active_cell"),
-    State("dept-managers-table", "data"),
-    State("selected-department", "data"),
-)
-def update_projects(active_cell, managers_data, selected_department):
-    if (
-        not active_cell
-        or managers_data is None
-        or selected_department is None
-        or active_cell.get("row") is None
-    ):
-        return [], "روی نام یک مدیر در جدول بالا کلیک کنید تا این قسمت پر شود."
-
-    row = active_cell["row"]
-    if row >= len(managers_data):
-        return [], "انتخاب نامعتبر است؛ لطفاً دوباره مدیر را انتخاب کنید."
-
-    manager_name = managers_data[row].get("manager")
-    if not manager_name:
-        return [], "برای مشاهده جزئیات، روی نام مدیر کلیک کنید."
-
-    subset = df[
-        (df["department"] == selected_department) & (df["manager"] == manager_name)
-    ][["project_name", "start_date", "status", "score"]].copy()
-
-    if subset.empty:
-        return [], "برای این مدیر در این واحد، پروژه‌ای ثبت نشده است."
-
-    hint = f"مدیر انتخاب‌شده: {manager_name} — تعداد پروژه‌ها: {len(subset)}"
-    return subset.to_dict("records"), hint
-
-
-@app.callback(
-    Output("manager-projects-download", "data"),
-    Input("download-manager-projects", "n_clicks"),
-    State("manager-projects-table", "data"),
-    prevent_initial_call=True,
-)
-def export_manager_projects(n_clicks, table_data):
-    if not table_data:
-        return dash.no_update
-    export_df = pd.DataFrame(table_data)
-    return dcc.send_bytes(
-        lambda b: export_df.to_excel(b, index=False, engine="openpyxl"),
-        "manager-projects.xlsx",
-    )
-
-
-if __name__ == "__main__":
-    port = int(os.environ.get("PORT", "8050"))
-    app.run(host="0.0.0.0", port=port, debug=True)
-
 import dash
-from dash import Dash, dcc, html, Input, Output, State
+from dash import (
+    ClientsideFunction,
+    Dash,
+    Patch,
+    dcc,
+    html,
+    Input,
+    Output,
+    State,
+    ctx,
+)
 from dash.dash_table import DataTable
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import pandas as pd
-import plotly.express as px
+import atexit
 import os
+import tempfile
+from functools import partial
+from typing import TYPE_CHECKING
+
+import numpy as np
+from flask import Response, abort, request, send_file, stream_with_context
+
+from caching import Abandoned, FileCache, LRUCache, cache_stats
+from counters import EventCounters
+from data_source import to_table_records
+from export import (
+    EXPORT_SORT,
+    FILENAMES,
+    MIMETYPES,
+    WRITERS,
+    export_order,
+    iter_csv,
+    write_department_workbook,
+)
+from jobs import PUBLIC_JOB_FIELDS, ExportJobs
+from latest import ComputeSlots, LatestRequests
+from store import ProjectDataSource
+from table_query import apply_mask, filter_mask, page_slice, sort_positions
+from warmup import CacheWarmer, RangeTraffic, all_ranges
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 
 # ---------- Sample data ----------
@@ -2539,33 +182,51 @@ projects_data = [
     },
 ]
 
-df = pd.DataFrame(projects_data)
-score_min, score_max = int(df["score"].min()), int(df["score"].max())
+# مقدارهای پیش‌فرض از متغیرهای محیطی خوانده می‌شوند؛ create_app می‌تواند هرکدام را بازنویسی کند
+DEFAULT_CONFIG = {
+    # اگر data_path تنظیم شده باشد، داده‌ها از فایل CSV/Parquet/Excel خوانده می‌شوند
+    "data_path": os.environ.get("PROJECTS_DATA_PATH"),
+    # هر چند ثانیه یک بار امضای فایل داده بررسی و در صورت تغییر دوباره بارگذاری می‌شود (0 = هرگز)
+    "data_reload_interval": float(os.environ.get("PROJECTS_RELOAD_INTERVAL", "30")),
+    "overview_cache_size": int(os.environ.get("OVERVIEW_CACHE_SIZE", "512")),
+    "filter_cache_size": int(os.environ.get("FILTER_CACHE_SIZE", "32")),
+    "summary_cache_size": int(os.environ.get("SUMMARY_CACHE_SIZE", "256")),
+    "manager_summary_cache_size": int(os.environ.get("MANAGER_SUMMARY_CACHE_SIZE", "1024")),
+    "traffic_file": os.environ.get("OVERVIEW_TRAFFIC_FILE"),
+    "warmup": os.environ.get("OVERVIEW_WARMUP", "off"),
+    "warmup_top": int(os.environ.get("OVERVIEW_WARMUP_TOP", "100")),
+    "page_size": int(os.environ.get("PROJECTS_PAGE_SIZE", "20")),
+    # با gunicorn --preload داده‌ها در فرایند اصلی ساخته و با workerها به‌صورت copy-on-write شریک می‌شوند
+    "preload": os.environ.get("PRELOAD_APP", "0") == "1",
+    # درخواست نمای کلی‌ای که همان صفحه درخواست تازه‌تری بعد از آن فرستاده، نیمه‌کاره رها می‌شود
+    "latest_wins": os.environ.get("OVERVIEW_LATEST_WINS", "1") == "1",
+    # نمودارها زیر GIL ساخته می‌شوند؛ ساخت هم‌زمان بیشتر در یک فرایند فقط CPU را تقسیم می‌کند
+    "overview_concurrency": int(os.environ.get("OVERVIEW_CONCURRENCY", "2")),
+    # فایل‌های خروجی ساخته‌شده تا این سقف حجم روی دیسک نگه داشته و دوباره فرستاده می‌شوند
+    "export_cache_dir": os.environ.get(
+        "EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "dashboard-export-cache")
+    ),
+    "export_cache_bytes": int(os.environ.get("EXPORT_CACHE_BYTES", str(512 * 1024 * 1024))),
+    # خروجی‌های دکمه‌های دانلود به‌صورت کار پس‌زمینه ساخته و در این پوشه نگه داشته می‌شوند
+    "export_jobs_dir": os.environ.get("EXPORT_JOBS_DIR"),
+    "export_workers": int(os.environ.get("EXPORT_WORKERS", "2")),
+    # پردازه‌های ساخت برگه‌های اکسل به تفکیک واحد (0 = یکی به ازای هر CPU)
+    "export_processes": int(os.environ.get("EXPORT_PROCESSES", "0")),
+    "export_job_ttl": int(os.environ.get("EXPORT_JOB_TTL", "3600")),
+}
 
+SCORE_SLIDER_MIN, SCORE_SLIDER_MAX = 60, 100
 
-# ---------- Aggregations for level 1 ----------
-dept_summary = (
-    df.groupby("department")
-    .agg(
-        active_projects=("project_name", "count"),
-        avg_score=("score", "mean"),
-    )
-    .reset_index()
-)
 
-dept_summary["avg_score"] = dept_summary["avg_score"].round(1)
+def build_bar_figure(summary: pd.DataFrame) -> "go.Figure":
+    import plotly.express as px
 
-def build_bar_figure(filtered_df: pd.DataFrame) -> px.bar:
-    summary = (
-        filtered_df.groupby("department")
-        .agg(active_projects=("project_name", "count"))
-        .reset_index()
-    )
     fig = px.bar(
         summary,
         x="department",
         y="active_projects",
         color="department",
+        custom_data=["managers"],
         labels={"department": "واحد سازمانی", "active_projects": "تعداد پروژه‌های فعال"},
     )
     fig.update_layout(
@@ -2581,18 +242,14 @@ def build_bar_figure(filtered_df: pd.DataFrame) -> px.bar:
     )
     fig.update_traces(
         marker_line_width=0,
-        hovertemplate="<b>%{x}</b><br>تعداد پروژه‌ها: %{y}<extra></extra>",
+        hovertemplate="<b>%{x}</b><br>تعداد پروژه‌ها: %{y}<br>تعداد مدیران: %{customdata[0]}<extra></extra>",
     )
     return fig
 
 
-def build_line_figure(filtered_df: pd.DataFrame) -> px.line:
-    summary = (
-        filtered_df.groupby("department")
-        .agg(avg_score=("score", "mean"))
-        .reset_index()
-    )
-    summary["avg_score"] = summary["avg_score"].round(1)
+def build_line_figure(summary: pd.DataFrame) -> "go.Figure":
+    import plotly.express as px
+
     fig = px.line(
         summary,
         x="department",
@@ -2618,12 +275,9 @@ def build_line_figure(filtered_df: pd.DataFrame) -> px.line:
     return fig
 
 
-def build_pie_figure(filtered_df: pd.DataFrame) -> px.pie:
-    summary = (
-        filtered_df.groupby("department")
-        .agg(active_projects=("project_name", "count"))
-        .reset_index()
-    )
+def build_pie_figure(summary: pd.DataFrame) -> "go.Figure":
+    import plotly.express as px
+
     fig = px.pie(
         summary,
         names="department",
@@ -2652,22 +306,14 @@ def build_pie_figure(filtered_df: pd.DataFrame) -> px.pie:
     return fig
 
 
-initial_bar_fig = build_bar_figure(df)
-initial_line_fig = build_line_figure(df)
-initial_pie_fig = build_pie_figure(df)
-
-
-# ---------- App setup ----------
-external_stylesheets = [dbc.themes.BOOTSTRAP]
-app: Dash = dash.Dash(
-    __name__,
-    external_stylesheets=external_stylesheets,
-    meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
-)
-app.title = "داشبورد پروژه‌های سازمانی"
-
-# Render/Gunicorn entrypoint
-server = app.server
+def figure_patch(fig, fields) -> Patch:
+    """Patch that replaces only the given data arrays of every trace of ``fig``."""
+    patch = Patch()
+    for index, trace in enumerate(fig.data):
+        for field in fields:
+            values = trace[field]
+            patch["data"][index][field] = None if values is None else list(values)
+    return patch
 
 
 def make_table_style():
@@ -2721,791 +367,1345 @@ def make_table_style():
 base_table_style = make_table_style()
 
 
-app.layout = html.Div(
-    className="app-bg",
-    children=[
-        dcc.Store(id="selected-department"),
-        dbc.Container(
-            fluid=True,
-            className="app-shell",
+# ---------- Layout ----------
+# (فرمت، عنوان، شناسه‌ی دکمه) برای دکمه‌های دانلود لیست پروژه‌ها
+EXPORT_BUTTONS = [
+    ("xlsx", "دانلود اکسل", "download-projects-btn"),
+    ("departments", "اکسل به تفکیک واحد", "download-projects-departments-btn"),
+    ("csv", "CSV", "download-projects-csv-btn"),
+    ("parquet", "Parquet", "download-projects-parquet-btn"),
+]
+
+
+# ---------- Pages ----------
+# محتوای صفحه‌های غیر از نمای کلی؛ هر صفحه در اولین باز شدن ساخته و فرستاده می‌شود
+def projects_page(page_size=DEFAULT_CONFIG["page_size"]):
+    return [
+        html.Div(
+            className="topbar",
+            children=[
+                html.Div(
+                    className="topbar-title",
+                    children=[
+                        html.H2(
+                            "پروژه‌ها",
+                            className="topbar-heading",
+                        ),
+                        html.P(
+                            "لیست همه پروژه‌ها به همراه واحد، مدیر و وضعیت.",
+                            className="topbar-subtitle",
+                        ),
+                    ],
+                ),
+            ],
+        ),
+        html.Div(
+            className="section-card",
             children=[
-                dbc.Row(
-                    className="g-0 app-row",
+                html.Div(
+                    className="section-header section-header-inline",
                     children=[
-                        # Sidebar
-                        dbc.Col(
-                            className="sidebar-wrapper",
-                            md=2,
+                        html.Div(
+                            "لیست پروژه‌ها (با اعمال فیلتر امتیاز)",
+                            className="card-caption",
+                        ),
+                        html.Div(
+                            className="export-actions",
                             children=[
-                                html.Div(
-                                    className="sidebar-card",
-                                    children=[
-                                        html.Div(
-                                            className="sidebar-logo mb-4",
-                                            children=html.Div("DP", className="logo-circle"),
-                                        ),
-                                        html.Div(
-                                            className="sidebar-nav",
-                                            children=[
-                                                html.Button(
-                                                    "نمای کلی",
-                                                    id="nav-overview",
-                                                    n_clicks=0,
-                                                    className="sidebar-item active",
-                                                ),
-                                                html.Button(
-                                                    "پروژه‌ها",
-                                                    id="nav-projects",
-                                                    n_clicks=0,
-                                                    className="sidebar-item",
-                                                ),
-                                                html.Button(
-                                                    "تسک‌ها",
-                                                    id="nav-tasks",
-                                                    n_clicks=0,
-                                                    className="sidebar-item",
-                                                ),
-                                                html.Button(
-                                                    "اعضا",
-                                                    id="nav-members",
-                                                    n_clicks=0,
-                                                    className="sidebar-item",
-                                                ),
-                                                html.Button(
-                                                    "تنظیمات",
-                                                    id="nav-settings",
-                                                    n_clicks=0,
-                                                    className="sidebar-item",
-                                                ),
-                                            ],
-                                        ),
-                                    ],
+                                dbc.Button(
+                                    label,
+                                    id=button_id,
+                                    color="secondary",
+                                    outline=fmt != "xlsx",
+                                    size="sm",
+                                    className="export-btn",
                                 )
+                                for fmt, label, button_id in EXPORT_BUTTONS
                             ],
                         ),
-                        # Main content
-                        dbc.Col(
-                            md=10,
-                            className="main-wrapper",
-                            children=[
-                                # Stats cards row
-                                html.Div(
-                                    className="stat-cards",
-                                    children=[
-                                        html.Div(
-                                            className="stat-card",
-                                            children=[
-                                                html.P("تعداد کل پروژه‌ها", className="stat-label"),
-                                                html.H3(id="stat-total-projects", className="stat-value"),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            className="stat-card",
-                                            children=[
-                                                html.P("میانگین امتیاز کل", className="stat-label"),
-                                                html.H3(id="stat-avg-score", className="stat-value"),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            className="stat-card",
-                                            children=[
-                                                html.P("تعداد واحدها", className="stat-label"),
-                                                html.H3(id="stat-dept-count", className="stat-value"),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            className="stat-card",
-                                            children=[
-                                                html.P("تعداد مدیران", className="stat-label"),
-                                                html.H3(id="stat-manager-count", className="stat-value"),
-                                            ],
-                                        ),
-                                    ],
-                                ),
-                                # Overview page (default)
-                                html.Div(
-                                    id="overview-content",
-                                    className="main-card",
-                                    children=[
-                                        # Top bar
-                                        html.Div(
-                                            className="topbar",
-                                            children=[
-                                                html.Div(
-                                                    className="topbar-title",
-                                                    children=[
-                                                        html.H2(
-                                                            "نمای کلی",
-                                                            className="topbar-heading",
-                                                        ),
-                                                        html.P(
-                                                            "مروری بر پروژه‌های فعال سازمان و عملکرد واحدها",
-                                                            className="topbar-subtitle",
-                                                        ),
-                                                    ],
-                                                ),
-                                                html.Div(
-                                                    className="topbar-actions",
-                                                    children=[
-                                                        dbc.Input(
-                                                            type="search",
-                                                            placeholder="جستجو در پروژه‌ها...",
-                                                            className="search-input",
-                                                        ),
-                                                        dbc.Button(
-                                                            "گزارش این هفته",
-                                                            color="primary",
-                                                            className="topbar-btn",
-                                                        ),
-                                                    ],
-                                                ),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            className="filter-row",
-                                            children=[
-                                                html.Div(
-                                                    className="filter-label",
-                                                    children="فیلتر بر اساس امتیاز پروژه‌ها",
-                                                ),
-                                                dcc.RangeSlider(
-                                                    id="score-range",
-                                                    min=60,
-                                                    max=100,
-                                                    step=1,
-                                                    value=[score_min, score_max],
-                                                    allowCross=False,
-                                                    marks={
-                                                        60: "60",
-                                                        70: "70",
-                                                        80: "80",
-                                                        90: "90",
-                                                        100: "100",
-                                                    },
-                                                ),
-                                                html.Div(
-                                                    id="score-range-text",
-                                                    className="filter-caption",
-                                                ),
-                                            ],
-                                        ),
-                                        # Charts row
-                                        dbc.Row(
-                                            className="charts-row gy-3 mb-4",
-                                            children=[
-                                                dbc.Col(
-                                                    md=7,
-                                                    children=html.Div(
-                                                        className="chart-card",
+                    ],
+                ),
+                # وضعیت کار پس‌زمینه‌ی ساخت فایل خروجی
+                dcc.Store(id="export-job"),
+                dcc.Interval(id="export-job-poll", interval=1000, disabled=True),
+                html.Div(
+                    id="export-job-status",
+                    className="export-job-status",
+                    style={"display": "none"},
+                    children=[
+                        dbc.Progress(
+                            id="export-job-progress",
+                            value=0,
+                            striped=True,
+                            className="export-job-progress",
+                        ),
+                        html.Span(id="export-job-text", className="card-caption"),
+                        html.A(
+                            "دریافت فایل",
+                            id="export-job-link",
+                            className="btn btn-success btn-sm export-btn",
+                            style={"display": "none"},
+                        ),
+                    ],
+                ),
+                DataTable(
+                    id="all-projects-table",
+                    columns=[
+                        {"name": "واحد سازمانی", "id": "department"},
+                        {"name": "مدیر پروژه", "id": "manager"},
+                        {"name": "نام پروژه", "id": "project_name"},
+                        {"name": "تاریخ شروع", "id": "start_date"},
+                        {"name": "وضعیت", "id": "status"},
+                        {"name": "امتیاز", "id": "score", "type": "numeric"},
+                    ],
+                    # صفحه‌بندی، مرتب‌سازی و فیلتر در سرور انجام می‌شود و فقط صفحه‌ی جاری ارسال می‌شود
+                    data=[],
+                    page_action="custom",
+                    page_current=0,
+                    page_size=page_size,
+                    sort_action="custom",
+                    sort_mode="multi",
+                    sort_by=[],
+                    filter_action="custom",
+                    filter_query="",
+                    row_selectable=False,
+                    cell_selectable=False,
+                    **base_table_style,
+                ),
+            ],
+        ),
+    ]
+
+
+def tasks_page():
+    return [
+        html.Div(
+            className="topbar",
+            children=[
+                html.Div(
+                    className="topbar-title",
+                    children=[
+                        html.H2(
+                            "وضعیت پروژه‌ها",
+                            className="topbar-heading",
+                        ),
+                        html.P(
+                            "نمایی از تعداد پروژه‌ها بر اساس وضعیت اجرا (با اعمال فیلتر امتیاز).",
+                            className="topbar-subtitle",
+                        ),
+                    ],
+                ),
+            ],
+        ),
+        html.Div(
+            className="section-card",
+            children=DataTable(
+                id="status-summary-table",
+                columns=[
+                    {"name": "وضعیت", "id": "status"},
+                    {"name": "تعداد پروژه‌ها", "id": "project_count"},
+                ],
+                data=[],
+                row_selectable=False,
+                cell_selectable=False,
+                **base_table_style,
+            ),
+        ),
+    ]
+
+
+def members_page():
+    return [
+        html.Div(
+            className="topbar",
+            children=[
+                html.Div(
+                    className="topbar-title",
+                    children=[
+                        html.H2(
+                            "مدیران پروژه",
+                            className="topbar-heading",
+                        ),
+                        html.P(
+                            "لیست مدیران پروژه به همراه واحد و عملکرد آن‌ها (با اعمال فیلتر امتیاز).",
+                            className="topbar-subtitle",
+                        ),
+                    ],
+                ),
+            ],
+        ),
+        html.Div(
+            className="section-card",
+            children=DataTable(
+                id="managers-summary-table",
+                columns=[
+                    {"name": "مدیر پروژه", "id": "manager"},
+                    {"name": "واحد سازمانی", "id": "department"},
+                    {"name": "تعداد پروژه‌ها", "id": "project_count"},
+                    {"name": "میانگین امتیاز", "id": "avg_score"},
+                ],
+                data=[],
+                row_selectable=False,
+                cell_selectable=False,
+                **base_table_style,
+            ),
+        ),
+    ]
+
+
+def settings_page():
+    return [
+        html.Div(
+            className="topbar",
+            children=[
+                html.Div(
+                    className="topbar-title",
+                    children=[
+                        html.H2(
+                            "تنظیمات داشبورد",
+                            className="topbar-heading",
+                        ),
+                        html.P(
+                            "برخی تنظیمات پیشنهادی ظاهری و نمایشی برای این داشبورد نمونه.",
+                            className="topbar-subtitle",
+                        ),
+                    ],
+                ),
+            ],
+        ),
+        html.Div(
+            className="section-card",
+            children=[
+                html.P(
+                    "این نسخه‌ی نمونه است؛ در یک نسخه‌ی واقعی، می‌توانید از این بخش برای تغییر بازه‌ی زمانی پیش‌فرض، فیلتر واحدها، و تنظیمات تم گراف‌ها استفاده کنید.",
+                    className="card-caption mb-2",
+                ),
+                html.Ul(
+                    [
+                        html.Li("بازه‌ی زمانی پیش‌فرض نمودارها: «هفته جاری»."),
+                        html.Li("حالت نمایش: راست‌به‌چپ برای زبان فارسی."),
+                        html.Li("تم رنگی ملایم برای نمودارها و کارت‌ها."),
+                    ],
+                    style={"fontSize": "13px", "color": "#4b5563"},
+                ),
+            ],
+        ),
+    ]
+
+
+PAGES = {
+    "projects": projects_page,
+    "tasks": tasks_page,
+    "members": members_page,
+    "settings": settings_page,
+}
+
+
+def lazy_page(name, page=None):
+    """Children of page ``name`` in the layout.
+
+    The served layout only carries a placeholder; ``render_page`` sends the
+    real content the first time the page is opened.  The validation layout
+    passes the app's ``page`` builder to get the real components so their
+    callbacks validate.
+    """
+    if page is not None:
+        return page(name)
+    return [html.Div("در حال بارگذاری…", className="page-loading")]
+
+
+def build_layout(score_range=None, page=None):
+    """Page layout with the slider set to ``score_range``.
+
+    With a ``page`` builder it returns every page in full and no data, which
+    Dash uses to validate the callbacks without loading anything.  The overview
+    figures are always left empty: ``update_overview_figures`` fills them on
+    page load, so building them here would only be thrown away.  The other
+    pages are placeholders until they are first opened (see ``lazy_page``).
+    """
+    lo, hi = score_range or (SCORE_SLIDER_MIN, SCORE_SLIDER_MAX)
+
+    return html.Div(
+        className="app-bg",
+        children=[
+            dcc.Store(id="selected-department"),
+            # صفحه‌ی باز و بازه‌ای که جدول مدیران واحد با آن ساخته شده است
+            dcc.Store(id="active-page", data="overview"),
+            dcc.Store(id="dept-managers-range"),
+            # بازه‌ی امتیاز به همراه شناسه‌ی صفحه و شماره‌ی ترتیبی (assets/overview.js)
+            dcc.Store(id="overview-request"),
+            # صفحه‌هایی که محتوایشان به مرورگر رسیده و صفحه‌ای که باید ساخته شود
+            dcc.Store(id="pages-rendered", data=[]),
+            dcc.Store(id="page-request"),
+            # واحدهایی که نمودارهای نمای کلی در مرورگر با آن‌ها ساخته شده‌اند
+            dcc.Store(id="overview-departments"),
+            dbc.Container(
+                fluid=True,
+                className="app-shell",
+                children=[
+                    dbc.Row(
+                        className="g-0 app-row",
+                        children=[
+                            # Sidebar
+                            dbc.Col(
+                                className="sidebar-wrapper",
+                                md=2,
+                                children=[
+                                    html.Div(
+                                        className="sidebar-card",
+                                        children=[
+                                            html.Div(
+                                                className="sidebar-logo mb-4",
+                                                children=html.Div("DP", className="logo-circle"),
+                                            ),
+                                            html.Div(
+                                                className="sidebar-nav",
+                                                children=[
+                                                    html.Button(
+                                                        "نمای کلی",
+                                                        id="nav-overview",
+                                                        n_clicks=0,
+                                                        className="sidebar-item active",
+                                                    ),
+                                                    html.Button(
+                                                        "پروژه‌ها",
+                                                        id="nav-projects",
+                                                        n_clicks=0,
+                                                        className="sidebar-item",
+                                                    ),
+                                                    html.Button(
+                                                        "تسک‌ها",
+                                                        id="nav-tasks",
+                                                        n_clicks=0,
+                                                        className="sidebar-item",
+                                                    ),
+                                                    html.Button(
+                                                        "اعضا",
+                                                        id="nav-members",
+                                                        n_clicks=0,
+                                                        className="sidebar-item",
+                                                    ),
+                                                    html.Button(
+                                                        "تنظیمات",
+                                                        id="nav-settings",
+                                                        n_clicks=0,
+                                                        className="sidebar-item",
+                                                    ),
+                                                ],
+                                            ),
+                                        ],
+                                    )
+                                ],
+                            ),
+                            # Main content
+                            dbc.Col(
+                                md=10,
+                                className="main-wrapper",
+                                children=[
+                                    # Stats cards row
+                                    html.Div(
+                                        className="stat-cards",
+                                        children=[
+                                            html.Div(
+                                                className="stat-card",
+                                                children=[
+                                                    html.P("تعداد کل پروژه‌ها", className="stat-label"),
+                                                    html.H3(id="stat-total-projects", className="stat-value"),
+                                                ],
+                                            ),
+                                            html.Div(
+                                                className="stat-card",
+                                                children=[
+                                                    html.P("میانگین امتیاز کل", className="stat-label"),
+                                                    html.H3(id="stat-avg-score", className="stat-value"),
+                                                ],
+                                            ),
+                                            html.Div(
+                                                className="stat-card",
+                                                children=[
+                                                    html.P("تعداد واحدها", className="stat-label"),
+                                                    html.H3(id="stat-dept-count", className="stat-value"),
+                                                ],
+                                            ),
+                                            html.Div(
+                                                className="stat-card",
+                                                children=[
+                                                    html.P("تعداد مدیران", className="stat-label"),
+                                                    html.H3(id="stat-manager-count", className="stat-value"),
+                                                ],
+                                            ),
+                                        ],
+                                    ),
+                                    # Overview page (default)
+                                    html.Div(
+                                        id="overview-content",
+                                        className="main-card",
+                                        children=[
+                                            # Top bar
+                                            html.Div(
+                                                className="topbar",
+                                                children=[
+                                                    html.Div(
+                                                        className="topbar-title",
                                                         children=[
-                                                            html.Div(
-                                                                className="card-header-line",
-                                                                children=[
-                                                                    html.Div(
-                                                                        [
-                                                                            html.H5(
-                                                                                "پروژه‌های فعال",
-                                                                                className="card-title",
-                                                                            ),
-                                                                            html.P(
-                                                                                "تعداد پروژه‌ها به تفکیک واحد سازمانی",
-                                                                                className="card-caption",
-                                                                            ),
-                                                                        ]
-                                                                    ),
-                                                                ],
+                                                            html.H2(
+                                                                "نمای کلی",
+                                                                className="topbar-heading",
                                                             ),
-                                                            dcc.Graph(
-                                                                id="projects-per-dept-bar",
-                                                                figure=initial_bar_fig,
-                                                                responsive=True,
-                                                                config={"displayModeBar": False, "responsive": True},
+                                                            html.P(
+                                                                "مروری بر پروژه‌های فعال سازمان و عملکرد واحدها",
+                                                                className="topbar-subtitle",
                                                             ),
                                                         ],
                                                     ),
-                                                ),
-                                                dbc.Col(
-                                                    md=5,
-                                                    children=html.Div(
-                                                        className="chart-card",
+                                                    html.Div(
+                                                        className="topbar-actions",
                                                         children=[
-                                                            html.Div(
-                                                                className="card-header-line",
-                                                                children=[
-                                                                    html.Div(
-                                                                        [
-                                                                            html.H5(
-                                                                                "میانگین امتیاز",
-                                                                                className="card-title",
-                                                                            ),
-                                                                            html.P(
-                                                                                "امتیاز کیفی پروژه‌ها در هر واحد",
-                                                                                className="card-caption",
-                                                                            ),
-                                                                        ]
-                                                                    ),
-                                                                ],
+                                                            dbc.Input(
+                                                                type="search",
+                                                                placeholder="جستجو در پروژه‌ها...",
+                                                                className="search-input",
                                                             ),
-                                                            dcc.Graph(
-                                                                id="avg-score-line",
-                                                                figure=initial_line_fig,
-                                                                responsive=True,
-                                                                config={"displayModeBar": False, "responsive": True},
+                                                            dbc.Button(
+                                                                "گزارش این هفته",
+                                                                color="primary",
+                                                                className="topbar-btn",
                                                             ),
                                                         ],
                                                     ),
-                                                ),
-                                            ],
-                                        ),
-                                        # Pie chart row (full width to avoid overlap)
-                                        dbc.Row(
-                                            className="gy-3 mb-3",
-                                            children=[
-                                                dbc.Col(
-                                                    md=12,
-                                                    children=html.Div(
-                                                        className="chart-card",
+                                                ],
+                                            ),
+                                            html.Div(
+                                                className="filter-row",
+                                                children=[
+                                                    html.Div(
+                                                        className="filter-label",
+                                                        children="فیلتر بر اساس امتیاز پروژه‌ها",
+                                                    ),
+                                                    dcc.RangeSlider(
+                                                        id="score-range",
+                                                        min=SCORE_SLIDER_MIN,
+                                                        max=SCORE_SLIDER_MAX,
+                                                        step=1,
+                                                        value=[lo, hi],
+                                                        allowCross=False,
+                                                        marks={
+                                                            60: "60",
+                                                            70: "70",
+                                                            80: "80",
+                                                            90: "90",
+                                                            100: "100",
+                                                        },
+                                                    ),
+                                                    html.Div(
+                                                        id="score-range-text",
+                                                        className="filter-caption",
+                                                    ),
+                                                ],
+                                            ),
+                                            # Charts row
+                                            dbc.Row(
+                                                className="charts-row gy-3 mb-4",
+                                                children=[
+                                                    dbc.Col(
+                                                        md=7,
+                                                        children=html.Div(
+                                                            className="chart-card",
+                                                            children=[
+                                                                html.Div(
+                                                                    className="card-header-line",
+                                                                    children=[
+                                                                        html.Div(
+                                                                            [
+                                                                                html.H5(
+                                                                                    "پروژه‌های فعال",
+                                                                                    className="card-title",
+                                                                                ),
+                                                                                html.P(
+                                                                                    "تعداد پروژه‌ها به تفکیک واحد سازمانی",
+                                                                                    className="card-caption",
+                                                                                ),
+                                                                            ]
+                                                                        ),
+                                                                    ],
+                                                                ),
+                                                                dcc.Graph(
+                                                                    id="projects-per-dept-bar",
+                                                                    responsive=True,
+                                                                    config={"displayModeBar": False, "responsive": True},
+                                                                ),
+                                                            ],
+                                                        ),
+                                                    ),
+                                                    dbc.Col(
+                                                        md=5,
+                                                        children=html.Div(
+                                                            className="chart-card",
+                                                            children=[
+                                                                html.Div(
+                                                                    className="card-header-line",
+                                                                    children=[
+                                                                        html.Div(
+                                                                            [
+                                                                                html.H5(
+                                                                                    "میانگین امتیاز",
+                                                                                    className="card-title",
+                                                                                ),
+                                                                                html.P(
+                                                                                    "امتیاز کیفی پروژه‌ها در هر واحد",
+                                                                                    className="card-caption",
+                                                                                ),
+                                                                            ]
+                                                                        ),
+                                                                    ],
+                                                                ),
+                                                                dcc.Graph(
+                                                                    id="avg-score-line",
+                                                                    responsive=True,
+                                                                    config={"displayModeBar": False, "responsive": True},
+                                                                ),
+                                                            ],
+                                                        ),
+                                                    ),
+                                                ],
+                                            ),
+                                            # Pie chart row (full width to avoid overlap)
+                                            dbc.Row(
+                                                className="gy-3 mb-3",
+                                                children=[
+                                                    dbc.Col(
+                                                        md=12,
+                                                        children=html.Div(
+                                                            className="chart-card",
+                                                            children=[
+                                                                html.Div(
+                                                                    className="card-header-line",
+                                                                    children=[
+                                                                        html.Div(
+                                                                            [
+                                                                                html.H5(
+                                                                                    "سهم واحدها از پروژه‌ها",
+                                                                                    className="card-title",
+                                                                                ),
+                                                                                html.P(
+                                                                                    "درصد پروژه‌های هر واحد از کل پروژه‌ها",
+                                                                                    className="card-caption",
+                                                                                ),
+                                                                            ]
+                                                                        ),
+                                                                    ],
+                                                                ),
+                                                                dcc.Graph(
+                                                                    id="dept-share-pie",
+                                                                    responsive=True,
+                                                                    config={"displayModeBar": False, "responsive": True},
+                                                                ),
+                                                            ],
+                                                        ),
+                                                    ),
+                                                ],
+                                            ),
+                                            # Managers table (level 2)
+                                            html.Div(
+                                                id="dept-managers-section",
+                                                className="section-card",
+                                                children=[
+                                                    html.Div(
+                                                        className="section-header",
                                                         children=[
-                                                            html.Div(
-                                                                className="card-header-line",
-                                                                children=[
-                                                                    html.Div(
-                                                                        [
-                                                                            html.H5(
-                                                                                "سهم واحدها از پروژه‌ها",
-                                                                                className="card-title",
-                                                                            ),
-                                                                            html.P(
-                                                                                "درصد پروژه‌های هر واحد از کل پروژه‌ها",
-                                                                                className="card-caption",
-                                                                            ),
-                                                                        ]
-                                                                    ),
-                                                                ],
+                                                            html.H5(
+                                                                "مدیران پروژه در واحد انتخاب‌شده",
+                                                                className="card-title mb-1",
                                                             ),
-                                                            dcc.Graph(
-                                                                id="dept-share-pie",
-                                                                figure=initial_pie_fig,
-                                                                responsive=True,
-                                                                config={"displayModeBar": False, "responsive": True},
+                                                            html.P(
+                                                                "برای مشاهده جزئیات، ابتدا روی نوار واحد سازمانی در نمودار بالا کلیک کنید.",
+                                                                id="dept-hint-text",
+                                                                className="card-caption",
                                                             ),
                                                         ],
                                                     ),
-                                                ),
-                                            ],
-                                        ),
-                                        # Managers table (level 2)
-                                        html.Div(
-                                            id="dept-managers-section",
-                                            className="section-card",
-                                            children=[
-                                                html.Div(
-                                                    className="section-header",
-                                                    children=[
-                                                        html.H5(
-                                                            "مدیران پروژه در واحد انتخاب‌شده",
-                                                            className="card-title mb-1",
-                                                        ),
-                                                        html.P(
-                                                            "برای مشاهده جزئیات، ابتدا روی نوار واحد سازمانی در نمودار بالا کلیک کنید.",
-                                                            id="dept-hint-text",
-                                                            className="card-caption",
-                                                        ),
-                                                    ],
-                                                ),
-                                                DataTable(
-                                                    id="dept-managers-table",
-                                                    columns=[
-                                                        {"name": "مدیر پروژه", "id": "manager"},
-                                                        {"name": "تعداد پروژه‌ها", "id": "project_count"},
-                                                        {"name": "میانگین امتیاز", "id": "avg_score"},
-                                                    ],
-                                                    data=[],
-                                                    row_selectable=False,
-                                                    cell_selectable=True,
-                                                    **base_table_style,
-                                                ),
-                                            ],
-                                            style={"display": "none"},
-                                        ),
-                                        # Manager projects table (level 3)
-                                        html.Div(
-                                            id="manager-projects-section",
-                                            className="section-card",
-                                            children=[
-                                                html.Div(
-                                                    className="section-header",
-                                                    children=[
-                                                        html.H5(
-                                                            "جزئیات پروژه‌های مدیر انتخاب‌شده",
-                                                            className="card-title mb-1",
-                                                        ),
-                                                        html.P(
-                                                            "برای مشاهده جزئیات یک مدیر، روی نام او در جدول بالا کلیک کنید.",
-                                                            id="manager-hint-text",
-                                                            className="card-caption",
-                                                        ),
-                                                    ],
-                                                ),
-                                                DataTable(
-                                                    id="manager-projects-table",
-                                                    columns=[
-                                                        {"name": "نام پروژه", "id": "project_name"},
-                                                        {"name": "تاریخ شروع", "id": "start_date"},
-                                                        {"name": "وضعیت", "id": "status"},
-                                                        {"name": "امتیاز", "id": "score"},
-                                                    ],
-                                                    data=[],
-                                                    row_selectable=False,
-                                                    cell_selectable=False,
-                                                    **base_table_style,
-                                                ),
-                                            ],
-                                            style={"display": "none"},
-                                        ),
-                                    ],
-                                ),
-                                # Projects page
-                                html.Div(
-                                    id="projects-content",
-                                    className="main-card",
-                                    style={"display": "none"},
-                                    children=[
-                                        html.Div(
-                                            className="topbar",
-                                            children=[
-                                                html.Div(
-                                                    className="topbar-title",
-                                                    children=[
-                                                        html.H2(
-                                                            "پروژه‌ها",
-                                                            className="topbar-heading",
-                                                        ),
-                                                        html.P(
-                                                            "لیست همه پروژه‌ها به همراه واحد، مدیر و وضعیت.",
-                                                            className="topbar-subtitle",
-                                                        ),
-                                                    ],
-                                                ),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            className="section-card",
-                                            children=[
-                                                html.Div(
-                                                    className="section-header section-header-inline",
-                                                    children=[
-                                                        html.Div(
-                                                            "لیست پروژه‌ها (با اعمال فیلتر امتیاز)",
-                                                            className="card-caption",
-                                                        ),
-                                                        dbc.Button(
-                                                            "دانلود اکسل",
-                                                            id="download-projects-btn",
-                                                            color="secondary",
-                                                            size="sm",
-                                                            className="export-btn",
-                                                        ),
-                                                        dcc.Download(id="projects-download"),
-                                                    ],
-                                                ),
-                                                DataTable(
-                                                    id="all-projects-table",
-                                                    columns=[
-                                                        {"name": "واحد سازمانی", "id": "department"},
-                                                        {"name": "مدیر پروژه", "id": "manager"},
-                                                        {"name": "نام پروژه", "id": "project_name"},
-                                                        {"name": "تاریخ شروع", "id": "start_date"},
-                                                        {"name": "وضعیت", "id": "status"},
-                                                        {"name": "امتیاز", "id": "score"},
-                                                    ],
-                                                    data=df.to_dict("records"),
-                                                    row_selectable=False,
-                                                    cell_selectable=False,
-                                                    sort_action="native",
-                                                    **base_table_style,
-                                                ),
-                                            ],
-                                        ),
-                                    ],
-                                ),
-                                # Tasks page (status-focused)
-                                html.Div(
-                                    id="tasks-content",
-                                    className="main-card",
-                                    style={"display": "none"},
-                                    children=[
-                                        html.Div(
-                                            className="topbar",
-                                            children=[
-                                                html.Div(
-                                                    className="topbar-title",
-                                                    children=[
-                                                        html.H2(
-                                                            "وضعیت پروژه‌ها",
-                                                            className="topbar-heading",
-                                                        ),
-                                                        html.P(
-                                                            "نمایی از تعداد پروژه‌ها بر اساس وضعیت اجرا.",
-                                                            className="topbar-subtitle",
-                                                        ),
-                                                    ],
-                                                ),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            className="section-card",
-                                            children=DataTable(
-                                                id="status-summary-table",
-                                                columns=[
-                                                    {"name": "وضعیت", "id": "status"},
-                                                    {"name": "تعداد پروژه‌ها", "id": "project_count"},
+                                                    DataTable(
+                                                        id="dept-managers-table",
+                                                        columns=[
+                                                            {"name": "مدیر پروژه", "id": "manager"},
+                                                            {"name": "تعداد پروژه‌ها", "id": "project_count"},
+                                                            {"name": "میانگین امتیاز", "id": "avg_score"},
+                                                        ],
+                                                        data=[],
+                                                        row_selectable=False,
+                                                        cell_selectable=True,
+                                                        **base_table_style,
+                                                    ),
                                                 ],
-                                                data=(
-                                                    df.groupby("status")
-                                                    .agg(project_count=("project_name", "count"))
-                                                    .reset_index()
-                                                ).to_dict("records"),
-                                                row_selectable=False,
-                                                cell_selectable=False,
-                                                **base_table_style,
+                                                style={"display": "none"},
                                             ),
-                                        ),
-                                    ],
-                                ),
-                                # Members page
-                                html.Div(
-                                    id="members-content",
-                                    className="main-card",
-                                    style={"display": "none"},
-                                    children=[
-                                        html.Div(
-                                            className="topbar",
-                                            children=[
-                                                html.Div(
-                                                    className="topbar-title",
-                                                    children=[
-                                                        html.H2(
-                                                            "مدیران پروژه",
-                                                            className="topbar-heading",
-                                                        ),
-                                                        html.P(
-                                                            "لیست مدیران پروژه به همراه واحد و عملکرد آن‌ها.",
-                                                            className="topbar-subtitle",
-                                                        ),
-                                                    ],
-                                                ),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            className="section-card",
-                                            children=DataTable(
-                                                id="managers-summary-table",
-                                                columns=[
-                                                    {"name": "مدیر پروژه", "id": "manager"},
-                                                    {"name": "واحد سازمانی", "id": "department"},
-                                                    {"name": "تعداد پروژه‌ها", "id": "project_count"},
-                                                    {"name": "میانگین امتیاز", "id": "avg_score"},
+                                            # Manager projects table (level 3)
+                                            html.Div(
+                                                id="manager-projects-section",
+                                                className="section-card",
+                                                children=[
+                                                    html.Div(
+                                                        className="section-header",
+                                                        children=[
+                                                            html.H5(
+                                                                "جزئیات پروژه‌های مدیر انتخاب‌شده",
+                                                                className="card-title mb-1",
+                                                            ),
+                                                            html.P(
+                                                                "برای مشاهده جزئیات یک مدیر، روی نام او در جدول بالا کلیک کنید.",
+                                                                id="manager-hint-text",
+                                                                className="card-caption",
+                                                            ),
+                                                        ],
+                                                    ),
+                                                    DataTable(
+                                                        id="manager-projects-table",
+                                                        columns=[
+                                                            {"name": "نام پروژه", "id": "project_name"},
+                                                            {"name": "تاریخ شروع", "id": "start_date"},
+                                                            {"name": "وضعیت", "id": "status"},
+                                                            {"name": "امتیاز", "id": "score", "type": "numeric"},
+                                                        ],
+                                                        data=[],
+                                                        filter_action="custom",
+                                                        filter_query="",
+                                                        row_selectable=False,
+                                                        cell_selectable=False,
+                                                        **base_table_style,
+                                                    ),
                                                 ],
-                                                data=(
-                                                    df.groupby(["manager", "department"])
-                                                    .agg(
-                                                        project_count=("project_name", "count"),
-                                                        avg_score=("score", "mean"),
-                                                    )
-                                                    .reset_index()
-                                                    .assign(avg_score=lambda d: d["avg_score"].round(1))
-                                                ).to_dict("records"),
-                                                row_selectable=False,
-                                                cell_selectable=False,
-                                                **base_table_style,
+                                                style={"display": "none"},
                                             ),
-                                        ),
-                                    ],
-                                ),
-                                # Settings page (simple visual settings description)
-                                html.Div(
-                                    id="settings-content",
-                                    className="main-card",
-                                    style={"display": "none"},
-                                    children=[
-                                        html.Div(
-                                            className="topbar",
-                                            children=[
-                                                html.Div(
-                                                    className="topbar-title",
-                                                    children=[
-                                                        html.H2(
-                                                            "تنظیمات داشبورد",
-                                                            className="topbar-heading",
-                                                        ),
-                                                        html.P(
-                                                            "برخی تنظیمات پیشنهادی ظاهری و نمایشی برای این داشبورد نمونه.",
-                                                            className="topbar-subtitle",
-                                                        ),
-                                                    ],
-                                                ),
-                                            ],
-                                        ),
-                                        html.Div(
-                                            className="section-card",
-                                            children=[
-                                                html.P(
-                                                    "این نسخه‌ی نمونه است؛ در یک نسخه‌ی واقعی، می‌توانید از این بخش برای تغییر بازه‌ی زمانی پیش‌فرض، فیلتر واحدها، و تنظیمات تم گراف‌ها استفاده کنید.",
-                                                    className="card-caption mb-2",
-                                                ),
-                                                html.Ul(
-                                                    [
-                                                        html.Li("بازه‌ی زمانی پیش‌فرض نمودارها: «هفته جاری»."),
-                                                        html.Li("حالت نمایش: راست‌به‌چپ برای زبان فارسی."),
-                                                        html.Li("تم رنگی ملایم برای نمودارها و کارت‌ها."),
-                                                    ],
-                                                    style={"fontSize": "13px", "color": "#4b5563"},
-                                                ),
-                                            ],
-                                        ),
-                                    ],
-                                ),
-                            ],
-                        ),
-                    ],
-                )
-            ],
-        ),
-    ],
-)
-
-
-# ---------- Callbacks ----------
-@app.callback(
-    Output("nav-overview", "className"),
-    Output("nav-projects", "className"),
-    Output("nav-tasks", "className"),
-    Output("nav-members", "className"),
-    Output("nav-settings", "className"),
-    Output("overview-content", "style"),
-    Output("projects-content", "style"),
-    Output("tasks-content", "style"),
-    Output("members-content", "style"),
-    Output("settings-content", "style"),
-    Input("nav-overview", "n_clicks"),
-    Input("nav-projects", "n_clicks"),
-    Input("nav-tasks", "n_clicks"),
-    Input("nav-members", "n_clicks"),
-    Input("nav-settings", "n_clicks"),
-)
-def switch_page(overview_clicks, projects_clicks, tasks_clicks, members_clicks, settings_clicks):
-    ctx = dash.callback_context
-    active_id = "nav-overview"
-    if ctx.triggered:
-        active_id = ctx.triggered[0]["prop_id"].split(".")[0] or "nav-overview"
-
-    base_class = "sidebar-item"
-
-    def cls(item_id):
-        return f"{base_class} active" if item_id == active_id else base_class
-
-    overview_style = {"display": "block"} if active_id == "nav-overview" else {"display": "none"}
-    projects_style = {"display": "block"} if active_id == "nav-projects" else {"display": "none"}
-    tasks_style = {"display": "block"} if active_id == "nav-tasks" else {"display": "none"}
-    members_style = {"display": "block"} if active_id == "nav-members" else {"display": "none"}
-    settings_style = {"display": "block"} if active_id == "nav-settings" else {"display": "none"}
-
-    return (
-        cls("nav-overview"),
-        cls("nav-projects"),
-        cls("nav-tasks"),
-        cls("nav-members"),
-        cls("nav-settings"),
-        overview_style,
-        projects_style,
-        tasks_style,
-        members_style,
-        settings_style,
+                                        ],
+                                    ),
+                                    # Projects page
+                                    html.Div(
+                                        id="projects-content",
+                                        className="main-card",
+                                        style={"display": "none"},
+                                        children=lazy_page("projects", page),
+                                    ),
+                                    # Tasks page (status-focused)
+                                    html.Div(
+                                        id="tasks-content",
+                                        className="main-card",
+                                        style={"display": "none"},
+                                        children=lazy_page("tasks", page),
+                                    ),
+                                    # Members page
+                                    html.Div(
+                                        id="members-content",
+                                        className="main-card",
+                                        style={"display": "none"},
+                                        children=lazy_page("members", page),
+                                    ),
+                                    # Settings page (simple visual settings description)
+                                    html.Div(
+                                        id="settings-content",
+                                        className="main-card",
+                                        style={"display": "none"},
+                                        children=lazy_page("settings", page),
+                                    ),
+                                ],
+                            ),
+                        ],
+                    )
+                ],
+            ),
+        ],
     )
 
 
-@app.callback(
-    Output("projects-per-dept-bar", "figure"),
-    Output("avg-score-line", "figure"),
-    Output("dept-share-pie", "figure"),
-    Output("stat-total-projects", "children"),
-    Output("stat-avg-score", "children"),
-    Output("stat-dept-count", "children"),
-    Output("stat-manager-count", "children"),
-    Output("score-range-text", "children"),
-    Input("score-range", "value"),
-)
-def update_overview_figures(score_range):
-    if not score_range:
-        flt = df.copy()
-        current_range = (score_min, score_max)
-    else:
-        lo, hi = score_range
-        flt = df[(df["score"] >= lo) & (df["score"] <= hi)]
-        current_range = (lo, hi)
-
-    if flt.empty:
-        # اگر فیلتر خیلی محدود بود، برای نمودارها دیتای خالی نشان می‌دهیم
-        bar = build_bar_figure(df.iloc[0:0])
-        line = build_line_figure(df.iloc[0:0])
-        pie = build_pie_figure(df.iloc[0:0])
-        total_projects = "۰"
-        avg_score_text = "—"
-        dept_count_text = "۰"
-        manager_count_text = "۰"
-    else:
-        bar = build_bar_figure(flt)
-        line = build_line_figure(flt)
-        pie = build_pie_figure(flt)
-        total_projects = f"{len(flt):,}".replace(",", "٬")
-        avg_score_text = f"{flt['score'].mean():.1f}"
-        dept_count_text = f"{flt['department'].nunique()}"
-        manager_count_text = f"{flt['manager'].nunique()}"
-
-    range_text = f"نمایش پروژه‌ها با امتیاز بین {current_range[0]} تا {current_range[1]}"
-
-    return (
-        bar,
-        line,
-        pie,
-        total_projects,
-        avg_score_text,
-        dept_count_text,
-        manager_count_text,
-        range_text,
-    )
+# ---------- Dashboard ----------
+class Dashboard:
+    """State and callbacks of one dashboard app.
 
+    ``create_app`` builds one per Dash instance, so every app has its own
+    data source, caches and export jobs; ``config`` overrides keys of
+    ``DEFAULT_CONFIG``.
+    """
 
-@app.callback(
-    Output("dept-managers-section", "style"),
-    Output("dept-managers-table", "data"),
-    Output("dept-hint-text", "children"),
-    Output("selected-department", "data"),
-    Input("projects-per-dept-bar", "clickData"),
-    Input("score-range", "value"),
-    State("dept-managers-section", "style"),
-)
-def update_managers_table(click_data, score_range, current_style):
-    style = dict(current_style or {})
-    if not click_data or "points" not in click_data or not click_data["points"]:
-        style["display"] = "none"
-        return (
-            style,
-            [],
-            "برای مشاهده مدیران، روی نوار واحد سازمانی در نمودار بالا کلیک کنید.",
-            None,
+    def __init__(self, config=None):
+        self.config = {**DEFAULT_CONFIG, **(config or {})}
+        # کش‌های همین برنامه؛ در /metrics گزارش می‌شوند
+        self.caches = {}
+
+        # داده‌ها تا اولین استفاده (درخواست یا گرم‌کردن کش) بارگذاری نمی‌شوند
+        self.data_source = ProjectDataSource(
+            self.config["data_path"],
+            fallback=projects_data,
+            check_interval=self.config["data_reload_interval"],
         )
 
-    selected_department = click_data["points"][0]["x"]
+        # خروجی کامل update_overview_figures برای هر (lo, hi, نسخه‌ی داده) نگه داشته می‌شود
+        self.overview_cache = self.lru_cache("overview", self.config["overview_cache_size"])
 
-    lo, hi = score_range or (score_min, score_max)
-    filtered = df[
-        (df["department"] == selected_department)
-        & (df["score"] >= lo)
-        & (df["score"] <= hi)
-    ]
-    if filtered.empty:
-        style["display"] = "none"
-        return (
-            style,
-            [],
-            "برای این واحد، داده‌ای ثبت نشده است.",
-            None,
+        # ماسک هر عبارت filter_query جدول‌ها روی کل داده یک بار ساخته و نگه داشته می‌شود
+        self.filter_mask_cache = self.lru_cache("filter_masks", self.config["filter_cache_size"])
+
+        # چیدمان صفحه برای هر نسخه‌ی داده فقط یک بار ساخته می‌شود
+        self.layout_cache = self.lru_cache("layout", 1)
+
+        # جدول‌های خلاصه‌ی وضعیت و مدیران برای هر (نوع، lo, hi, نسخه‌ی داده) نگه داشته می‌شوند
+        self.summary_cache = self.lru_cache("summaries", self.config["summary_cache_size"])
+
+        # جدول مدیران هر واحد برای هر (واحد، lo, hi, نسخه‌ی داده) نگه داشته می‌شود
+        self.manager_summary_cache = self.lru_cache(
+            "manager_summaries", self.config["manager_summary_cache_size"]
         )
 
-    managers_summary = (
-        filtered.groupby("manager")
-        .agg(
-            project_count=("project_name", "count"),
-            avg_score=("score", "mean"),
+        # فایل‌های خروجی با کلید (فرمت، lo، hi، ترتیب، امضای داده) روی دیسک نگه داشته می‌شوند؛
+        # امضای داده بین workerها یکسان است، پس هر worker فایل ساخته‌شده‌ی دیگری را هم می‌فرستد
+        self.export_cache = FileCache(
+            "exports",
+            self.config["export_cache_dir"],
+            int(self.config["export_cache_bytes"]),
+            registry=self.caches,
+        )
+        # خروجی به تفکیک واحد با تعداد پردازه‌ی همین برنامه ساخته می‌شود
+        self.writers = {
+            **WRITERS,
+            "departments": partial(write_department_workbook, processes=self.config["export_processes"]),
+        }
+        self.export_jobs = ExportJobs(
+            self.run_export_job,
+            directory=self.config["export_jobs_dir"],
+            max_workers=self.config["export_workers"],
+            ttl=self.config["export_job_ttl"],
+            publish=self.publish_export,
         )
-        .reset_index()
-    )
-    managers_summary["avg_score"] = managers_summary["avg_score"].round(1)
 
-    data = managers_summary.to_dict("records")
-    style["display"] = "block"
-    hint = f"واحد انتخاب‌شده: {selected_department} — برای مشاهده جزئیات، روی نام مدیر کلیک کنید."
+        # بازه‌های درخواست‌شده ثبت می‌شوند تا گرم‌کردن کش بعد از استقرار از پرتکرارترین‌ها شروع کند
+        self.range_traffic = RangeTraffic(self.config["traffic_file"])
+        atexit.register(self.range_traffic.save)
+        self.overview_warmer = CacheWarmer(self.warm_overview)
+
+        # شمار کارهایی که callbackها انجام ندادند (مثلاً جدول پنهان)؛ در /metrics گزارش می‌شود
+        self.callback_counters = EventCounters()
+
+        # آخرین شماره‌ی درخواست نمای کلی هر صفحه‌ی باز مرورگر
+        self.latest_overview = LatestRequests()
+        self.latest_overview.enabled = bool(self.config["latest_wins"])
+        self.overview_slots = ComputeSlots(self.config["overview_concurrency"])
+
+    def lru_cache(self, name, maxsize):
+        """An LRU cache of this app that is emptied whenever the data reloads."""
+        cache = LRUCache(name, maxsize=max(1, int(maxsize)), registry=self.caches)
+        self.data_source.on_reload(cache.clear)
+        return cache
+
+    def serve_layout(self):
+        """Page layout; built on the first request and reused until the data reloads."""
+        data = self.data_source.snapshot()
+        return self.layout_cache.get_or_compute(
+            data.version, lambda: build_layout(self.default_score_range(data.store))
+        )
 
-    return style, data, hint, selected_department
+    def preload(self):
+        """Build everything a first request needs before gunicorn forks the workers.
+
+        The store, the default overview response and the layout then live in the
+        master process and are shared copy-on-write.  The warm-up thread is
+        started in each worker by the ``post_fork`` hook in gunicorn.conf.py,
+        because threads do not survive a fork.
+        """
+        self.overview_response(*self.default_score_range())
+        self.serve_layout()
+
+    def default_score_range(self, store=None):
+        """Score range of the loaded data within the slider bounds, or the bounds when there is no data."""
+        if store is None:
+            store = self.data_source.store()
+        if len(store) == 0:
+            return SCORE_SLIDER_MIN, SCORE_SLIDER_MAX
+        lo = min(max(store.score_min, SCORE_SLIDER_MIN), SCORE_SLIDER_MAX)
+        hi = min(max(store.score_max, lo), SCORE_SLIDER_MAX)
+        return lo, hi
+
+    def metrics(self):
+        return {
+            "dataset_version": self.data_source.version,
+            "caches": cache_stats(self.caches),
+            "callbacks": self.callback_counters.snapshot(),
+            "latest_wins": self.latest_overview.stats(),
+            "warmup": self.overview_warmer.status(),
+        }
 
+    def ready(self):
+        status = self.overview_warmer.status()
+        return status, 200 if status["ready"] else 503
+
+    def download_projects(self, fmt):
+        """Projects with ``lo <= score <= hi`` (query string) as xlsx, parquet or csv."""
+        if fmt not in self.writers:
+            abort(404)
+        data = self.data_source.snapshot()
+        store = data.store
+        default_lo, default_hi = self.default_score_range(store)
+        lo = request.args.get("lo", default_lo, type=int)
+        hi = request.args.get("hi", default_hi, type=int)
+        filename = FILENAMES[fmt]
+        key = self.export_key(fmt, lo, hi, data.signature)
+
+        cached = self.export_cache.get(key, f".{fmt}")
+        if cached is not None:
+            return send_file(cached, mimetype=MIMETYPES[fmt], as_attachment=True, download_name=filename)
+
+        positions = export_order(store, store.score_range(lo, hi))
+        if fmt == "csv":
+            # CSV بخش‌به‌بخش ساخته و همان‌طور که ساخته می‌شود فرستاده و هم‌زمان در کش نوشته می‌شود
+            return Response(
+                stream_with_context(self.cache_stream(iter_csv(store, positions), key, f".{fmt}")),
+                mimetype=MIMETYPES[fmt],
+                headers={"Content-Disposition": f"attachment; filename={filename}"},
+            )
 
-@app.callback(
-    Output("manager-projects-section", "style"),
-    Output("manager-projects-table", "data"),
-    Output("manager-hint-text", "children"),
-    Input("dept-managers-table", "active_cell"),
-    State("dept-managers-table", "data"),
-    State("selected-department", "data"),
-    State("manager-projects-section", "style"),
-    State("score-range", "value"),
-)
-def update_manager_projects_table(active_cell, table_data, selected_department, current_style, score_range):
-    style = dict(current_style or {})
+        # فایل به‌صورت جریانی مستقیم در کش روی دیسک نوشته و از همان‌جا فرستاده می‌شود
+        part = self.export_cache.reserve(f".{fmt}")
+        try:
+            with open(part, "wb") as fh:
+                self.writers[fmt](store, positions, fh)
+        except Exception:
+            os.remove(part)
+            raise
+        path = self.export_cache.put(key, part, f".{fmt}")
+        return send_file(path, mimetype=MIMETYPES[fmt], as_attachment=True, download_name=filename)
+
+    def export_key(self, fmt, lo, hi, dataset):
+        return (fmt, int(lo), int(hi), EXPORT_SORT, dataset)
+
+    def cache_stream(self, chunks, key, suffix):
+        """Yield ``chunks`` and keep a copy; the copy is cached only if the stream completes."""
+        part = self.export_cache.reserve(suffix)
+        try:
+            with open(part, "wb") as fh:
+                for data in chunks:
+                    fh.write(data)
+                    yield data
+        except BaseException:
+            # قطع اتصال کاربر هم به اینجا می‌رسد (GeneratorExit)
+            os.remove(part)
+            raise
+        self.export_cache.put(key, part, suffix)
+
+    def run_export_job(self, job, path, progress):
+        data = self.data_source.snapshot()
+        store = data.store
+        # اگر داده از زمان ثبت کار عوض شده، فایل با امضای داده‌ای که واقعاً نوشته شده کش می‌شود
+        job["dataset"] = data.signature
+        positions = export_order(store, store.score_range(job["lo"], job["hi"]))
+        job["total"] = len(positions)
+        progress(0)
+        with open(path, "wb") as fh:
+            self.writers[job["format"]](store, positions, fh, progress=progress)
+
+    def publish_export(self, job, path):
+        key = self.export_key(job["format"], job["lo"], job["hi"], job["dataset"])
+        return self.export_cache.put(key, path, f".{job['format']}")
+
+    def export_job_status(self, job_id):
+        job = self.export_jobs.status(job_id)
+        if job is None:
+            abort(404)
+        # مسیر فایل، امضای داده و متن خطا فقط در سرور می‌مانند؛ خطا همان‌جا در لاگ ثبت شده است
+        return {key: job.get(key) for key in PUBLIC_JOB_FIELDS}
+
+    def export_job_file(self, job_id):
+        job = self.export_jobs.status(job_id)
+        # فایل کش‌شده ممکن است تا این لحظه برای جا باز کردن حذف شده باشد
+        if job is None or job["state"] != "done" or not os.path.exists(self.export_jobs.file_path(job)):
+            abort(404)
+        return send_file(
+            self.export_jobs.file_path(job),
+            mimetype=MIMETYPES[job["format"]],
+            as_attachment=True,
+            download_name=FILENAMES[job["format"]],
+        )
 
-    if not active_cell or table_data is None or selected_department is None:
-        style["display"] = "none"
+    def page(self, name):
+        """Content of page ``name`` with this app's options."""
+        if name == "projects":
+            return projects_page(self.config["page_size"])
+        return PAGES[name]()
+
+    def render_page(self, name, rendered):
+        if name not in PAGES:
+            raise PreventUpdate
+        rendered = list(rendered or [])
+        if name not in rendered:
+            rendered.append(name)
+        return [self.page(name) if page == name else dash.no_update for page in PAGES] + [rendered]
+
+    def update_overview_figures(self, overview_request, current_departments):
+        overview_request = overview_request or {}
+        lo, hi = overview_request.get("range") or self.default_score_range()
+        # اگر همین صفحه بازه‌ی تازه‌تری فرستاده باشد، این درخواست بین مراحل رها می‌شود
+        check = self.latest_overview.begin(overview_request.get("session"), overview_request.get("seq"))
+        try:
+            check()
+            self.range_traffic.record(lo, hi)
+            response = self.overview_response(lo, hi, check)
+        except Abandoned:
+            self.callback_counters.incr("overview.abandoned")
+            raise PreventUpdate
+
+        departments = response[-1]
+        if current_departments is None or list(current_departments) != departments:
+            return response
+
+        # مجموعه‌ی واحدها تغییر نکرده؛ فقط آرایه‌های داده ارسال می‌شود و چیدمان در مرورگر می‌ماند
+        bar, line, pie = response[:3]
         return (
-            style,
-            [],
-            "برای مشاهده جزئیات یک مدیر، روی نام او در جدول بالا کلیک کنید.",
+            figure_patch(bar, ("y", "customdata")),
+            figure_patch(line, ("y",)),
+            figure_patch(pie, ("values",)),
+            *response[3:-1],
+            dash.no_update,
         )
 
-    row_index = active_cell.get("row")
-    if row_index is None or row_index >= len(table_data):
-        style["display"] = "none"
-        return (
-            style,
-            [],
-            "انتخاب نامعتبر است؛ لطفاً مجدداً یکی از مدیران را انتخاب کنید.",
+    def overview_response(self, lo, hi, check=None):
+        store, version, _ = self.data_source.snapshot()
+        return self.overview_cache.get_or_compute(
+            (lo, hi, version), lambda: self.compute_overview(store, lo, hi, check)
         )
 
-    selected_manager = table_data[row_index].get("manager")
-    if not selected_manager:
-        style["display"] = "none"
+    def warm_overview(self, lo, hi):
+        store, version, _ = self.data_source.snapshot()
+        key = (lo, hi, version)
+        if key not in self.overview_cache:
+            self.overview_cache.set(key, self.compute_overview(store, lo, hi))
+
+    def start_overview_warmup(self):
+        """Start warming the overview cache as set by the ``warmup`` option (off/all/popular)."""
+        mode = (self.config["warmup"] or "off").lower()
+        if mode == "all":
+            ranges = all_ranges(SCORE_SLIDER_MIN, SCORE_SLIDER_MAX)
+            # همه‌ی بازه‌ها باید در کش جا شوند، وگرنه گرم‌کردن خودش آن‌ها را بیرون می‌اندازد
+            self.overview_cache.maxsize = max(self.overview_cache.maxsize, len(ranges))
+        elif mode == "popular":
+            ranges = self.range_traffic.most_popular(self.config["warmup_top"])
+        else:
+            return
+        default_range = self.default_score_range()
+        self.overview_warmer.start([default_range] + [r for r in ranges if r != default_range])
+
+    def compute_overview(self, store, lo, hi, check=None):
+        """Everything ``update_overview_figures`` returns for the range ``lo..hi`` of ``store``.
+
+        ``check`` is called while waiting for a compute slot and between the
+        steps, and raises ``Abandoned`` once the request that asked for this
+        result has been superseded.
+        """
+        check = check or (lambda: None)
+
+        with self.overview_slots.hold(check):
+            # یک خلاصه‌ی مشترک (از جدول تجمعی پیش‌محاسبه‌شده) هم نمودارها و هم کارت‌ها را تغذیه می‌کند
+            summary = store.department_summary(lo, hi)
+            check()
+            bar = build_bar_figure(summary)
+            check()
+            line = build_line_figure(summary)
+            check()
+            pie = build_pie_figure(summary)
+
+        if summary.empty:
+            # اگر فیلتر خیلی محدود بود، برای نمودارها دیتای خالی نشان می‌دهیم
+            total_projects = "۰"
+            avg_score_text = "—"
+            dept_count_text = "۰"
+            manager_count_text = "۰"
+        else:
+            total = int(summary["active_projects"].sum())
+            total_projects = f"{total:,}".replace(",", "٬")
+            avg_score_text = f"{summary['score_sum'].sum() / total:.1f}"
+            dept_count_text = f"{len(summary)}"
+            manager_count_text = f"{summary.attrs['manager_count']}"
+
+        range_text = f"نمایش پروژه‌ها با امتیاز بین {lo} تا {hi}"
+
         return (
-            style,
-            [],
-            "برای مشاهده جزئیات یک مدیر، روی نام او در جدول بالا کلیک کنید.",
+            bar,
+            line,
+            pie,
+            total_projects,
+            avg_score_text,
+            dept_count_text,
+            manager_count_text,
+            range_text,
+            list(summary["department"]),
         )
 
-    lo, hi = score_range or (score_min, score_max)
-    subset = df[
-        (df["department"] == selected_department)
-        & (df["manager"] == selected_manager)
-        & (df["score"] >= lo)
-        & (df["score"] <= hi)
-    ][["project_name", "start_date", "status", "score"]].copy()
+    def update_managers_table(
+        self, click_data, score_range, active_page, current_style, shown_department, shown_range
+    ):
+        style = dict(current_style or {})
+        selected = bool(click_data and click_data.get("points"))
+        lo, hi = score_range or self.default_score_range()
+
+        # تغییر بازه یا صفحه فقط وقتی جدول را دوباره می‌سازد که واحدی انتخاب شده،
+        # نمای کلی باز است و جدول با همین واحد و بازه ساخته نشده است
+        if ctx.triggered_id != "projects-per-dept-bar":
+            if not selected:
+                skipped = "no_department"
+            elif active_page != "overview":
+                skipped = "hidden"
+            elif shown_department == click_data["points"][0]["x"] and shown_range == [lo, hi]:
+                skipped = "unchanged"
+            else:
+                skipped = None
+            if skipped:
+                self.callback_counters.incr(f"managers_table.skipped.{skipped}")
+                raise PreventUpdate
+
+        if not selected:
+            style["display"] = "none"
+            return (
+                style,
+                [],
+                "برای مشاهده مدیران، روی نوار واحد سازمانی در نمودار بالا کلیک کنید.",
+                None,
+                None,
+            )
+
+        selected_department = click_data["points"][0]["x"]
+
+        data = self.department_managers_records(selected_department, lo, hi)
+        if not data:
+            style["display"] = "none"
+            return (
+                style,
+                [],
+                "برای این واحد، داده‌ای ثبت نشده است.",
+                None,
+                None,
+            )
 
-    if subset.empty:
-        style["display"] = "none"
-        return (
-            style,
-            [],
-            "برای این مدیر در واحد انتخاب‌شده، پروژه فعالی ثبت نشده است.",
+        style["display"] = "block"
+        hint = f"واحد انتخاب‌شده: {selected_department} — برای مشاهده جزئیات، روی نام مدیر کلیک کنید."
+
+        return style, data, hint, selected_department, [lo, hi]
+
+    def department_managers_records(self, department, lo, hi):
+        """Rows of ``dept-managers-table`` for one department and score range."""
+        store, version, _ = self.data_source.snapshot()
+        key = (department, lo, hi, version)
+        # فقط جفت‌های (واحد، مدیر) همین واحد از مکعب امتیاز خوانده می‌شوند
+        return self.manager_summary_cache.get_or_compute(
+            key,
+            lambda: store.department_managers(
+                store.code_of("department", department), lo, hi
+            ).to_dict("records"),
         )
 
-    style["display"] = "block"
-    hint = f"مدیر انتخاب‌شده: {selected_manager} — تعداد پروژه‌ها: {len(subset)}"
+    def update_manager_projects_table(
+        self, active_cell, filter_query, table_data, selected_department, current_style, score_range
+    ):
+        style = dict(current_style or {})
+
+        if not active_cell or table_data is None or selected_department is None:
+            if style.get("display") == "none":
+                # بخش از قبل پنهان است و مدیری انتخاب نشده؛ چیزی برای ساختن نیست
+                self.callback_counters.incr("manager_projects_table.skipped.no_manager")
+                raise PreventUpdate
+            style["display"] = "none"
+            return (
+                style,
+                [],
+                "برای مشاهده جزئیات یک مدیر، روی نام او در جدول بالا کلیک کنید.",
+            )
 
-    return style, subset.to_dict("records"), hint
+        row_index = active_cell.get("row")
+        if row_index is None or row_index >= len(table_data):
+            style["display"] = "none"
+            return (
+                style,
+                [],
+                "انتخاب نامعتبر است؛ لطفاً مجدداً یکی از مدیران را انتخاب کنید.",
+            )
 
+        selected_manager = table_data[row_index].get("manager")
+        if not selected_manager:
+            style["display"] = "none"
+            return (
+                style,
+                [],
+                "برای مشاهده جزئیات یک مدیر، روی نام او در جدول بالا کلیک کنید.",
+            )
+
+        data = self.data_source.snapshot()
+        store = data.store
+        lo, hi = score_range or self.default_score_range(store)
+        # ردیف‌های این مدیر در بازه‌ی امتیاز با جست‌وجوی دودویی در نمایه‌ی واحد ← مدیر خوانده می‌شوند
+        matches = store.manager_rows(
+            store.code_of("department", selected_department),
+            store.code_of("manager", selected_manager),
+            lo,
+            hi,
+        )
+
+        if len(matches) == 0:
+            style["display"] = "none"
+            return (
+                style,
+                [],
+                "برای این مدیر در واحد انتخاب‌شده، پروژه فعالی ثبت نشده است.",
+            )
+
+        # ردیف‌ها به ترتیب اصلی داده نمایش داده می‌شوند
+        filtered = apply_mask(np.sort(matches), self.cached_filter_mask(data, filter_query))
+        subset = store.take(filtered)[["project_name", "start_date", "status", "score"]]
+
+        style["display"] = "block"
+        hint = f"مدیر انتخاب‌شده: {selected_manager} — تعداد پروژه‌ها: {len(matches)}"
+        if filter_query:
+            hint += f" (مطابق فیلتر: {len(subset)})"
+
+        return style, to_table_records(subset), hint
+
+    def cached_filter_mask(self, data, filter_query):
+        if not filter_query:
+            return None
+        key = (filter_query.strip(), data.version)
+        return self.filter_mask_cache.get_or_compute(key, lambda: filter_mask(data.store, filter_query))
+
+    def update_all_projects_table(self, page_current, page_size, sort_by, filter_query, score_range):
+        data = self.data_source.snapshot()
+        store = data.store
+        lo, hi = score_range or self.default_score_range(store)
+
+        # ترتیب اصلی ردیف‌ها حفظ می‌شود مگر این‌که کاربر مرتب‌سازی را انتخاب کند
+        positions = np.sort(store.score_range(lo, hi))
+        positions = apply_mask(positions, self.cached_filter_mask(data, filter_query))
+        positions = sort_positions(store, positions, sort_by)
+
+        # با تغییر فیلتر، مرتب‌سازی یا بازه‌ی امتیاز جدول از صفحه‌ی اول نمایش داده می‌شود
+        if ctx.triggered_prop_ids.keys() & {
+            "all-projects-table.sort_by",
+            "all-projects-table.filter_query",
+            "score-range.value",
+        }:
+            page_current = 0
+        rows, page, page_count = page_slice(
+            len(positions), page_current, page_size or self.config["page_size"]
+        )
+        return to_table_records(store.take(positions[rows])), page_count, page
+
+    def update_status_summary_table(self, score_range):
+        lo, hi = score_range or self.default_score_range()
+        return self.summary_records("status", lo, hi)
+
+    def update_managers_summary_table(self, score_range):
+        lo, hi = score_range or self.default_score_range()
+        return self.summary_records("managers", lo, hi)
+
+    def summary_records(self, kind, lo, hi):
+        """Rows of the status or managers summary table, from the store's score cubes."""
+        store, version, _ = self.data_source.snapshot()
+        summarize = store.status_summary if kind == "status" else store.manager_summary
+        key = (kind, lo, hi, version)
+        return self.summary_cache.get_or_compute(key, lambda: summarize(lo, hi).to_dict("records"))
+
+    def submit_export_job(self, *args):
+        score_range = args[-1]
+        fmt = next(fmt for fmt, _, button_id in EXPORT_BUTTONS if button_id == ctx.triggered_id)
+        store, _, signature = self.data_source.snapshot()
+        lo, hi = score_range or self.default_score_range(store)
+        params = {"lo": lo, "hi": hi, "dataset": signature}
+
+        cached = self.export_cache.get(self.export_key(fmt, lo, hi, signature), f".{fmt}")
+        if cached is not None:
+            # همین فایل قبلاً ساخته شده؛ کار بی‌درنگ «آماده» ثبت می‌شود
+            return self.export_jobs.completed(fmt, cached, total=store.count_in_range(lo, hi), **params)["id"]
+
+        # فایل در یک نخ پس‌زمینه ساخته می‌شود و این درخواست بی‌درنگ برمی‌گردد
+        return self.export_jobs.submit(fmt, **params)["id"]
+
+    def poll_export_job(self, job_id, n_intervals):
+        if not job_id:
+            return {"display": "none"}, 0, False, "", None, {"display": "none"}, True
+        job = self.export_jobs.status(job_id)
+        if job is None:
+            return {"display": "flex"}, 0, False, "کار ساخت فایل پیدا نشد.", None, {"display": "none"}, True
+
+        total = job["total"]
+        percent = 100 if job["state"] == "done" else (100 * job["done"] // total if total else 0)
+        if job["state"] == "done":
+            text = f"فایل {FILENAMES[job['format']]} با {total:,} ردیف آماده است.".replace(",", "٬")
+            href = f"/export/jobs/{job_id}/file"
+            return {"display": "flex"}, 100, False, text, href, {"display": "inline-block"}, True
+        if job["state"] == "failed":
+            text = "ساخت فایل ناموفق بود."
+            return {"display": "flex"}, percent, False, text, None, {"display": "none"}, True
+        if job["state"] == "queued":
+            text = "در صف ساخت فایل…"
+        else:
+            text = f"در حال ساخت فایل: {job['done']:,} از {total or 0:,} ردیف".replace(",", "٬")
+        return {"display": "flex"}, percent, True, text, None, {"display": "none"}, False
+
+    def register(self, app):
+        """Register the routes and callbacks of this dashboard on ``app``."""
+        app.server.add_url_rule("/metrics", view_func=self.metrics)
+        app.server.add_url_rule("/ready", view_func=self.ready)
+        app.server.add_url_rule("/export/projects.<fmt>", view_func=self.download_projects)
+        app.server.add_url_rule("/export/jobs/<job_id>", view_func=self.export_job_status)
+        app.server.add_url_rule("/export/jobs/<job_id>/file", view_func=self.export_job_file)
+
+        # تعویض صفحه در assets/navigation.js و سمت مرورگر انجام می‌شود
+        app.clientside_callback(
+            ClientsideFunction(namespace="navigation", function_name="switch_page"),
+            Output("nav-overview", "className"),
+            Output("nav-projects", "className"),
+            Output("nav-tasks", "className"),
+            Output("nav-members", "className"),
+            Output("nav-settings", "className"),
+            Output("overview-content", "style"),
+            Output("projects-content", "style"),
+            Output("tasks-content", "style"),
+            Output("members-content", "style"),
+            Output("settings-content", "style"),
+            Output("active-page", "data"),
+            Input("nav-overview", "n_clicks"),
+            Input("nav-projects", "n_clicks"),
+            Input("nav-tasks", "n_clicks"),
+            Input("nav-members", "n_clicks"),
+            Input("nav-settings", "n_clicks"),
+        )
+
+        # محتوای هر صفحه فقط در اولین باز شدن از سرور خواسته می‌شود و بعد در مرورگر می‌ماند
+        app.clientside_callback(
+            ClientsideFunction(namespace="navigation", function_name="request_page"),
+            Output("page-request", "data"),
+            *[Input(f"nav-{name}", "n_clicks") for name in PAGES],
+            State("pages-rendered", "data"),
+            prevent_initial_call=True,
+        )
+
+        # صفحه فقط وقتی «ساخته‌شده» ثبت می‌شود که محتوایش از سرور رسیده باشد
+        app.callback(
+            *[Output(f"{name}-content", "children") for name in PAGES],
+            Output("pages-rendered", "data"),
+            Input("page-request", "data"),
+            State("pages-rendered", "data"),
+            prevent_initial_call=True,
+        )(self.render_page)
+
+        app.clientside_callback(
+            ClientsideFunction(namespace="overview", function_name="tag_range"),
+            Output("overview-request", "data"),
+            Input("score-range", "value"),
+        )
+
+        app.callback(
+            Output("projects-per-dept-bar", "figure"),
+            Output("avg-score-line", "figure"),
+            Output("dept-share-pie", "figure"),
+            Output("stat-total-projects", "children"),
+            Output("stat-avg-score", "children"),
+            Output("stat-dept-count", "children"),
+            Output("stat-manager-count", "children"),
+            Output("score-range-text", "children"),
+            Output("overview-departments", "data"),
+            Input("overview-request", "data"),
+            State("overview-departments", "data"),
+        )(self.update_overview_figures)
+
+        app.callback(
+            Output("dept-managers-section", "style"),
+            Output("dept-managers-table", "data"),
+            Output("dept-hint-text", "children"),
+            Output("selected-department", "data"),
+            Output("dept-managers-range", "data"),
+            Input("projects-per-dept-bar", "clickData"),
+            Input("score-range", "value"),
+            Input("active-page", "data"),
+            State("dept-managers-section", "style"),
+            State("selected-department", "data"),
+            State("dept-managers-range", "data"),
+        )(self.update_managers_table)
+
+        app.callback(
+            Output("manager-projects-section", "style"),
+            Output("manager-projects-table", "data"),
+            Output("manager-hint-text", "children"),
+            Input("dept-managers-table", "active_cell"),
+            Input("manager-projects-table", "filter_query"),
+            State("dept-managers-table", "data"),
+            State("selected-department", "data"),
+            State("manager-projects-section", "style"),
+            State("score-range", "value"),
+        )(self.update_manager_projects_table)
+
+        app.callback(
+            Output("all-projects-table", "data"),
+            Output("all-projects-table", "page_count"),
+            Output("all-projects-table", "page_current"),
+            Input("all-projects-table", "page_current"),
+            Input("all-projects-table", "page_size"),
+            Input("all-projects-table", "sort_by"),
+            Input("all-projects-table", "filter_query"),
+            Input("score-range", "value"),
+        )(self.update_all_projects_table)
+
+        app.callback(
+            Output("status-summary-table", "data"),
+            Input("score-range", "value"),
+        )(self.update_status_summary_table)
+
+        app.callback(
+            Output("managers-summary-table", "data"),
+            Input("score-range", "value"),
+        )(self.update_managers_summary_table)
+
+        app.callback(
+            Output("export-job", "data"),
+            *[Input(button_id, "n_clicks") for _, _, button_id in EXPORT_BUTTONS],
+            State("score-range", "value"),
+            prevent_initial_call=True,
+        )(self.submit_export_job)
+
+        app.callback(
+            Output("export-job-status", "style"),
+            Output("export-job-progress", "value"),
+            Output("export-job-progress", "animated"),
+            Output("export-job-text", "children"),
+            Output("export-job-link", "href"),
+            Output("export-job-link", "style"),
+            Output("export-job-poll", "disabled"),
+            Input("export-job", "data"),
+            Input("export-job-poll", "n_intervals"),
+        )(self.poll_export_job)
+
+
+# ---------- App factory ----------
+def create_app(config=None) -> Dash:
+    """Build a dashboard app; ``config`` overrides keys of ``DEFAULT_CONFIG``.
+
+    Every call returns an independent app with its own state and callbacks.
+    Data, figures and tables are built lazily on the first page request, or up
+    front with the ``preload`` option.  The app's ``Dashboard`` is kept in
+    ``app.server.extensions["dashboard"]``.
+    """
+    dashboard = Dashboard(config)
+
+    app = Dash(
+        __name__,
+        external_stylesheets=[dbc.themes.BOOTSTRAP],
+        meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
+    )
+    app.title = "داشبورد پروژه‌های سازمانی"
+    # callbackها با اسکلت بدون داده‌ی صفحه اعتبارسنجی می‌شوند تا ساخت برنامه چیزی بارگذاری نکند
+    app.validation_layout = build_layout(page=dashboard.page)
+    app.layout = dashboard.serve_layout
+    dashboard.register(app)
+    app.server.extensions["dashboard"] = dashboard
+
+    if dashboard.config["preload"]:
+        dashboard.preload()
+    else:
+        dashboard.start_overview_warmup()
+    return app
 
-@app.callback(
-    Output("projects-download", "data"),
-    Input("download-projects-btn", "n_clicks"),
-    State("score-range", "value"),
-    prevent_initial_call=True,
-)
-def download_projects(n_clicks, score_range):
-    lo, hi = score_range or (score_min, score_max)
-    flt = df[(df["score"] >= lo) & (df["score"] <= hi)].copy()
-    flt = flt.sort_values(["department", "manager", "score"], ascending=[True, True, False])
-    return dcc.send_data_frame(flt.to_excel, "projects.xlsx", index=False)
 
-server = app.server
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", "8050"))
-    app.run(host="0.0.0.0", port=port, debug=True)
-
+    create_app().run(host="0.0.0.0", port=port, debug=True)
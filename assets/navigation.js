@@ -0,0 +1,36 @@
+// جابه‌جایی بین صفحه‌های منوی کناری کاملاً در مرورگر انجام می‌شود و درخواستی به سرور نمی‌رود
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    navigation: {
+        switch_page: function () {
+            const ctx = window.dash_clientside.callback_context;
+            let activeId = "nav-overview";
+            if (ctx.triggered && ctx.triggered.length) {
+                activeId = ctx.triggered[0].prop_id.split(".")[0] || "nav-overview";
+            }
+
+            const items = ["nav-overview", "nav-projects", "nav-tasks", "nav-members", "nav-settings"];
+            const classNames = items.map(function (id) {
+                return id === activeId ? "sidebar-item active" : "sidebar-item";
+            });
+            const styles = items.map(function (id) {
+                return {display: id === activeId ? "block" : "none"};
+            });
+            return classNames.concat(styles, [activeId.replace("nav-", "")]);
+        },
+
+        // محتوای صفحه تا وقتی از سرور نرسیده خواسته می‌شود؛ بعد از آن همان محتوای قبلی نمایش داده می‌شود.
+        // pages-rendered را پاسخ سرور (render_page) پر می‌کند، پس درخواست ناموفق دوباره فرستاده می‌شود
+        request_page: function () {
+            const ctx = window.dash_clientside.callback_context;
+            const rendered = arguments[arguments.length - 1] || [];
+            if (!ctx.triggered || !ctx.triggered.length) {
+                return window.dash_clientside.no_update;
+            }
+            const page = ctx.triggered[0].prop_id.split(".")[0].replace("nav-", "");
+            if (rendered.indexOf(page) !== -1) {
+                return window.dash_clientside.no_update;
+            }
+            return page;
+        },
+    },
+});
@@ -0,0 +1,17 @@
+// هر تغییر بازه‌ی امتیاز با شناسه‌ی همین صفحه و یک شماره‌ی ترتیبی به سرور می‌رود
+// تا سرور محاسبه‌ی درخواست‌های قدیمی‌تر همین صفحه را رها کند
+(function () {
+    const session = window.crypto && window.crypto.randomUUID
+        ? window.crypto.randomUUID()
+        : Date.now().toString(16) + Math.random().toString(16).slice(2);
+    let sequence = 0;
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        overview: {
+            tag_range: function (value) {
+                sequence += 1;
+                return {range: value, session: session, seq: sequence};
+            },
+        },
+    });
+})();
@@ -0,0 +1,46 @@
+"""Overview aggregation: the original per-figure groupbys versus the shared summary.
+
+The original ``update_overview_figures`` filtered the frame, ran one
+``groupby("department")`` in each of the three figure builders and then
+``mean`` plus two ``nunique`` calls for the stat cards.  The shared stage is
+``ProjectStore.department_summary``, which reads everything from the cubes.
+
+Usage: python benchmarks/aggregation_benchmark.py [ROWS ...]   (default: 100k 1M 5M)
+"""
+import sys
+import timeit
+
+from synthetic import make_projects
+
+from data_source import coerce_chunk
+from store import ProjectStore
+
+DEFAULT_SIZES = [100_000, 1_000_000, 5_000_000]
+LO, HI = 70, 90
+
+
+def per_figure_aggregation(frame):
+    flt = frame[(frame["score"] >= LO) & (frame["score"] <= HI)]
+    flt.groupby("department", observed=True).agg(active_projects=("project_name", "count"))
+    flt.groupby("department", observed=True).agg(avg_score=("score", "mean"))
+    flt.groupby("department", observed=True).agg(active_projects=("project_name", "count"))
+    return len(flt), flt["score"].mean(), flt["department"].nunique(), flt["manager"].nunique()
+
+
+def shared_summary(store):
+    return store.department_summary(LO, HI)
+
+
+def best_of(func, *args, repeat=5) -> float:
+    return min(timeit.repeat(lambda: func(*args), number=1, repeat=repeat))
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'rows':>12} {'per-figure':>12} {'shared':>12} {'speed-up':>10}")
+    for size in sizes:
+        frame = coerce_chunk(make_projects(size))
+        store = ProjectStore.from_frame(frame)
+        before = best_of(per_figure_aggregation, frame)
+        after = best_of(shared_summary, store)
+        print(f"{size:>12,} {before * 1000:>10.2f}ms {after * 1000:>10.3f}ms {before / after:>9.0f}x")
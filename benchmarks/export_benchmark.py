@@ -0,0 +1,130 @@
+"""Project export: time and peak memory per format and row count.
+
+``to_excel`` is the original download (decode and sort a frame, then
+``DataFrame.to_excel`` into memory); ``xlsx``, ``departments`` and ``parquet`` are written by
+``export`` into a spooled temporary file and ``csv`` is the chunked stream
+``export.iter_csv`` (its chunks are counted and dropped).  Each measurement runs
+in a fresh process and reports how far RSS rose above its level before the
+export (sampled from /proc, so Linux only).
+
+Usage: python benchmarks/export_benchmark.py [ROWS ...] [--formats xlsx,csv,...]   (default: 100k 300k, all)
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from synthetic import make_projects
+
+from data_source import coerce_chunk
+from store import ProjectStore
+
+DEFAULT_SIZES = [100_000, 300_000]
+LO, HI = 60, 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss() -> int:
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * PAGE_SIZE
+
+
+class PeakRSS:
+    """Samples RSS on a thread while the block runs."""
+
+    def __enter__(self):
+        self.start = self.peak = rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, rss())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss())
+
+
+def export_to_excel(store):
+    frame = store.take(store.score_range(LO, HI))
+    frame = frame.sort_values(["department", "manager", "score"], ascending=[True, True, False])
+    buffer = io.BytesIO()
+    frame.to_excel(buffer, index=False)
+    return buffer.tell()
+
+
+def export_file(fmt):
+    def export(store):
+        from export import WRITERS, export_order
+
+        write = WRITERS[fmt]
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+            write(store, export_order(store, store.score_range(LO, HI)), spool)
+            return spool.tell()
+
+    return export
+
+
+def export_csv(store):
+    from export import export_order, iter_csv
+
+    positions = export_order(store, store.score_range(LO, HI))
+    return sum(len(chunk) for chunk in iter_csv(store, positions))
+
+
+EXPORTS = {
+    "to_excel": export_to_excel,
+    "xlsx": export_file("xlsx"),
+    "csv": export_csv,
+    "parquet": export_file("parquet"),
+    "departments": export_file("departments"),
+}
+
+
+def measure(fmt: str, rows: int) -> dict:
+    store = ProjectStore.from_frame(coerce_chunk(make_projects(rows)))
+    export = EXPORTS[fmt]
+    started = time.perf_counter()
+    with PeakRSS() as memory:
+        size = export(store)
+    return {
+        "seconds": time.perf_counter() - started,
+        "peak_mb": (memory.peak - memory.start) / 2**20,
+        "file_mb": size / 2**20,
+    }
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        print(json.dumps(measure(sys.argv[2], int(sys.argv[3]))))
+        sys.exit()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="*", type=float)
+    parser.add_argument("--formats", default=",".join(EXPORTS))
+    args = parser.parse_args()
+
+    sizes = [int(rows) for rows in args.rows] or DEFAULT_SIZES
+    print(f"{'rows':>10} {'format':>10} {'time':>9} {'peak RSS':>10} {'file':>9}")
+    for rows in sizes:
+        for fmt in args.formats.split(","):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", fmt, str(rows)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            print(
+                f"{rows:>10,} {fmt:>10} {result['seconds']:>8.2f}s "
+                f"{result['peak_mb']:>8.0f}MB {result['file_mb']:>7.1f}MB"
+            )
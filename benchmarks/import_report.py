@@ -0,0 +1,71 @@
+"""Per-module import time of ``app``, from ``python -X importtime``.
+
+Prints the self time of every imported module summed per top-level package,
+and the slowest individual modules.  ``--json`` writes the per-package totals so
+two reports can be compared to spot import regressions.
+
+Usage: python benchmarks/import_report.py [--module app] [--top 15] [--json FILE]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(module: str) -> list:
+    """(self_us, cumulative_us, depth, name) for every module the import loads."""
+    env = dict(os.environ, OVERVIEW_WARMUP="off")
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return rows
+
+
+def package_totals(rows: list) -> dict:
+    """Self time of every module summed per top-level package, in ms."""
+    totals = defaultdict(float)
+    for self_us, _, _, name in rows:
+        totals[name.split(".")[0]] += self_us / 1000
+    return dict(totals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    rows = import_times(args.module)
+    totals = package_totals(rows)
+    total_ms = sum(totals.values())
+
+    print(f"import {args.module}: {total_ms:.1f} ms in {len(rows)} modules\n")
+    print("by package (self time)")
+    for name, ms in sorted(totals.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {name:<32} {ms:8.1f} ms  {ms / total_ms:6.1%}")
+
+    print("\nslowest modules (self time)")
+    for self_us, cumulative_us, _, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {name:<48} {self_us / 1000:8.1f} ms  (cumulative {cumulative_us / 1000:.1f} ms)")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump({"module": args.module, "total_ms": total_ms, "packages": totals}, fh, indent=2)
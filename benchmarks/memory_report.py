@@ -0,0 +1,36 @@
+"""Memory of the original object-dtype DataFrame versus ``ProjectStore``.
+
+Usage: python benchmarks/memory_report.py [ROWS ...]   (default: 100k 1M 10M)
+"""
+import sys
+
+from synthetic import make_projects
+
+from data_source import coerce_chunk
+from store import ProjectStore
+
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+
+
+def mib(n_bytes: int) -> str:
+    return f"{n_bytes / 2**20:10.1f} MiB"
+
+
+def report(n_rows: int) -> None:
+    raw = make_projects(n_rows)
+    frame_bytes = int(raw.memory_usage(deep=True).sum())
+    store = ProjectStore.from_frame(coerce_chunk(raw))
+    del raw
+    usage = store.memory_usage()
+    store_bytes = sum(usage.values())
+    print(f"rows={n_rows:,}")
+    print(f"  DataFrame (object columns) {mib(frame_bytes)}")
+    print(f"  ProjectStore               {mib(store_bytes)}  ({frame_bytes / store_bytes:.1f}x smaller)")
+    for col, n_bytes in usage.items():
+        print(f"    {col:<14}{mib(n_bytes)}")
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        report(size)
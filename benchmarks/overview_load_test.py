@@ -0,0 +1,166 @@
+"""Load test: browser sessions sending rapid bursts of score-range changes.
+
+Every session sends ``--steps`` overview requests ``--interval`` seconds
+apart without waiting for the answers, like a slider moved in quick
+succession, and only its last answer is what the user ends up seeing.  The
+app is served by gunicorn with the deployed gunicorn.conf.py (gthread
+workers), once with latest-wins off and once with it on
+(``OVERVIEW_LATEST_WINS``), on the same synthetic data.  A session's requests
+can land on different workers and each worker only knows its own requests,
+so more workers abandon fewer of them.
+
+Reported per mode: p50/p95 latency of each session's last request, p95 over
+all answered requests, and how many requests were abandoned (HTTP 204).
+
+Usage: python benchmarks/overview_load_test.py [--rows 300000] [--sessions 8] [--steps 8] [--interval 0.05]
+                                              [--workers 2] [--threads 8]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from synthetic import make_projects
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def http(base: str, path: str, payload=None):
+    data = None if payload is None else json.dumps(payload).encode()
+    req = urllib.request.Request(base + path, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=300) as resp:
+        return resp.status, resp.read()
+
+
+def overview_payload(dependencies: list):
+    """Build the request body of ``update_overview_figures`` for a given overview-request."""
+    dep = next(d for d in dependencies if "projects-per-dept-bar.figure" in d["output"])
+    outputs = [
+        dict(zip(("id", "property"), part.rsplit(".", 1)))
+        for part in dep["output"].strip(".").split("...")
+    ]
+
+    def payload(request: dict) -> dict:
+        return {
+            "output": dep["output"],
+            "outputs": outputs,
+            "inputs": [dict(dep["inputs"][0], value=request)],
+            "state": [dict(dep["state"][0], value=None)],
+            "changedPropIds": ["overview-request.data"],
+        }
+
+    return payload
+
+
+def run_mode(latest_wins: bool, data_path: str, args) -> dict:
+    port = free_port()
+    env = dict(
+        os.environ,
+        PROJECTS_DATA_PATH=data_path,
+        OVERVIEW_WARMUP="off",
+        # داده پیش از fork یک بار بارگذاری می‌شود تا اولین درخواست هر worker زمان بارگذاری را اندازه نگیرد
+        PRELOAD_APP="1",
+        OVERVIEW_LATEST_WINS="1" if latest_wins else "0",
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+    )
+    child = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "-b", f"127.0.0.1:{port}", "wsgi:server"],
+        cwd=REPO_DIR,
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(300):
+            try:
+                http(base, "/_dash-layout")  # داده هم همین‌جا بارگذاری می‌شود
+                break
+            except OSError:
+                time.sleep(0.1)
+        _, body = http(base, "/_dash-dependencies")
+        payload = overview_payload(json.loads(body))
+
+        results = []  # (session, step, status, seconds)
+        lock = threading.Lock()
+
+        def send(session: int, step: int, lo: int, hi: int) -> None:
+            request = {"range": [lo, hi], "session": f"load-{session}", "seq": step + 1}
+            started = time.perf_counter()
+            status, _ = http(base, "/_dash-update-component", payload(request))
+            with lock:
+                results.append((session, step, status, time.perf_counter() - started))
+
+        def drag(session: int) -> None:
+            threads = []
+            for step in range(args.steps):
+                lo = 60 + (session * 3 + step) % 25
+                hi = min(100, lo + 10 + step % 5)
+                thread = threading.Thread(target=send, args=(session, step, lo, hi))
+                thread.start()
+                threads.append(thread)
+                time.sleep(args.interval)
+            for thread in threads:
+                thread.join()
+
+        started = time.perf_counter()
+        sessions = [threading.Thread(target=drag, args=(i,)) for i in range(args.sessions)]
+        for thread in sessions:
+            thread.start()
+        for thread in sessions:
+            thread.join()
+        wall = time.perf_counter() - started
+        _, metrics = http(base, "/metrics")
+    finally:
+        child.terminate()
+        child.wait()
+
+    last = sorted(r[3] for r in results if r[1] == args.steps - 1)
+    answered = sorted(r[3] for r in results if r[2] == 200)
+    return {
+        "wall": wall,
+        "last_p50": statistics.median(last),
+        "last_p95": last[max(0, round(0.95 * len(last)) - 1)],
+        "answered_p95": answered[max(0, round(0.95 * len(answered)) - 1)],
+        "answered": len(answered),
+        "abandoned": sum(1 for r in results if r[2] == 204),
+        "metrics": json.loads(metrics)["latest_wins"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=float, default=300_000)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=8)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "projects.csv")
+        make_projects(int(args.rows)).to_csv(data_path, index=False)
+        print(
+            f"{args.sessions} sessions x {args.steps} requests, {args.interval * 1000:.0f} ms apart, "
+            f"{int(args.rows):,} rows, gunicorn {args.workers} workers x {args.threads} threads"
+        )
+        print(f"{'latest-wins':>12} {'last p50':>9} {'last p95':>9} {'all p95':>9} {'answered':>9} {'abandoned':>10} {'wall':>7}")
+        for latest_wins in (False, True):
+            result = run_mode(latest_wins, data_path, args)
+            print(
+                f"{'on' if latest_wins else 'off':>12} {result['last_p50']:>8.2f}s {result['last_p95']:>8.2f}s "
+                f"{result['answered_p95']:>8.2f}s {result['answered']:>9} {result['abandoned']:>10} {result['wall']:>6.1f}s"
+            )
@@ -0,0 +1,54 @@
+"""How long a fresh worker takes to build the app and serve its first page.
+
+Each run starts a new interpreter (like a gunicorn worker boot), imports
+``wsgi:server`` (``app:server`` in older checkouts) from the given checkout and then requests ``/`` and
+``/_dash-layout`` once through the Flask test client.
+
+Usage: python benchmarks/startup_benchmark.py [REPO_DIR] [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+try:
+    from wsgi import server
+except ImportError:
+    from app import server
+t1 = time.perf_counter()
+client = server.test_client()
+client.get("/")
+client.get("/_dash-layout")
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_page": t2 - t1}))
+"""
+
+
+def run_once(repo_dir: str) -> dict:
+    env = dict(os.environ, OVERVIEW_WARMUP="off")
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=repo_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("repo_dir", nargs="?", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [run_once(args.repo_dir) for _ in range(args.runs)]
+    for field in ("import", "first_page"):
+        values = [r[field] for r in runs]
+        print(f"{field:<12} median {statistics.median(values) * 1000:8.1f} ms   min {min(values) * 1000:8.1f} ms")
@@ -0,0 +1,40 @@
+"""Synthetic project tables shaped like ``projects_data`` in ``app.py``."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEPARTMENTS = [f"واحد {i}" for i in range(40)]
+MANAGERS_PER_DEPARTMENT = 25
+STATUSES = ["در حال انجام", "نزدیک به اتمام", "متوقف شده", "تکمیل شده"]
+
+
+def make_projects(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Rows with the same columns and object dtypes as ``pd.DataFrame(projects_data)``."""
+    rng = np.random.default_rng(seed)
+    dept_idx = rng.integers(0, len(DEPARTMENTS), n_rows)
+    mgr_idx = rng.integers(0, MANAGERS_PER_DEPARTMENT, n_rows)
+    departments = np.array(DEPARTMENTS, dtype=object)
+    managers = np.array(
+        [f"مدیر {d}-{m}" for d in range(len(DEPARTMENTS)) for m in range(MANAGERS_PER_DEPARTMENT)],
+        dtype=object,
+    )
+    days = rng.integers(0, 3 * 365, n_rows)
+    start = (np.datetime64("2023-01-01") + days.astype("timedelta64[D]")).astype(str)
+    frame = pd.DataFrame(
+        {
+            "department": departments[dept_idx],
+            "manager": managers[dept_idx * MANAGERS_PER_DEPARTMENT + mgr_idx],
+            "project_name": np.array([f"پروژه شماره {i}" for i in range(n_rows)], dtype=object),
+            "start_date": start.astype(object),
+            "status": np.array(STATUSES, dtype=object)[rng.integers(0, len(STATUSES), n_rows)],
+            "score": rng.integers(60, 101, n_rows),
+        }
+    )
+    # newer pandas would infer its own string dtype; keep the original object columns
+    text_columns = ["department", "manager", "project_name", "start_date", "status"]
+    frame[text_columns] = frame[text_columns].astype(object)
+    return frame
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+# کش‌هایی که registry جداگانه‌ای نگرفته‌اند برای گزارش آمار در اینجا ثبت می‌شوند
+_registry: Dict[str, Any] = {}
+
+
+class Abandoned(Exception):
+    """Raised by a computation that gave up because its result is no longer wanted.
+
+    Threads waiting on it in ``LRUCache.get_or_compute`` then compute the key
+    themselves instead of failing with it.
+    """
+
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used entry.
+
+    ``get_or_compute`` is single-flight: while one thread computes a missing
+    key, other threads asking for the same key wait for that result instead
+    of computing it again.  They are counted in ``merged``.  If the computing
+    thread raises ``Abandoned``, a waiting thread takes over the computation.
+    """
+
+    def __init__(self, name: str, maxsize: int = 128, registry: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.merged = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        (_registry if registry is None else registry)[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        merged = False
+        while True:
+            with self._lock:
+                # شاید محاسبه‌ی نخ دیگری بین get و اینجا تمام شده باشد
+                value = self._data.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = Future()
+                elif not merged:
+                    # هر فراخوانی فقط یک بار miss و یک بار merged شمرده می‌شود، حتی اگر دوباره منتظر بماند
+                    self.merged += 1
+                    merged = True
+            if leader:
+                break
+            try:
+                return flight.result()
+            except Abandoned:
+                # محاسبه‌ی نخ پیشرو رها شد؛ دوباره تلاش می‌کنیم و شاید خودمان پیشرو شویم
+                continue
+        try:
+            value = compute()
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            self.set(key, value)
+            flight.set_result(value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "merged": self.merged,
+        }
+
+
+class FileCache:
+    """Files on local disk keyed by a tuple, evicted least recently used first.
+
+    A hit touches the file's mtime, so the LRU order lives on disk and is
+    shared by every process that uses the same directory.  Files are
+    evicted by oldest mtime once their total size passes ``max_bytes``.
+    """
+
+    def __init__(
+        self, name: str, directory: str, max_bytes: int, registry: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        (_registry if registry is None else registry)[name] = self
+
+    def _path(self, key: Hashable, suffix: str = "") -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + suffix)
+
+    def get(self, key: Hashable, suffix: str = "") -> Optional[str]:
+        """Path of the cached file for ``key``, or None."""
+        path = self._path(key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def reserve(self, suffix: str = "") -> str:
+        """Path in the cache directory to write a new file to before ``put``."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=suffix + ".part", dir=self.directory)
+        os.close(fd)
+        return path
+
+    def put(self, key: Hashable, source: str, suffix: str = "") -> str:
+        """Move the finished file ``source`` into the cache and return its new path."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key, suffix)
+        shutil.move(source, path)
+        self.evict()
+        return path
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if name.endswith(".part"):
+                continue  # فایل‌هایی که هنوز در حال نوشتن‌اند
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            # جدیدترین فایل همیشه می‌ماند، حتی اگر به‌تنهایی از سقف بزرگ‌تر باشد
+            for _, size, path in entries[:-1]:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, int]:
+        entries = self._entries()
+        return {
+            "size": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def cache_stats(registry: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, int]]:
+    return {name: cache.stats() for name, cache in (_registry if registry is None else registry).items()}
@@ -0,0 +1,137 @@
+import logging
+import os
+from typing import Iterable, Iterator
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+# ---------- Schema ----------
+COLUMNS = ["department", "manager", "project_name", "start_date", "status", "score"]
+CATEGORICAL_COLUMNS = ["department", "manager", "status"]
+SCORE_DTYPE = "uint8"
+
+# تعداد ردیف‌هایی که در هر مرحله از فایل خوانده می‌شود
+CHUNK_SIZE = 50_000
+
+# امتیاز در uint8 نگه داشته می‌شود؛ ردیف‌های بیرون از این بازه کنار گذاشته می‌شوند
+SCORE_MIN, SCORE_MAX = 0, 255
+
+logger = logging.getLogger(__name__)
+
+
+def coerce_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Select the known columns of a raw chunk and give them compact dtypes.
+
+    Rows whose score is missing, not a number or outside ``SCORE_MIN..SCORE_MAX``
+    are dropped and their count is logged.
+    """
+    missing = [c for c in COLUMNS if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"missing project columns: {', '.join(missing)}")
+
+    chunk = chunk[COLUMNS].copy()
+    for col in CATEGORICAL_COLUMNS:
+        if not isinstance(chunk[col].dtype, pd.CategoricalDtype):
+            chunk[col] = chunk[col].astype("category")
+        # ستونی که در یک بخش کاملاً خالی است دسته‌های object می‌گیرد و بقیه str؛
+        # union_categoricals فقط دسته‌های هم‌نوع را ادغام می‌کند
+        chunk[col] = chunk[col].cat.set_categories(chunk[col].cat.categories.astype(object))
+    chunk["project_name"] = chunk["project_name"].astype(str)
+    chunk["start_date"] = pd.to_datetime(chunk["start_date"], errors="coerce")
+    score = pd.to_numeric(chunk["score"], errors="coerce")
+    # امتیاز خالی یا نامعتبر صفر حساب نمی‌شود؛ چنین ردیفی در هیچ جمع و میانگینی نمی‌آید
+    valid = score.between(SCORE_MIN, SCORE_MAX)
+    dropped = int((~valid).sum())
+    if dropped:
+        logger.warning("dropped %d project rows with a missing or out-of-range score", dropped)
+        chunk, score = chunk[valid], score[valid]
+    chunk["score"] = score.astype(SCORE_DTYPE)
+    return chunk
+
+
+def concat_chunks(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate typed chunks, merging the categories of every chunk."""
+    chunks = list(chunks)
+    if not chunks:
+        return coerce_chunk(pd.DataFrame(columns=COLUMNS))
+
+    merged = {}
+    for col in COLUMNS:
+        if col in CATEGORICAL_COLUMNS:
+            merged[col] = pd.Categorical(
+                union_categoricals([c[col] for c in chunks], sort_categories=True)
+            )
+        else:
+            merged[col] = pd.concat([c[col] for c in chunks], ignore_index=True)
+    return pd.DataFrame(merged, columns=COLUMNS)
+
+
+# ---------- File readers ----------
+def iter_csv(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    reader = pd.read_csv(
+        path,
+        usecols=COLUMNS,
+        dtype={col: "category" for col in CATEGORICAL_COLUMNS},
+        chunksize=chunk_size,
+    )
+    with reader:
+        for chunk in reader:
+            yield coerce_chunk(chunk)
+
+
+def iter_parquet(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=COLUMNS):
+        yield coerce_chunk(batch.to_pandas())
+
+
+def iter_excel(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield coerce_chunk(pd.DataFrame(batch, columns=header))
+                batch = []
+        if batch:
+            yield coerce_chunk(pd.DataFrame(batch, columns=header))
+    finally:
+        workbook.close()
+
+
+READERS = {
+    ".csv": iter_csv,
+    ".parquet": iter_parquet,
+    ".pq": iter_parquet,
+    ".xlsx": iter_excel,
+    ".xlsm": iter_excel,
+}
+
+
+def load_projects(path: str, chunk_size: int = CHUNK_SIZE) -> pd.DataFrame:
+    """Read a CSV/Parquet/Excel file of projects in chunks into a typed frame."""
+    ext = os.path.splitext(path)[1].lower()
+    reader = READERS.get(ext)
+    if reader is None:
+        raise ValueError(f"unsupported project file type: {ext or path}")
+    return concat_chunks(reader(path, chunk_size))
+
+
+def load_records(records: Iterable[dict]) -> pd.DataFrame:
+    return concat_chunks([coerce_chunk(pd.DataFrame(list(records), columns=COLUMNS))])
+
+
+def to_table_records(frame: pd.DataFrame) -> list:
+    """Rows for a DataTable, with dates rendered the way the tables show them."""
+    out = frame.copy()
+    if "start_date" in out.columns:
+        out["start_date"] = out["start_date"].dt.strftime("%Y-%m-%d").fillna("")
+    return out.to_dict("records")
@@ -0,0 +1,375 @@
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_source import CATEGORICAL_COLUMNS, COLUMNS
+from store import ProjectStore
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MIMETYPE = "text/csv"
+PARQUET_MIMETYPE = "application/vnd.apache.parquet"
+
+# تعداد ردیف‌هایی که در هر مرحله از ستون‌ها بازسازی و در فایل نوشته می‌شود
+EXPORT_CHUNK_SIZE = 20_000
+
+# پس از هر بخش با تعداد کل ردیف‌های نوشته‌شده تا آن لحظه صدا زده می‌شود
+Progress = Optional[Callable[[int], None]]
+
+
+# ترتیب ردیف‌های خروجی؛ بخشی از کلید کش فایل‌های خروجی است
+EXPORT_SORT = ("department", "manager", "-score")
+
+
+def export_order(store: ProjectStore, positions: np.ndarray) -> np.ndarray:
+    """``positions`` ordered as ``EXPORT_SORT``: department, manager, then score (highest first)."""
+    keys = (
+        -store.sort_key("score")[positions].astype(np.int64),
+        store.sort_key("manager")[positions],
+        store.sort_key("department")[positions],
+    )
+    return positions[np.lexsort(keys)]
+
+
+def iter_chunks(
+    store: ProjectStore, positions: np.ndarray, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Decoded frames of at most ``chunk_size`` rows, in the order of ``positions``."""
+    for start in range(0, len(positions), chunk_size):
+        yield store.take(positions[start : start + chunk_size])
+
+
+def _rows(frame: pd.DataFrame) -> Iterator[tuple]:
+    columns = []
+    for col in COLUMNS:
+        values = frame[col].astype(object)
+        columns.append(values.where(values.notna(), None).tolist())
+    return zip(*columns)
+
+
+def write_xlsx(
+    store: ProjectStore,
+    positions: np.ndarray,
+    fh: IO[bytes],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    progress: Progress = None,
+) -> None:
+    """Write the rows at ``positions`` to ``fh`` as a single-sheet workbook.
+
+    The workbook is opened in openpyxl's write-only mode, which streams rows to
+    a temporary file instead of keeping cell objects, and the rows are decoded
+    ``chunk_size`` at a time, so memory does not grow with the row count.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(COLUMNS)
+    written = 0
+    for chunk in iter_chunks(store, positions, chunk_size):
+        for row in _rows(chunk):
+            sheet.append(row)
+        written += len(chunk)
+        if progress:
+            progress(written)
+    workbook.save(fh)
+
+
+def iter_csv(
+    store: ProjectStore, positions: np.ndarray, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """CSV of the rows at ``positions``, produced ``chunk_size`` rows at a time.
+
+    The first chunk starts with a UTF-8 BOM so Excel opens the Persian text
+    correctly.
+    """
+    yield ",".join(COLUMNS).encode("utf-8-sig") + b"\n"
+    for chunk in iter_chunks(store, positions, chunk_size):
+        text = chunk.to_csv(header=False, index=False, date_format="%Y-%m-%d", lineterminator="\n")
+        yield text.encode("utf-8")
+
+
+def write_csv(
+    store: ProjectStore,
+    positions: np.ndarray,
+    fh: IO[bytes],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    progress: Progress = None,
+) -> None:
+    chunks = iter_csv(store, positions, chunk_size)
+    fh.write(next(chunks))  # سطر عنوان ستون‌ها
+    for start, data in zip(range(0, len(positions), chunk_size), chunks):
+        fh.write(data)
+        if progress:
+            progress(min(start + chunk_size, len(positions)))
+
+
+def _arrow_batch(store: ProjectStore, positions: np.ndarray):
+    """Rows at ``positions`` as a pyarrow table built straight from the store columns.
+
+    The categorical columns become dictionary arrays over the store's own
+    lookup tables, so no text values are decoded.
+    """
+    import pyarrow as pa
+
+    arrays = []
+    for col in COLUMNS:
+        if col in CATEGORICAL_COLUMNS:
+            codes = store.codes(col)[positions]
+            dictionary = pa.array(store.categories(col), type=pa.string())
+            arrays.append(pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), dictionary))
+        elif col == "project_name":
+            names = np.asarray(store.project_names.take(positions), dtype=object)
+            arrays.append(pa.array(names, type=pa.string(), from_pandas=True))
+        elif col == "start_date":
+            arrays.append(pa.array(store.start_date[positions], from_pandas=True))
+        else:
+            arrays.append(pa.array(store.score[positions]))
+    return pa.Table.from_arrays(arrays, names=COLUMNS)
+
+
+def write_parquet(
+    store: ProjectStore,
+    positions: np.ndarray,
+    fh: IO[bytes],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    progress: Progress = None,
+) -> None:
+    """Write the rows at ``positions`` to ``fh`` as Parquet, one row group per chunk."""
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for start in range(0, max(len(positions), 1), chunk_size):
+            table = _arrow_batch(store, positions[start : start + chunk_size])
+            if writer is None:
+                writer = pq.ParquetWriter(fh, table.schema, compression="zstd")
+            writer.write_table(table)
+            if progress:
+                progress(start + table.num_rows)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# ---------- Per-department workbook ----------
+SUMMARY_SHEET = "خلاصه مدیران"
+SUMMARY_COLUMNS = ["department", "manager", "project_count", "avg_score"]
+# نویسه‌هایی که اکسل در نام برگه نمی‌پذیرد؛ نام برگه حداکثر ۳۱ نویسه است
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+# استخر هر اندازه یک بار ساخته و بین همه‌ی خروجی‌های همان فرایند شریک می‌شود
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+def _process_pool(processes: int) -> ProcessPoolExecutor:
+    """Process pool of ``processes`` workers shared by workbook exports, created on first use.
+
+    The processes come from a fork server (spawn where there is none), since
+    forking the threaded web server itself is not safe.
+    """
+    with _pool_lock:
+        if processes not in _pools:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            if context.get_start_method() == "forkserver":
+                context.set_forkserver_preload(["export"])
+            _pools[processes] = ProcessPoolExecutor(processes, mp_context=context)
+        return _pools[processes]
+
+
+def department_groups(store: ProjectStore, positions: np.ndarray) -> List[Tuple[str, np.ndarray]]:
+    """Split export-ordered ``positions`` into one run per department."""
+    codes = store.codes("department")[positions]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1)) if len(codes) else []
+    bounds = zip(starts, list(starts[1:]) + [len(codes)])
+    categories = store.categories("department")
+    return [
+        (categories[codes[start]] if codes[start] >= 0 else "", positions[start:stop])
+        for start, stop in bounds
+    ]
+
+
+def _sheet_titles(names: List[str]) -> List[str]:
+    used = {SUMMARY_SHEET}
+    titles = []
+    for name in names:
+        base = _INVALID_SHEET_CHARS.sub(" ", str(name)).strip()[:31] or "بدون واحد"
+        title, n = base, 2
+        while title in used:
+            suffix = f" ({n})"
+            title, n = base[: 31 - len(suffix)] + suffix, n + 1
+        used.add(title)
+        titles.append(title)
+    return titles
+
+
+def manager_summary(store: ProjectStore, positions: np.ndarray) -> pd.DataFrame:
+    """Projects and mean score per (department, manager), as in ``dept-managers-table``."""
+    data = pd.DataFrame(
+        {
+            col: pd.Categorical.from_codes(store.codes(col)[positions], categories=store.categories(col))
+            for col in ("department", "manager")
+        }
+    )
+    data["score"] = store.score[positions]
+    summary = (
+        data.groupby(["department", "manager"], observed=True)
+        .agg(project_count=("score", "count"), avg_score=("score", "mean"))
+        .reset_index()
+    )
+    summary["avg_score"] = summary["avg_score"].round(1)
+    return summary[SUMMARY_COLUMNS]
+
+
+def _sheet_xml(frame: pd.DataFrame) -> str:
+    """Write ``frame`` as the only sheet of a workbook and return that sheet's XML file.
+
+    Runs in a worker process.  The XML is left in a temporary file for the
+    parent to copy into the final workbook.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(COLUMNS)
+    for row in _rows(frame):
+        sheet.append(row)
+    with tempfile.TemporaryFile() as buffer:
+        workbook.save(buffer)
+        buffer.seek(0)
+        fd, path = tempfile.mkstemp(suffix=".xml")
+        with zipfile.ZipFile(buffer) as archive, os.fdopen(fd, "wb") as out, archive.open(
+            "xl/worksheets/sheet1.xml"
+        ) as xml:
+            while True:
+                data = xml.read(1 << 20)
+                if not data:
+                    break
+                out.write(data)
+    return path
+
+
+def _discard_sheet(future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        os.remove(future.result())
+
+
+def write_department_workbook(
+    store: ProjectStore,
+    positions: np.ndarray,
+    fh: IO[bytes],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    progress: Progress = None,
+    processes: int = 0,
+) -> None:
+    """Workbook with a manager summary sheet and one sheet per department.
+
+    Turning rows into sheet XML is almost all of the cost of an xlsx file, so
+    every department sheet is written by openpyxl in a worker process.  The
+    parent writes a skeleton workbook with the summary sheet and an empty
+    sheet per department, then swaps each empty sheet's XML for the one
+    built by a worker.  Apart from the summary's numbers, only dates carry a
+    cell style, so a date written in the skeleton gives it the same style
+    table the worker sheets refer to.  ``processes`` sets the size of the
+    worker pool (0: one per CPU).
+    """
+    from openpyxl import Workbook
+
+    groups = department_groups(store, positions)
+    titles = _sheet_titles([name for name, _ in groups])
+
+    skeleton = Workbook(write_only=True)
+    summary_sheet = skeleton.create_sheet(SUMMARY_SHEET)
+    summary_sheet.append(SUMMARY_COLUMNS)
+    for row in manager_summary(store, positions).itertuples(index=False):
+        summary_sheet.append(list(row))
+    for title in titles:
+        placeholder = skeleton.create_sheet(title)
+        placeholder.append([None] * (COLUMNS.index("start_date")) + [datetime(2000, 1, 1)])
+
+    # برگه‌ی i+2 در بایگانی مال واحد i است (برگه‌ی ۱ خلاصه است)
+    sheet_files = {}
+    processes = processes or os.cpu_count() or 1
+    pool = _process_pool(processes)
+    pending = {}
+    written = 0
+    try:
+        with tempfile.TemporaryFile() as skeleton_file:
+            skeleton.save(skeleton_file)
+            skeleton_file.seek(0)
+            with zipfile.ZipFile(skeleton_file) as source:
+                names = set(source.namelist())
+            missing = [
+                f"xl/worksheets/sheet{index + 2}.xml"
+                for index in range(len(groups))
+                if f"xl/worksheets/sheet{index + 2}.xml" not in names
+            ]
+            if missing:
+                # اگر openpyxl نام‌گذاری برگه‌ها را عوض کند، برگه‌ها بی‌صدا خالی می‌ماندند
+                raise RuntimeError(f"skeleton workbook has no {', '.join(missing)}")
+
+            # در هر لحظه حداکثر دو برابر تعداد پردازه‌ها بخش در صف است تا حافظه محدود بماند
+            window = 2 * processes
+            queue = list(enumerate(groups))
+            while queue or pending:
+                while queue and len(pending) < window:
+                    index, (_, dept_positions) = queue.pop(0)
+                    future = pool.submit(_sheet_xml, store.take(dept_positions))
+                    pending[future] = (index, len(dept_positions))
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, n_rows = pending.pop(future)
+                    sheet_files[f"xl/worksheets/sheet{index + 2}.xml"] = future.result()
+                    written += n_rows
+                    if progress:
+                        progress(written)
+
+            skeleton_file.seek(0)
+            with zipfile.ZipFile(skeleton_file) as source, zipfile.ZipFile(
+                fh, "w", zipfile.ZIP_DEFLATED
+            ) as target:
+                for item in source.infolist():
+                    if item.filename in sheet_files:
+                        target.write(sheet_files[item.filename], item.filename)
+                    else:
+                        target.writestr(item, source.read(item.filename))
+    finally:
+        for future in pending:
+            if not future.cancel():
+                future.add_done_callback(_discard_sheet)
+        for path in sheet_files.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+
+# ---------- Formats ----------
+MIMETYPES = {
+    "xlsx": XLSX_MIMETYPE,
+    "csv": CSV_MIMETYPE,
+    "parquet": PARQUET_MIMETYPE,
+    "departments": XLSX_MIMETYPE,
+}
+
+FILENAMES = {
+    "xlsx": "projects.xlsx",
+    "csv": "projects.csv",
+    "parquet": "projects.parquet",
+    "departments": "projects-by-department.xlsx",
+}
+
+WRITERS = {
+    "xlsx": write_xlsx,
+    "csv": write_csv,
+    "parquet": write_parquet,
+    "departments": write_department_workbook,
+}
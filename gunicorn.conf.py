@@ -0,0 +1,23 @@
+import gc
+import os
+
+# PRELOAD_APP=1: برنامه و داده‌ها یک بار در فرایند اصلی ساخته می‌شوند و workerها آن‌ها را copy-on-write به ارث می‌برند
+preload_app = os.environ.get("PRELOAD_APP", "0") == "1"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+# هر worker چند درخواست را هم‌زمان در نخ‌های جدا پاسخ می‌دهد؛ رها کردن درخواست‌های کهنه‌ی نمای کلی
+# (LatestRequests) و ادغام محاسبه‌های یکسان در کش فقط وقتی کار می‌کنند که درخواست‌ها در یک فرایند هم‌پوشانی داشته باشند
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+
+def pre_fork(server, worker):
+    # اشیای ساخته‌شده تا اینجا از دید GC کنار گذاشته می‌شوند تا پیمایش GC در workerها
+    # صفحه‌های حافظه‌ی مشترک را لمس و کپی نکند
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        import wsgi
+
+        wsgi.dashboard.start_overview_warmup()
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# فیلدهایی از رکورد کار که به مرورگر فرستاده می‌شوند
+PUBLIC_JOB_FIELDS = ("id", "format", "state", "done", "total")
+
+# run(job, path, progress): فایل خروجی را در path می‌نویسد، job["total"] را پر می‌کند
+# و پس از هر بخش progress(ردیف‌های نوشته‌شده) را صدا می‌زند
+JobRunner = Callable[[dict, str, Callable[[int], None]], None]
+
+# publish(job, path): فایل تمام‌شده را به جای نهایی‌اش می‌برد و مسیر آن را برمی‌گرداند
+JobPublisher = Callable[[dict, str], str]
+
+
+class ExportJobs:
+    """Export jobs run on a local thread pool, with their state kept on disk.
+
+    Every job is a ``<id>.json`` record next to its output file in
+    ``directory``.  Workers that share the directory can therefore all report
+    a job's progress and serve its file, whichever of them ran it.
+    """
+
+    def __init__(
+        self,
+        run: JobRunner,
+        directory: Optional[str] = None,
+        max_workers: int = 2,
+        ttl: int = 3600,
+        publish: Optional[JobPublisher] = None,
+    ):
+        self.run = run
+        self.publish = publish
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "dashboard-exports")
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # استخر در اولین درخواست ساخته می‌شود تا در فرایند اصلی gunicorn (پیش از fork) نخی نباشد
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="export-job")
+            return self._executor
+
+    def _record_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def file_path(self, job: dict) -> str:
+        return job.get("file") or os.path.join(self.directory, f"{job['id']}.{job['format']}")
+
+    def _save(self, job: dict) -> None:
+        path = self._record_path(job["id"])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(job, fh)
+        os.replace(tmp_path, path)
+
+    def _new_job(self, fmt: str, state: str, **params) -> dict:
+        os.makedirs(self.directory, exist_ok=True)
+        self.prune()
+        return {
+            "id": uuid.uuid4().hex,
+            "format": fmt,
+            "state": state,
+            "done": 0,
+            "total": None,
+            "error": None,
+            "created": time.time(),
+            **params,
+        }
+
+    def submit(self, fmt: str, **params) -> dict:
+        job = self._new_job(fmt, "queued", **params)
+        self._save(job)
+        self._pool().submit(self._execute, job)
+        return job
+
+    def completed(self, fmt: str, path: str, total: Optional[int] = None, **params) -> dict:
+        """Record a job whose file already exists at ``path``, e.g. from a cache."""
+        job = self._new_job(fmt, "done", file=path, done=total, total=total, **params)
+        self._save(job)
+        return job
+
+    def _execute(self, job: dict) -> None:
+        tmp_path = f"{self.file_path(job)}.part"
+        job["state"] = "running"
+        self._save(job)
+
+        def progress(done: int) -> None:
+            job["done"] = int(done)
+            self._save(job)
+
+        try:
+            self.run(job, tmp_path, progress)
+            if self.publish:
+                job["file"] = self.publish(job, tmp_path)
+            else:
+                os.replace(tmp_path, self.file_path(job))
+            job["state"] = "done"
+        except Exception as exc:
+            logger.exception("export job %s failed", job["id"])
+            job["state"], job["error"] = "failed", str(exc)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._save(job)
+
+    def status(self, job_id: str) -> Optional[dict]:
+        if not job_id or not _JOB_ID.match(job_id):
+            return None
+        try:
+            with open(self._record_path(job_id), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def prune(self) -> None:
+        """Delete the records and files of jobs older than ``ttl`` seconds."""
+        cutoff = time.time() - self.ttl
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from caching import Abandoned
+
+
+def _never() -> None:
+    pass
+
+
+class LatestRequests:
+    """Newest request sequence number seen per browser session.
+
+    A request is superseded once its session has sent a newer one.  ``begin``
+    returns a check that raises ``Abandoned`` from then on, so the callback
+    can stop between steps instead of finishing work nobody will see.
+    Only the ``max_sessions`` most recently active sessions are remembered.
+    """
+
+    def __init__(self, max_sessions: int = 4096):
+        self.max_sessions = max_sessions
+        self.enabled = True
+        self.abandoned = 0
+        self._latest: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, session: Optional[str], seq: Optional[int]) -> Callable[[], None]:
+        if not self.enabled or not session or seq is None:
+            return _never
+        with self._lock:
+            if seq > self._latest.get(session, -1):
+                self._latest[session] = seq
+            self._latest.move_to_end(session)
+            while len(self._latest) > self.max_sessions:
+                self._latest.popitem(last=False)
+
+        def check() -> None:
+            if self._latest.get(session, seq) > seq:
+                with self._lock:
+                    self.abandoned += 1
+                raise Abandoned(f"request {seq} of session {session} was superseded")
+
+        return check
+
+    def stats(self):
+        return {"enabled": self.enabled, "sessions": len(self._latest), "abandoned": self.abandoned}
+
+
+class ComputeSlots:
+    """Lets at most ``size`` computations run at once.
+
+    A request waiting for a slot keeps calling its ``check``, so one that is
+    superseded while queued leaves without having used any CPU.
+    """
+
+    def __init__(self, size: int = 2, poll: float = 0.02):
+        self.poll = poll
+        self.resize(size)
+
+    def resize(self, size: int) -> None:
+        self.size = max(1, int(size))
+        self._semaphore = threading.Semaphore(self.size)
+
+    @contextmanager
+    def hold(self, check: Callable[[], None] = _never) -> Iterator[None]:
+        semaphore = self._semaphore
+        while not semaphore.acquire(timeout=self.poll):
+            check()
+        try:
+            check()
+            yield
+        finally:
+            semaphore.release()
@@ -0,0 +1,405 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aggregates import ScoreCube
+from data_source import (
+    CATEGORICAL_COLUMNS,
+    COLUMNS,
+    SCORE_DTYPE,
+    load_projects,
+    load_records,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+class ProjectStore:
+    """Column store of projects.
+
+    ``department``, ``manager`` and ``status`` are kept as small integer codes
+    plus a lookup table of their distinct values, ``score`` as ``uint8`` and
+    ``start_date`` as ``datetime64``.  The accessors return read-only NumPy
+    views, so filters can be computed without copying the columns.
+
+    A score-sorted permutation of the rows is built once, so a score range is
+    answered with two binary searches instead of a scan over every row.
+    A department ``ScoreCube`` and one over (department, manager) pairs give
+    the whole overview summary for any score range without touching the rows;
+    the pair cube and a status cube do the same for the summary tables.
+    The rows are also indexed by department -> manager -> score, so a
+    drill-down reads one manager's rows in a score range by binary search.
+    """
+
+    def __init__(
+        self,
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, np.ndarray],
+        project_name,
+        start_date: np.ndarray,
+        score: np.ndarray,
+    ):
+        self._codes = {col: _readonly(codes[col]) for col in CATEGORICAL_COLUMNS}
+        self._categories = {col: _readonly(categories[col]) for col in CATEGORICAL_COLUMNS}
+        self._project_name = project_name
+        self._start_date = _readonly(start_date)
+        self._score = _readonly(score.astype(SCORE_DTYPE, copy=False))
+        # stable argsort keeps the original row order among equal scores
+        self._score_order = _readonly(np.argsort(self._score, kind="stable"))
+        self._sorted_score = _readonly(self._score[self._score_order])
+        self._sort_keys: Dict[str, np.ndarray] = {}
+        self._lookup = {
+            col: {value: code for code, value in enumerate(self._categories[col])}
+            for col in CATEGORICAL_COLUMNS
+        }
+        self.department_cube = ScoreCube(
+            self._codes["department"], len(self._categories["department"]), self._score
+        )
+        self.pair_cube = self._build_pair_cube()
+        self.status_cube = ScoreCube(
+            self._codes["status"], len(self._categories["status"]), self._score
+        )
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "ProjectStore":
+        codes, categories = {}, {}
+        for col in CATEGORICAL_COLUMNS:
+            cat = frame[col].astype("category").cat
+            # pandas already picks the smallest signed int type for the codes
+            codes[col] = cat.codes.to_numpy()
+            categories[col] = cat.categories.to_numpy(dtype=object)
+        return cls(
+            codes,
+            categories,
+            frame["project_name"].array,
+            frame["start_date"].to_numpy(dtype="datetime64[ns]"),
+            frame["score"].to_numpy(),
+        )
+
+    def __len__(self) -> int:
+        return len(self._score)
+
+    # ---------- Column views ----------
+    @property
+    def score(self) -> np.ndarray:
+        return self._score
+
+    @property
+    def start_date(self) -> np.ndarray:
+        return self._start_date
+
+    @property
+    def project_names(self):
+        return self._project_name
+
+    def codes(self, col: str) -> np.ndarray:
+        return self._codes[col]
+
+    def categories(self, col: str) -> np.ndarray:
+        return self._categories[col]
+
+    def code_of(self, col: str, value) -> int:
+        """Code of ``value`` in ``col``, or -1 when the value does not occur."""
+        return self._lookup[col].get(value, -1)
+
+    def sort_key(self, col: str) -> np.ndarray:
+        """Integer key per row that sorts ``col`` in its natural (text/date/number) order."""
+        key = self._sort_keys.get(col)
+        if key is not None:
+            return key
+        if col in CATEGORICAL_COLUMNS:
+            # رتبه‌ی هر دسته در ترتیب الفبایی؛ مقدارهای خالی اول می‌آیند
+            rank = np.argsort(np.argsort(self._categories[col], kind="stable"))
+            codes = self._codes[col]
+            key = np.where(codes >= 0, rank[codes], -1)
+        elif col == "project_name":
+            key, _ = pd.factorize(self._project_name, sort=True)
+        elif col == "start_date":
+            key = self._start_date.view(np.int64)
+        else:
+            key = self._score
+        key = _readonly(np.asarray(key))
+        self._sort_keys[col] = key
+        return key
+
+    # ---------- Score index ----------
+    def score_bounds(self, lo, hi) -> slice:
+        """Slice of the score-sorted order holding the rows with ``lo <= score <= hi``."""
+        start = int(np.searchsorted(self._sorted_score, lo, side="left"))
+        stop = int(np.searchsorted(self._sorted_score, hi, side="right"))
+        return slice(start, max(start, stop))
+
+    def score_range(self, lo, hi) -> np.ndarray:
+        """Row positions with ``lo <= score <= hi``, ordered by score (a view)."""
+        return self._score_order[self.score_bounds(lo, hi)]
+
+    @property
+    def score_min(self) -> Optional[int]:
+        return int(self._sorted_score[0]) if len(self) else None
+
+    @property
+    def score_max(self) -> Optional[int]:
+        return int(self._sorted_score[-1]) if len(self) else None
+
+    def count_in_range(self, lo, hi) -> int:
+        bounds = self.score_bounds(lo, hi)
+        return bounds.stop - bounds.start
+
+    # ---------- Aggregates ----------
+    def _build_pair_cube(self) -> ScoreCube:
+        dept = self._codes["department"].astype(np.int64)
+        manager = self._codes["manager"].astype(np.int64)
+        n_managers = max(len(self._categories["manager"]), 1)
+        keys = np.where((dept >= 0) & (manager >= 0), dept * n_managers + manager, -1)
+        pairs, pair_codes = np.unique(keys, return_inverse=True)
+        if len(pairs) and pairs[0] == -1:
+            pairs, pair_codes = pairs[1:], pair_codes - 1
+        self._pair_department = pairs // n_managers
+        self._pair_manager = pairs % n_managers
+        # ترتیب جفت‌ها بر اساس (مدیر، واحد)؛ دسته‌ها از قبل مرتب‌اند پس ترتیب کدها همان ترتیب نام‌هاست
+        self._pair_order = np.lexsort((self._pair_department, self._pair_manager))
+        self._build_pair_index(pair_codes, len(pairs))
+        return ScoreCube(pair_codes, len(pairs), self._score)
+
+    def _build_pair_index(self, pair_codes: np.ndarray, n_pairs: int) -> None:
+        # ردیف‌ها مرتب بر اساس (جفت واحد/مدیر، امتیاز)؛ ردیف‌های هر جفت پشت سر هم و به ترتیب امتیازند
+        order = np.lexsort((self._score, pair_codes))
+        self._pair_rows = _readonly(order)
+        self._pair_scores = _readonly(self._score[order])
+        self._pair_offsets = np.searchsorted(pair_codes[order], np.arange(n_pairs + 1))
+        # جفت‌ها بر اساس واحد مرتب‌اند، پس جفت‌های هر واحد هم یک بازه‌ی پیوسته‌اند
+        self._department_pairs = np.searchsorted(
+            self._pair_department, np.arange(len(self._categories["department"]) + 1)
+        )
+
+    def department_summary(self, lo, hi) -> pd.DataFrame:
+        """Single aggregation stage behind every overview figure and stat card.
+
+        One row per department with projects in the score range: project count,
+        score sum, mean score and distinct managers.  The number of distinct
+        managers over all departments is in ``summary.attrs["manager_count"]``.
+        """
+        counts = self.department_cube.counts(lo, hi)
+        sums = self.department_cube.sums(lo, hi)
+        active_pairs = self.pair_cube.counts(lo, hi) > 0
+        managers = np.bincount(
+            self._pair_department[active_pairs], minlength=len(counts)
+        )
+        present = counts > 0
+        summary = pd.DataFrame(
+            {
+                "department": self._categories["department"][present],
+                "active_projects": counts[present],
+                "score_sum": sums[present],
+                "managers": managers[present],
+            }
+        )
+        summary["avg_score"] = (summary["score_sum"] / summary["active_projects"]).round(1)
+        summary.attrs["manager_count"] = len(np.unique(self._pair_manager[active_pairs]))
+        return summary
+
+    def status_summary(self, lo, hi) -> pd.DataFrame:
+        """Projects per status with ``lo <= score <= hi``, in status order."""
+        counts = self.status_cube.counts(lo, hi)
+        present = counts > 0
+        return pd.DataFrame(
+            {
+                "status": self._categories["status"][present],
+                "project_count": counts[present],
+            }
+        )
+
+    def manager_summary(self, lo, hi) -> pd.DataFrame:
+        """Projects and mean score per (manager, department) with ``lo <= score <= hi``."""
+        counts = self.pair_cube.counts(lo, hi)[self._pair_order]
+        sums = self.pair_cube.sums(lo, hi)[self._pair_order]
+        present = counts > 0
+        summary = pd.DataFrame(
+            {
+                "manager": self._categories["manager"][self._pair_manager[self._pair_order][present]],
+                "department": self._categories["department"][
+                    self._pair_department[self._pair_order][present]
+                ],
+                "project_count": counts[present],
+            }
+        )
+        summary["avg_score"] = (sums[present] / counts[present]).round(1)
+        return summary
+
+    # ---------- Drill-down index ----------
+    def department_pairs(self, dept_code: int) -> slice:
+        """Slice of the (department, manager) pairs that belong to ``dept_code``."""
+        if dept_code < 0:
+            return slice(0, 0)
+        return slice(int(self._department_pairs[dept_code]), int(self._department_pairs[dept_code + 1]))
+
+    def department_managers(self, dept_code: int, lo, hi) -> pd.DataFrame:
+        """Projects and mean score per manager of one department with ``lo <= score <= hi``."""
+        pairs = self.department_pairs(dept_code)
+        counts = self.pair_cube.counts(lo, hi, pairs)
+        sums = self.pair_cube.sums(lo, hi, pairs)
+        present = counts > 0
+        summary = pd.DataFrame(
+            {
+                "manager": self._categories["manager"][self._pair_manager[pairs][present]],
+                "project_count": counts[present],
+            }
+        )
+        summary["avg_score"] = (sums[present] / counts[present]).round(1)
+        return summary
+
+    def manager_rows(self, dept_code: int, manager_code: int, lo, hi) -> np.ndarray:
+        """Row positions of one manager in one department with ``lo <= score <= hi``, by score."""
+        pairs = self.department_pairs(dept_code)
+        pair = pairs.start + int(np.searchsorted(self._pair_manager[pairs], manager_code))
+        if pair >= pairs.stop or self._pair_manager[pair] != manager_code:
+            return self._pair_rows[:0]
+        start, stop = self._pair_offsets[pair], self._pair_offsets[pair + 1]
+        scores = self._pair_scores[start:stop]
+        first = start + int(np.searchsorted(scores, lo, side="left"))
+        last = start + int(np.searchsorted(scores, hi, side="right"))
+        return self._pair_rows[first:max(first, last)]
+
+    # ---------- Materialisation ----------
+    def take(self, positions: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Decode the given row positions (all rows when ``None``) into a frame."""
+        if positions is None:
+            positions = np.arange(len(self))
+        data = {}
+        for col in COLUMNS:
+            if col in CATEGORICAL_COLUMNS:
+                data[col] = pd.Categorical.from_codes(
+                    self._codes[col][positions],
+                    categories=self._categories[col],
+                )
+            elif col == "project_name":
+                data[col] = self._project_name.take(positions)
+            elif col == "start_date":
+                data[col] = self._start_date[positions]
+            else:
+                data[col] = self._score[positions]
+        return pd.DataFrame(data, columns=COLUMNS)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Bytes held per column, including the lookup tables."""
+        usage = {}
+        for col in CATEGORICAL_COLUMNS:
+            table = pd.Series(self._categories[col], dtype=object)
+            usage[col] = self._codes[col].nbytes + int(table.memory_usage(deep=True, index=False))
+        usage["project_name"] = int(pd.Series(self._project_name).memory_usage(deep=True, index=False))
+        usage["start_date"] = self._start_date.nbytes
+        usage["score"] = self._score.nbytes
+        usage["score_index"] = self._score_order.nbytes + self._sorted_score.nbytes
+        usage["drilldown_index"] = (
+            self._pair_rows.nbytes + self._pair_scores.nbytes + self._pair_offsets.nbytes
+        )
+        usage["score_cubes"] = (
+            self.department_cube.nbytes + self.pair_cube.nbytes + self.status_cube.nbytes
+        )
+        return usage
+
+
+# ---------- Data source ----------
+class DataSnapshot(NamedTuple):
+    """A loaded store together with the version and signature it was loaded as."""
+
+    store: "ProjectStore"
+    version: int
+    signature: str
+
+
+class ProjectDataSource:
+    """Holds the loaded ``ProjectStore`` and reloads it when the file changes.
+
+    ``version`` increases on every (re)load so callers can key caches on it;
+    functions registered with ``on_reload`` run after each reload.
+    ``version`` only counts loads in this process.  ``signature`` identifies
+    the loaded file (path, size and modification time) and is the same in
+    every process that loaded it, so it keys caches shared between workers.
+
+    At most every ``check_interval`` seconds an access compares the file's
+    signature with the loaded one and reloads the data if it changed
+    (``0`` turns the check off).  Callers that key a cache on the version
+    should take store and version together from ``snapshot()``.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, fallback: Optional[list] = None, check_interval: float = 0
+    ):
+        self.path = path
+        self.fallback = fallback or []
+        self.check_interval = check_interval
+        self.version = 0
+        self.signature = None
+        self._store: Optional[ProjectStore] = None
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._checked = time.monotonic()
+        self._reload_hooks: List[Callable[[], None]] = []
+
+    def _signature(self) -> str:
+        if not self.path:
+            # کش خروجی‌ها روی دیسک پس از راه‌اندازی دوباره هم می‌ماند، پس امضا از خود ردیف‌ها ساخته می‌شود
+            records = json.dumps(self.fallback, sort_keys=True, ensure_ascii=False, default=str)
+            return f"sample:{hashlib.sha1(records.encode('utf-8')).hexdigest()}"
+        stat = os.stat(self.path)
+        return f"{os.path.abspath(self.path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _load(self) -> Tuple[ProjectStore, str]:
+        signature = self._signature()
+        frame = load_projects(self.path) if self.path else load_records(self.fallback)
+        return ProjectStore.from_frame(frame), signature
+
+    def snapshot(self) -> DataSnapshot:
+        self._reload_if_changed()
+        with self._lock:
+            if self._store is None:
+                self._store, self.signature = self._load()
+                self.version += 1
+            return DataSnapshot(self._store, self.version, self.signature)
+
+    def store(self) -> ProjectStore:
+        return self.snapshot().store
+
+    def _reload_if_changed(self) -> None:
+        if not self.path or not self.check_interval or self._store is None:
+            return
+        if time.monotonic() - self._checked < self.check_interval:
+            return
+        # فقط یک نخ فایل را بررسی و بارگذاری می‌کند؛ بقیه تا پایان آن با داده‌ی قبلی کار می‌کنند
+        if not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            self._checked = time.monotonic()
+            if self._signature() != self.signature:
+                self.reload()
+        except Exception:
+            # فایل نیمه‌نوشته یا جابه‌جاشده؛ داده‌ی قبلی می‌ماند و بررسی بعدی دوباره امتحان می‌کند
+            logger.exception("reloading %s failed; keeping version %d", self.path, self.version)
+        finally:
+            self._check_lock.release()
+
+    def on_reload(self, hook: Callable[[], None]) -> None:
+        self._reload_hooks.append(hook)
+
+    def reload(self) -> ProjectStore:
+        store, signature = self._load()
+        with self._lock:
+            self._store, self.signature = store, signature
+            self.version += 1
+        for hook in self._reload_hooks:
+            hook()
+        return store
@@ -0,0 +1,178 @@
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_source import CATEGORICAL_COLUMNS
+from store import ProjectStore
+
+# عملگرهایی که DataTable در filter_query تولید می‌کند
+OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "],
+]
+
+
+def split_filter_part(filter_part: str):
+    """Split one ``{column} op value`` clause of a DataTable filter_query."""
+    for operator_type in OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find("{") + 1 : name_part.rfind("}")]
+
+                value_part = value_part.strip()
+                v0 = value_part[0] if value_part else ""
+                if v0 and v0 == value_part[-1] and v0 in ("'", '"', "`"):
+                    value = value_part[1:-1].replace("\\" + v0, v0)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+
+                # word operators need spaces after them in the filter string,
+                # but we don't want these later
+                return name, operator_type[0].strip(), value
+
+    return [None] * 3
+
+
+COMPARISONS = {
+    "eq": np.equal,
+    "ne": np.not_equal,
+    "lt": np.less,
+    "le": np.less_equal,
+    "gt": np.greater,
+    "ge": np.greater_equal,
+}
+FILTER_COLUMNS = ("department", "manager", "project_name", "start_date", "status", "score")
+
+
+def _as_text(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def compile_filter(filter_query: Optional[str]) -> List[Tuple[str, str, object]]:
+    """Parse a filter_query into ``(column, operator, value)`` clauses.
+
+    Clauses on unknown columns or with unknown operators are dropped, the same
+    way the table ignores them.
+    """
+    clauses = []
+    for part in (filter_query or "").split(" && "):
+        col, operator, value = split_filter_part(part)
+        if col in FILTER_COLUMNS and (operator in COMPARISONS or operator in ("contains", "datestartswith")):
+            clauses.append((col, operator, value))
+    return clauses
+
+
+def _text_match(values: np.ndarray, operator: str, value) -> np.ndarray:
+    """Evaluate a clause against an array of strings (a lookup table or names)."""
+    text = _as_text(value)
+    series = pd.Series(values).astype(str)
+    if operator == "contains":
+        matched = series.str.contains(text, regex=False)
+    elif operator == "datestartswith":
+        matched = series.str.startswith(text)
+    else:
+        matched = getattr(series, operator)(text)
+    return matched.fillna(False).to_numpy(dtype=bool)
+
+
+def _date_prefix_bounds(prefix: str):
+    """Half-open date range covered by a ``YYYY``/``YYYY-MM``/``YYYY-MM-DD`` prefix."""
+    units = {4: "Y", 7: "M", 10: "D"}
+    unit = units.get(len(prefix))
+    if unit is None:
+        return None
+    try:
+        start = np.datetime64(prefix, unit)
+    except ValueError:
+        return None
+    return start.astype("datetime64[ns]"), (start + 1).astype("datetime64[ns]")
+
+
+def clause_mask(store: ProjectStore, col: str, operator: str, value) -> np.ndarray:
+    """Boolean mask over every row of the store for one compiled clause."""
+    if col in CATEGORICAL_COLUMNS:
+        codes = store.codes(col)
+        if operator in ("eq", "ne"):
+            # برابری روی کدها مقایسه می‌شود، نه روی رشته‌ها
+            code = store.code_of(col, _as_text(value))
+            if code < 0:
+                # مقداری که در داده نیست؛ کد ۱- مال خانه‌های خالی است و نباید با آن برابر شمرده شود
+                matches = np.zeros(len(store), dtype=bool)
+                return matches if operator == "eq" else ~matches
+            return (codes == code) if operator == "eq" else (codes != code)
+        # بقیه‌ی عملگرها یک بار روی جدول مقادیر یکتا اجرا و با کدها پخش می‌شوند
+        table = np.append(_text_match(store.categories(col), operator, value), False)
+        return table[codes]
+
+    if col == "score":
+        if operator in COMPARISONS:
+            if not isinstance(value, float):
+                # متن در ستون عددی با هیچ ردیفی جور نمی‌شود
+                return np.zeros(len(store), dtype=bool)
+            return COMPARISONS[operator](store.score, value)
+        table = _text_match(np.arange(256), operator, value)
+        return table[store.score]
+
+    if col == "start_date":
+        dates = store.start_date
+        if operator in COMPARISONS:
+            target = pd.to_datetime(_as_text(value), errors="coerce")
+            if pd.isna(target):
+                return np.zeros(len(store), dtype=bool)
+            return COMPARISONS[operator](dates, target.to_datetime64())
+        bounds = _date_prefix_bounds(_as_text(value)) if operator == "datestartswith" else None
+        if bounds is not None:
+            return (dates >= bounds[0]) & (dates < bounds[1])
+        return _text_match(np.datetime_as_string(dates, unit="D"), operator, value)
+
+    return _text_match(store.project_names, operator, value)
+
+
+def filter_mask(store: ProjectStore, filter_query: Optional[str]) -> Optional[np.ndarray]:
+    """Mask over all rows for ``filter_query``, or ``None`` when nothing filters."""
+    clauses = compile_filter(filter_query)
+    if not clauses:
+        return None
+    mask = np.ones(len(store), dtype=bool)
+    for col, operator, value in clauses:
+        mask &= clause_mask(store, col, operator, value)
+    return mask
+
+
+def apply_mask(positions: np.ndarray, mask: Optional[np.ndarray]) -> np.ndarray:
+    """Restrict positions (e.g. a score-range slice) to the rows a mask keeps."""
+    if mask is None:
+        return positions
+    return positions[mask[positions]]
+
+
+def sort_positions(store: ProjectStore, positions: np.ndarray, sort_by: Optional[List[dict]]) -> np.ndarray:
+    """Order positions by the DataTable ``sort_by`` specs (first spec wins)."""
+    if not sort_by:
+        return positions
+    keys = []
+    for spec in reversed(sort_by):
+        key = store.sort_key(spec["column_id"])[positions].astype(np.int64)
+        keys.append(-key if spec.get("direction") == "desc" else key)
+    return positions[np.lexsort(keys)]
+
+
+def page_slice(n_rows: int, page_current: Optional[int], page_size: int):
+    """Rows of the requested page, that page clamped to the last page, and the page count."""
+    page_count = max(1, math.ceil(n_rows / page_size))
+    page = min(max(page_current or 0, 0), page_count - 1)
+    return slice(page * page_size, (page + 1) * page_size), page, page_count
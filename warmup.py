@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Range = Tuple[int, int]
+
+
+def all_ranges(score_min: int, score_max: int) -> List[Range]:
+    """Every (lo, hi) pair the integer score slider can produce."""
+    return [(lo, hi) for lo in range(score_min, score_max + 1) for hi in range(lo, score_max + 1)]
+
+
+class RangeTraffic:
+    """Counts requested score ranges and keeps the totals in a JSON file.
+
+    Several workers may share one file, so ``save`` adds this process's new
+    counts to whatever is on disk instead of overwriting it.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, lo: int, hi: int) -> None:
+        with self._lock:
+            self._pending[(int(lo), int(hi))] += 1
+
+    def load(self) -> Counter:
+        counts: Counter = Counter()
+        if not self.path or not os.path.exists(self.path):
+            return counts
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                for item in json.load(fh):
+                    counts[(int(item["lo"]), int(item["hi"]))] += int(item["count"])
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("ignoring unreadable range traffic file %s", self.path)
+        return counts
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return
+        counts = self.load() + pending
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump([{"lo": lo, "hi": hi, "count": n} for (lo, hi), n in counts.most_common()], fh)
+        os.replace(tmp_path, self.path)
+
+    def most_popular(self, limit: int) -> List[Range]:
+        with self._lock:
+            counts = self.load() + self._pending
+        return [rng for rng, _ in counts.most_common(limit)]
+
+
+class CacheWarmer:
+    """Renders overview responses on a background thread.
+
+    ``ready`` stays False from ``start`` until every range has been rendered,
+    which is what the readiness endpoint reports.
+    """
+
+    def __init__(self, render: Callable[[int, int], None]):
+        self.render = render
+        self.state = "off"
+        self.done = 0
+        self.total = 0
+        self.failed = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state != "running"
+
+    def start(self, ranges: Iterable[Range]) -> None:
+        ranges = list(ranges)
+        self.state, self.done, self.total, self.failed = "running", 0, len(ranges), 0
+        self._thread = threading.Thread(
+            target=self._run, args=(ranges,), name="overview-warmup", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, ranges: List[Range]) -> None:
+        for lo, hi in ranges:
+            try:
+                self.render(lo, hi)
+            except Exception:
+                self.failed += 1
+                logger.exception("warm-up failed for score range %s-%s", lo, hi)
+            self.done += 1
+        self.state = "done"
+        logger.info("overview warm-up finished: %d ranges, %d failed", self.total, self.failed)
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "done": self.done,
+            "total": self.total,
+            "failed": self.failed,
+        }
@@ -0,0 +1,6 @@
+# Render/Gunicorn entrypoint (gunicorn wsgi:server): هر فرایند دقیقاً یک برنامه می‌سازد
+from app import create_app
+
+app = create_app()
+server = app.server
+dashboard = server.extensions["dashboard"]